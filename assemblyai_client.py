@@ -0,0 +1,189 @@
+"""
+AssemblyAI HTTP istemcisi
+
+Tüm job'lar tek bir bağlantı havuzlu requests.Session'ı paylaşır; böylece
+upload, transkript oluşturma ve polling çağrıları her seferinde yeni TLS
+bağlantısı açmaz. Tekrarlanması güvenli çağrılar geçici hatalarda (bağlantı
+hatası, 429, 5xx) jitter'lı üstel bekleme ile sınırlı sayıda tekrar denenir.
+"""
+
+import random
+import time
+import weakref
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Tekrar denenebilir HTTP durum kodları
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RequestStats:
+    """Bir job'ın AssemblyAI çağrı istatistikleri (thread-safe)"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.requests = 0
+        self.retries = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.bytes_uploaded = 0
+
+    def add(self, **counts):
+        with self.lock:
+            for key, value in counts.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def merge(self, other):
+        """Başka bir RequestStats'ın sayaçlarını ekle"""
+        with other.lock:
+            counts = {
+                'requests': other.requests,
+                'retries': other.retries,
+                'connections_opened': other.connections_opened,
+                'connections_reused': other.connections_reused,
+                'bytes_uploaded': other.bytes_uploaded
+            }
+        self.add(**counts)
+
+    def as_dict(self):
+        """Job metadata'sına yazılacak sayaçlar"""
+        with self.lock:
+            return {
+                'http_requests': self.requests,
+                'http_retries': self.retries,
+                'http_connections_opened': self.connections_opened,
+                'http_connections_reused': self.connections_reused,
+                'http_bytes_uploaded': self.bytes_uploaded
+            }
+
+
+class AssemblyAIClient:
+    """Bağlantı havuzlu, tekrar denemeli AssemblyAI istemcisi"""
+
+    def __init__(self, base_url, api_key, pool_size=10, max_retries=3, backoff_base=0.5,
+                 backoff_max=10.0, connect_timeout=10.0, read_timeout=60.0,
+                 upload_chunk_size=1024 * 1024):
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = (connect_timeout, read_timeout)
+        self.upload_chunk_size = upload_chunk_size
+
+        # requests.Session cookie dışında paylaşılan durum tutmaz; urllib3
+        # bağlantı havuzu thread-safe olduğu için tek session tüm worker'larda
+        # kullanılabilir. Tekrar denemeleri burada, _request içinde yapıyoruz.
+        self.session = requests.Session()
+        self.session.headers.update({'authorization': api_key})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Daha önce görülen soketler: aynı soket tekrar gelirse bağlantı yeniden kullanılmıştır
+        self._seen_sockets = weakref.WeakSet()
+        self._seen_lock = Lock()
+
+    def _track_connection(self, response, stats):
+        """Yanıtın yeni mi yoksa havuzdan alınmış bir bağlantıyla mı geldiğini say"""
+        connection = getattr(response.raw, 'connection', None)
+        sock = getattr(connection, 'sock', None)
+
+        reused = False
+        if sock is not None:
+            with self._seen_lock:
+                reused = sock in self._seen_sockets
+                self._seen_sockets.add(sock)
+
+        if stats:
+            if reused:
+                stats.add(requests=1, connections_reused=1)
+            else:
+                stats.add(requests=1, connections_opened=1)
+
+    def _backoff_delay(self, attempt, response=None):
+        """Full jitter üstel bekleme süresi, varsa Retry-After'a uyar"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+        return delay
+
+    def _request(self, method, path, retry=False, stats=None, timeout=None, body_factory=None, **kwargs):
+        """İsteği gönder; retry=True ise geçici hatalarda tekrar dene
+
+        body_factory: Her denemede yeni gövde üreten fonksiyon (akış halindeki
+        upload gövdesi bir kez tüketildiği için tekrar denemede yeniden açılır).
+        """
+        url = self.base_url + path
+        attempts = self.max_retries + 1 if retry else 1
+
+        for attempt in range(attempts):
+            if body_factory is not None:
+                kwargs['data'] = body_factory()
+
+            try:
+                response = self.session.request(
+                    method, url,
+                    timeout=timeout or self.timeout,
+                    hooks={'response': lambda r, *args, **kw: self._track_connection(r, stats)},
+                    **kwargs
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt + 1 >= attempts:
+                    raise
+                if stats:
+                    stats.add(retries=1)
+                time.sleep(self._backoff_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt + 1 < attempts:
+                if stats:
+                    stats.add(retries=1)
+                time.sleep(self._backoff_delay(attempt, response))
+                continue
+
+            return response
+
+    def _iter_file(self, path, stats=None):
+        """Dosyayı upload_chunk_size parçalar halinde oku (chunked transfer)"""
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(self.upload_chunk_size)
+                if not chunk:
+                    break
+                if stats:
+                    stats.add(bytes_uploaded=len(chunk))
+                yield chunk
+
+    def upload(self, path, stats=None, timeout=None):
+        """Dosyayı /v2/upload'a akış halinde yükle
+
+        Her deneme ayrı bir upload_url üretir, bu yüzden tekrar denemek güvenlidir.
+        """
+        return self._request('POST', '/v2/upload', retry=True, stats=stats, timeout=timeout,
+                             body_factory=lambda: self._iter_file(path, stats))
+
+    def upload_stream(self, chunks, stats=None, timeout=None):
+        """Bayt parçalarını /v2/upload'a akış halinde yükle
+
+        Akış bir kez tüketilebildiği için tekrar denenmez; hata durumunda
+        çağıran taraf dosyanın diskteki kopyasıyla upload() yapmalıdır.
+        """
+        def counted():
+            for chunk in chunks:
+                if stats:
+                    stats.add(bytes_uploaded=len(chunk))
+                yield chunk
+
+        return self._request('POST', '/v2/upload', stats=stats, timeout=timeout, data=counted())
+
+    def create_transcript(self, data, stats=None):
+        """Transkript işi oluştur (idempotent değil, tekrar denenmez)"""
+        return self._request('POST', '/v2/transcript', json=data, stats=stats)
+
+    def get_transcript(self, transcript_id, stats=None):
+        """Transkript durumunu getir"""
+        return self._request('GET', f'/v2/transcript/{transcript_id}', retry=True, stats=stats)
@@ -0,0 +1,184 @@
+"""
+Ses enerjisine dayalı, tamamen yerel konuşma tespiti
+
+FFmpeg sesi mono 16 bit PCM olarak stdout'a akıtır; örnekler parça parça
+okunup sabit uzunluklu pencerelerde RMS hesaplanır, dosyanın tamamı
+belleğe alınmaz. Eşiği geçen ardışık pencereler, transkript modundaki
+kelimelerle aynı biçimde ({'start': ms, 'end': ms}) döner; böylece aynı
+sessizlik dedektörü ve render yolu kullanılır.
+"""
+
+import subprocess
+
+import numpy as np
+
+DEFAULT_SAMPLE_RATE = 16000
+DEFAULT_WINDOW_MS = 20
+DEFAULT_THRESHOLD_DB = -40.0  # dBFS
+
+# Bir seferde okunan ses süresi (saniye)
+READ_CHUNK_SECONDS = 10
+
+
+def voiced_windows(media_path, threshold_db=DEFAULT_THRESHOLD_DB, window_ms=DEFAULT_WINDOW_MS,
+                   sample_rate=DEFAULT_SAMPLE_RATE):
+    """Her pencere için RMS seviyesi eşiği geçiyor mu (bool dizisi)"""
+    window_samples = sample_rate * window_ms // 1000
+    chunk_bytes = window_samples * 2 * max(1, READ_CHUNK_SECONDS * 1000 // window_ms)
+    # RMS >= eşik  <=>  ortalama kare >= 10^(dB/10); log hesaplamaya gerek yok
+    min_power = (10 ** (threshold_db / 10)) * (32768.0 ** 2)
+
+    process = subprocess.Popen([
+        'ffmpeg',
+        '-v', 'error',
+        '-i', media_path,
+        '-map', '0:a:0',
+        '-ac', '1',
+        '-ar', str(sample_rate),
+        '-f', 's16le',
+        'pipe:1'
+    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    voiced = []
+    leftover = b''
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            data = leftover + data
+            usable = len(data) - len(data) % (window_samples * 2)
+            leftover = data[usable:]
+            if not usable:
+                continue
+
+            samples = np.frombuffer(data[:usable], dtype='<i2').astype(np.float32).reshape(-1, window_samples)
+            voiced.append(np.mean(samples * samples, axis=1) >= min_power)
+
+        # Son yarım pencere
+        if len(leftover) >= 2:
+            samples = np.frombuffer(leftover[:len(leftover) - len(leftover) % 2], dtype='<i2').astype(np.float32)
+            voiced.append(np.array([np.mean(samples * samples) >= min_power]))
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read().decode(errors='replace')
+        process.wait()
+
+    if process.returncode != 0:
+        raise RuntimeError(f"Ses analizi hatası: {stderr[-1000:]}")
+
+    return np.concatenate(voiced) if voiced else np.zeros(0, dtype=bool)
+
+
+def detect_voice_activity(media_path, threshold_db=DEFAULT_THRESHOLD_DB, window_ms=DEFAULT_WINDOW_MS,
+                          sample_rate=DEFAULT_SAMPLE_RATE):
+    """Sesli bölgeleri kelime biçiminde [{'start': ms, 'end': ms}, ...] döner"""
+    voiced = voiced_windows(media_path, threshold_db, window_ms, sample_rate)
+
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1) * window_ms
+    run_ends = np.flatnonzero(edges == -1) * window_ms
+
+    return [{'start': start, 'end': end} for start, end in zip(run_starts.tolist(), run_ends.tolist())]
+
+
+# Sınır iyileştirmede tek FFmpeg sürecinde çözülen pencere sayısı
+REFINE_BATCH_SIZE = 64
+DEFAULT_REFINE_WINDOW_MS = 300
+REFINE_FRAME_MS = 10
+
+
+def _decode_windows(media_path, window_starts, window_seconds, sample_rate):
+    """Her başlangıç için window_seconds uzunluğunda mono PCM pencere çöz
+
+    Her pencere ayrı bir -ss girdisidir; dosyanın sadece bu kısımları
+    okunur. Çıktı (pencere sayısı, örnek sayısı) boyutunda float32 dizidir.
+    """
+    window_samples = int(round(window_seconds * sample_rate))
+
+    cmd = ['ffmpeg', '-v', 'error']
+    for start in window_starts:
+        cmd += ['-ss', f"{start:.3f}", '-t', f"{window_seconds:.3f}", '-i', media_path]
+
+    # Dosya sonuna denk gelen kısa pencereler sessizlikle tamamlanır; hepsi eşit uzunlukta
+    filter_parts = [
+        f"[{i}:a:0]aformat=channel_layouts=mono,aresample={sample_rate},"
+        f"apad=whole_len={window_samples},atrim=end_sample={window_samples}[w{i}];"
+        for i in range(len(window_starts))
+    ]
+    concat_inputs = "".join(f"[w{i}]" for i in range(len(window_starts)))
+    filter_complex = "".join(filter_parts) + f"{concat_inputs}concat=n={len(window_starts)}:v=0:a=1[out]"
+
+    result = subprocess.run(cmd + [
+        '-filter_complex', filter_complex,
+        '-map', '[out]',
+        '-f', 's16le',
+        '-ac', '1',
+        'pipe:1'
+    ], capture_output=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Ses penceresi çözme hatası: {result.stderr.decode(errors='replace')[-1000:]}")
+
+    samples = np.frombuffer(result.stdout, dtype='<i2').astype(np.float32)
+    return samples[:len(window_starts) * window_samples].reshape(len(window_starts), window_samples)
+
+
+def _quietest_points(windows, centers, frame_samples):
+    """Her pencerede merkeze en yakın en sessiz noktanın örnek indeksini bul
+
+    10 ms'lik karelerin gücü 3 karelik ortalama ile yumuşatılır (tek karelik
+    düşüşler hece içinde olabilir). En düşük gücün %5 yakınındaki kareler
+    aday sayılır ve orijinal kesim noktasına en yakını seçilir.
+    """
+    frame_count = windows.shape[1] // frame_samples
+    frames = windows[:, :frame_count * frame_samples].reshape(len(windows), frame_count, frame_samples)
+    power = np.mean(frames * frames, axis=2)
+
+    padded = np.pad(power, ((0, 0), (1, 1)), mode='edge')
+    smoothed = (padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]) / 3
+
+    frame_centers = np.arange(frame_count) * frame_samples + frame_samples // 2
+    candidates = smoothed <= smoothed.min(axis=1, keepdims=True) * 1.05 + 1e-3
+    distance = np.where(candidates, np.abs(frame_centers[None, :] - centers[:, None]), np.inf)
+    return frame_centers[np.argmin(distance, axis=1)]
+
+
+def refine_boundaries(media_path, segments, window_ms=DEFAULT_REFINE_WINDOW_MS, sample_rate=DEFAULT_SAMPLE_RATE):
+    """Segment sınırlarını ±window_ms içindeki en sessiz noktaya kaydır
+
+    Sadece sınırların etrafındaki kısa pencereler çözülür. Yeni segment
+    listesi ve sınırların ortalama kayması (ms) döner. Kayma sonrası boyu
+    sıfırlanan segmentler eski sınırlarını korur, üst üste binenler
+    birleştirilir.
+    """
+    if not segments:
+        return segments, 0.0
+
+    window = window_ms / 1000.0
+    boundaries = np.array([[segment['start'], segment['end']] for segment in segments], dtype=np.float64).ravel()
+    window_starts = np.maximum(boundaries - window, 0.0)
+    frame_samples = sample_rate * REFINE_FRAME_MS // 1000
+
+    refined = boundaries.copy()
+    for batch_start in range(0, len(boundaries), REFINE_BATCH_SIZE):
+        batch = slice(batch_start, batch_start + REFINE_BATCH_SIZE)
+        windows = _decode_windows(media_path, window_starts[batch], 2 * window, sample_rate)
+        centers = np.round((boundaries[batch] - window_starts[batch]) * sample_rate)
+        quietest = _quietest_points(windows, centers, frame_samples)
+        refined[batch] = window_starts[batch] + quietest / sample_rate
+
+    starts, ends = refined[0::2], refined[1::2]
+    collapsed = ends <= starts
+    starts[collapsed] = boundaries[0::2][collapsed]
+    ends[collapsed] = boundaries[1::2][collapsed]
+
+    refined_segments = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if refined_segments and start <= refined_segments[-1]['end']:
+            refined_segments[-1]['end'] = max(refined_segments[-1]['end'], end)
+        else:
+            refined_segments.append({'start': start, 'end': end})
+
+    mean_shift_ms = float(np.mean(np.abs(refined - boundaries)) * 1000)
+    return refined_segments, mean_shift_ms
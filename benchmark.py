@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Jumpcut Benchmark Script
+Performans açısından kritik bileşenleri yerelde ölçmek için kullanılır
+
+Kullanım:
+    python benchmark.py              # Tüm benchmark'lar
+    python benchmark.py cut_graph    # Sadece kesim grafiği
+    python benchmark.py silence      # Sadece sessizlik dedektörü
+    python benchmark.py logging      # Sadece eşzamanlı add_log
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from cut_graph import trim_graph, select_graph, write_filter_script
+from silence_detector import words_to_arrays, detect_segments, segments_from_words
+from log_store import LogManager, LogWriter
+
+# Kesim grafiği benchmark'ında denenen segment sayıları
+CUT_GRAPH_SEGMENT_COUNTS = [10, 100, 500, 1000, 2000, 5000]
+# Sentetik test videosunun süresi (saniye)
+CUT_GRAPH_SOURCE_SECONDS = int(os.getenv("BENCH_SOURCE_SECONDS", 600))
+# Sessizlik dedektörü benchmark'ında kullanılan kelime sayıları
+SILENCE_WORD_COUNTS = [10_000, 100_000, 1_000_000, 2_000_000]
+# Log benchmark'ında eşzamanlı yazan thread sayıları ve thread başına log sayısı
+LOGGING_THREAD_COUNTS = [1, 4, 16, 64]
+LOGGING_RECORDS_PER_THREAD = 20_000
+
+def print_header(text):
+    """Başlık yazdır"""
+    print("\n" + "=" * 60)
+    print(f"  {text}")
+    print("=" * 60)
+
+def make_source_video(path, duration):
+    """Sentetik test videosu üret (320x180, 25 fps, sinüs ses)"""
+    subprocess.run([
+        'ffmpeg', '-v', 'error',
+        '-f', 'lavfi', '-i', f'testsrc2=size=320x180:rate=25:duration={duration}',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:sample_rate=48000:duration={duration}',
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-g', '50',
+        '-c:a', 'aac',
+        '-y', path
+    ], check=True)
+
+def random_ranges(count, duration, seed=42):
+    """Kaynağa eşit aralıklarla dağılmış, rastgele uzunlukta count segment"""
+    rng = random.Random(seed)
+    slot = duration / count
+    ranges = []
+    for i in range(count):
+        length = slot * rng.uniform(0.3, 0.8)
+        start = i * slot + rng.uniform(0, slot - length)
+        ranges.append((round(start, 3), round(start + length, 3)))
+    return ranges
+
+def run_ffmpeg(args):
+    """FFmpeg'i çalıştır; (süre, tepe bellek MB, hata) döner"""
+    start_time = time.time()
+    try:
+        process = subprocess.Popen(['ffmpeg', '-v', 'error', *args],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except OSError as e:
+        # Grafik komut satırına sığmadı (E2BIG)
+        return None, None, f"başlatılamadı: {e.strerror}"
+
+    stderr = process.stderr.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.time() - start_time
+    peak_mb = usage.ru_maxrss / 1024  # Linux'ta KB
+
+    if process.returncode != 0:
+        return elapsed, peak_mb, stderr.decode(errors='replace').strip()[-200:]
+    return elapsed, peak_mb, None
+
+def bench_cut_graph():
+    """Segment sayısına göre trim grafiği (komut satırı / script dosyası) ve select grafiği (script dosyası)"""
+    print_header(f"Kesim Grafiği ({CUT_GRAPH_SOURCE_SECONDS} sn kaynak, çıktı -f null)")
+
+    with tempfile.TemporaryDirectory(prefix='jumpcut_bench_') as work_dir:
+        source = os.path.join(work_dir, "source.mp4")
+        print("Sentetik kaynak video üretiliyor...")
+        make_source_video(source, CUT_GRAPH_SOURCE_SECONDS)
+
+        print(f"\n{'segment':>8} | {'trim (argv)':>22} | {'trim (script)':>22} | {'select (script)':>22}")
+        print("-" * 85)
+
+        for count in CUT_GRAPH_SEGMENT_COUNTS:
+            ranges = random_ranges(count, CUT_GRAPH_SOURCE_SECONDS)
+            row = []
+
+            # Mevcut yöntem: trim/atrim dalları, grafik komut satırında
+            elapsed, peak_mb, error = run_ffmpeg([
+                '-i', source, '-filter_complex', trim_graph(ranges),
+                '-map', '[outv]', '-map', '[outa]', '-f', 'null', '-'
+            ])
+            row.append(error[:22] if error else f"{elapsed:6.2f} sn {peak_mb:7.0f} MB")
+
+            # Grafik dosyadan: trim dalları (CUT_GRAPH=trim) ve select + atrim (CUT_GRAPH=select)
+            for graph in (trim_graph(ranges), select_graph(ranges)):
+                script_path = write_filter_script(graph, work_dir)
+                elapsed, peak_mb, error = run_ffmpeg([
+                    '-i', source, '-filter_complex_script', script_path,
+                    '-map', '[outv]', '-map', '[outa]', '-f', 'null', '-'
+                ])
+                os.remove(script_path)
+                row.append(error[:22] if error else f"{elapsed:6.2f} sn {peak_mb:7.0f} MB")
+
+            print(f"{count:>8} | {row[0]:>22} | {row[1]:>22} | {row[2]:>22}")
+
+def synthetic_words(count, seed=42):
+    """AssemblyAI formatında (ms) sahte kelime listesi; boşlukların ~%10'u 1 sn'den uzun"""
+    rng = random.Random(seed)
+    words = []
+    t = 0
+    for i in range(count):
+        length = rng.randint(120, 600)
+        words.append({'text': f'w{i}', 'start': t, 'end': t + length, 'confidence': 0.9})
+        t += length + (rng.randint(1000, 4000) if rng.random() < 0.1 else rng.randint(0, 300))
+    return words
+
+def legacy_segments(words, silence_threshold=1000):
+    """cut_video'daki eski Python döngüsü (karşılaştırma için)"""
+    segments_to_keep = []
+    if len(words) > 0:
+        current_start = words[0]['start'] / 1000.0
+        for i in range(len(words) - 1):
+            current_end = words[i]['end'] / 1000.0
+            next_start = words[i + 1]['start'] / 1000.0
+            gap = (next_start - current_end) * 1000
+            if gap >= silence_threshold:
+                segments_to_keep.append({'start': current_start, 'end': current_end})
+                current_start = next_start
+        segments_to_keep.append({'start': current_start, 'end': words[-1]['end'] / 1000.0})
+    return segments_to_keep
+
+def timed(func, *args, **kwargs):
+    """Fonksiyonu çalıştır; (sonuç, ms) döner"""
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start_time) * 1000
+
+def bench_silence():
+    """Eski Python döngüsü ile NumPy dedektörünün karşılaştırması"""
+    print_header("Sessizlik Dedektörü")
+    print(f"{'kelime':>10} | {'eski döngü':>11} | {'diziye çevirme':>14} | {'tespit':>8} | "
+          f"{'toplam':>8} | {'segment':>8} | {'min 2 sn':>8}")
+    print("-" * 88)
+
+    for count in SILENCE_WORD_COUNTS:
+        words = synthetic_words(count)
+
+        legacy, legacy_ms = timed(legacy_segments, words)
+        (starts, ends), convert_ms = timed(words_to_arrays, words)
+        (seg_starts, _), detect_ms = timed(detect_segments, starts, ends)
+        segments, total_ms = timed(segments_from_words, words)
+        merged = segments_from_words(words, lead_ms=100, tail_ms=150, min_segment_ms=2000)
+
+        assert len(segments) == len(legacy) == len(seg_starts)
+        print(f"{count:>10,} | {legacy_ms:>8.0f} ms | {convert_ms:>11.0f} ms | {detect_ms:>5.1f} ms | "
+              f"{total_ms:>5.0f} ms | {len(segments):>8,} | {len(merged):>8,}")
+
+class LegacyLogManager:
+    """Eski add_log: sözlük, ISO zaman damgası, konsol satırı ve senkron print (karşılaştırma için)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.logs = deque(maxlen=1000)
+        self.job_logs = {}
+        self.lock = threading.Lock()
+
+    def add_log(self, level, message, job_id=None, metadata=None):
+        timestamp = datetime.utcnow().isoformat() + 'Z'
+        log_entry = {'timestamp': timestamp, 'level': level, 'message': message,
+                     'job_id': job_id, 'metadata': metadata or {}}
+        console_msg = f"[{timestamp}] ℹ️ [{level}] {message}"
+        if metadata:
+            console_msg += f" | {' | '.join(f'{key}={value}' for key, value in metadata.items())}"
+        if job_id:
+            console_msg += f" | job_id={job_id[:8]}..."
+        print(console_msg, file=self.stream)
+        with self.lock:
+            self.logs.append(log_entry)
+            if job_id:
+                if job_id not in self.job_logs:
+                    self.job_logs[job_id] = deque(maxlen=500)
+                self.job_logs[job_id].append(log_entry)
+
+def hammer_add_log(manager, thread_count, records_per_thread):
+    """thread_count thread'den aynı anda add_log çağır; toplam süreyi (sn) döner"""
+    barrier = threading.Barrier(thread_count + 1)
+
+    def worker(n):
+        job_id = f"{n:08d}-bench"
+        metadata = {'video_num': n, 'duration_ms': 1234}
+        barrier.wait()
+        for i in range(records_per_thread):
+            manager.add_log("INFO", "FFmpeg kesme işlemi tamamlandı", job_id, metadata)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start_time
+
+def bench_logging():
+    """Eski senkron add_log ile kayıt + arka plan yazıcının eşzamanlı thread'lerden verimi"""
+    print_header(f"add_log Verimi (thread başına {LOGGING_RECORDS_PER_THREAD:,} log, çıktı /dev/null)")
+    print(f"{'thread':>7} | {'eski (senkron print)':>22} | {'yeni (kuyruk)':>22} | {'yazıcı boşalma':>14} | {'atlanan':>8}")
+    print("-" * 88)
+
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        for thread_count in LOGGING_THREAD_COUNTS:
+            total = thread_count * LOGGING_RECORDS_PER_THREAD
+
+            legacy_seconds = hammer_add_log(LegacyLogManager(devnull), thread_count, LOGGING_RECORDS_PER_THREAD)
+
+            # Kuyruk patlamanın tamamını alacak boyutta: atlanan kayıt ölçümü iyileştirmesin
+            writer = LogWriter(stream=devnull, max_queue=total)
+            new_seconds = hammer_add_log(LogManager(writer=writer), thread_count, LOGGING_RECORDS_PER_THREAD)
+            drain_start = time.perf_counter()
+            writer.close(timeout=60)
+            drain_seconds = time.perf_counter() - drain_start
+
+            legacy = f"{total / legacy_seconds / 1000:6.0f} k/sn {legacy_seconds / total * 1e6:5.1f} µs"
+            new = f"{total / new_seconds / 1000:6.0f} k/sn {new_seconds / total * 1e6:5.1f} µs"
+            print(f"{thread_count:>7} | {legacy:>22} | {new:>22} | {drain_seconds * 1000:>11.0f} ms | "
+                  f"{writer.stats()['log_lines_dropped']:>8,}")
+
+BENCHMARKS = {
+    'cut_graph': bench_cut_graph,
+    'silence': bench_silence,
+    'logging': bench_logging
+}
+
+def main():
+    """Ana benchmark fonksiyonu"""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Bilinmeyen benchmark: {name} (mevcut: {', '.join(BENCHMARKS)})")
+            return 1
+        BENCHMARKS[name]()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Kesim çizelgesi için FFmpeg filtre grafiği üretimi
+
+Az segmentte her segment için ayrı trim/atrim dalı kuran klasik grafik
+kullanılır. Segment sayısı arttıkça bu grafik hem komut satırı sınırına
+takılır hem de her dal aynı decode edilmiş akışı okuduğu için concat
+sırası gelene kadar kareler bellekte birikir. Bu durumda görüntü tek
+zincirli select grafiğiyle kesilir: kareler tek geçişte seçilir ve zaman
+damgalarından, o kareye kadar atılan toplam süre çıkarılır. Ses her iki
+grafikte de atrim ile örnek hassasiyetinde kesilir. Grafik komut satırı
+yerine -filter_complex_script ile dosyadan verilir; hangi grafiğin
+kullanılacağı configure() ile seçilir (CUT_GRAPH).
+"""
+
+import os
+import tempfile
+
+# auto: segment sayısına göre seçilir; trim / select: her zaman o grafik
+CUT_GRAPHS = ('auto', 'trim', 'select')
+
+# auto'da bu sayıya kadar segmentte trim grafiği, üstünde select grafiği kullanılır
+TRIM_GRAPH_MAX_SEGMENTS = 8
+
+_defaults = {'mode': 'auto', 'trim_max_segments': TRIM_GRAPH_MAX_SEGMENTS}
+
+
+def configure(mode=None, trim_max_segments=None):
+    """Tüm çağrılarda kullanılan grafik seçimini ayarla (uygulama başlangıcında)"""
+    if mode is not None:
+        if mode not in CUT_GRAPHS:
+            raise ValueError(f"Geçersiz kesim grafiği: {mode} (desteklenenler: {', '.join(CUT_GRAPHS)})")
+        _defaults['mode'] = mode
+    if trim_max_segments is not None:
+        _defaults['trim_max_segments'] = trim_max_segments
+
+
+def _fmt(value):
+    return f"{value:.6f}"
+
+
+def trim_graph(ranges, video=True, audio=True, source=0, out_video='outv', out_audio='outa'):
+    """Her segment için trim/atrim dalı kurup concat ile birleştiren grafik
+
+    source: girdi indeksi; ara etiketler çıkış adıyla öneklenir, aynı
+    grafikte birden fazla girdi için kullanılabilir.
+    """
+    filter_parts = []
+    for i, (start, end) in enumerate(ranges):
+        if video:
+            filter_parts.append(f"[{source}:v]trim=start={_fmt(start)}:end={_fmt(end)},"
+                                f"setpts=PTS-STARTPTS[{out_video}_{i}];")
+        if audio:
+            filter_parts.append(f"[{source}:a]atrim=start={_fmt(start)}:end={_fmt(end)},"
+                                f"asetpts=PTS-STARTPTS[{out_audio}_{i}];")
+
+    outputs = []
+    if video:
+        concat_inputs = "".join(f"[{out_video}_{i}]" for i in range(len(ranges)))
+        outputs.append(f"{concat_inputs}concat=n={len(ranges)}:v=1:a=0[{out_video}]")
+    if audio:
+        concat_inputs = "".join(f"[{out_audio}_{i}]" for i in range(len(ranges)))
+        outputs.append(f"{concat_inputs}concat=n={len(ranges)}:v=0:a=1[{out_audio}]")
+    return "".join(filter_parts) + ";".join(outputs)
+
+
+def _search_expr(ranges, var, leaf, lo=0, hi=None):
+    """Zamanın düştüğü segmenti ikili arama ile bulan ifade
+
+    FFmpeg'in if() fonksiyonu sadece seçilen dalı hesapladığı için kare
+    başına n yerine log2(n) karşılaştırma yapılır. leaf(i): i. segmentin
+    başlangıcı ile bir sonrakinin başlangıcı arasındaki zamanlar için ifade.
+    """
+    if hi is None:
+        hi = len(ranges)
+    if hi - lo == 1:
+        return leaf(lo)
+    mid = (lo + hi) // 2
+    return (f"if(lt({var},{_fmt(ranges[mid][0])}),"
+            f"{_search_expr(ranges, var, leaf, lo, mid)},{_search_expr(ranges, var, leaf, mid, hi)})")
+
+
+def select_graph(ranges, video=True, audio=True, source=0, out_video='outv', out_audio='outa'):
+    """Görüntüyü tek geçişte select ile kesen grafik
+
+    Seçilen karenin yeni zamanı = eski zamanı - kendinden önce atılan süre;
+    böylece değişken kare hızlı videolarda da zamanlama korunur. aselect
+    ses karelerini (AAC'de 1024 örnek) bütün olarak seçtiği için her
+    kesimde birkaç ms kayar ve bu kayma segment sayısıyla birikir; ses bu
+    yüzden trim grafiğindeki gibi atrim ile örnek hassasiyetinde kesilir.
+    """
+    removed = []  # i. segmentten önce atılan toplam süre
+    total_removed = 0.0
+    previous_end = 0.0
+    for start, end in ranges:
+        total_removed += start - previous_end
+        removed.append(total_removed)
+        previous_end = end
+
+    keep = _search_expr(ranges, 't', lambda i: f"lt(t,{_fmt(ranges[i][1])})*gte(t,{_fmt(ranges[i][0])})")
+    shift = _search_expr(ranges, 'T', lambda i: _fmt(removed[i]))
+
+    outputs = []
+    if video:
+        outputs.append(f"[{source}:v]select='{keep}',setpts='PTS-({shift})/TB'[{out_video}]")
+    if audio:
+        outputs.append(trim_graph(ranges, video=False, audio=True, source=source, out_audio=out_audio))
+    return ";".join(outputs)
+
+
+def build_cut_graph(ranges, video=True, audio=True, source=0, out_video='outv', out_audio='outa'):
+    """Ayarlı grafiği (auto'da segment sayısına göre) üret; çıkışlar [outv] ve [outa]"""
+    mode = _defaults['mode']
+    if mode == 'auto':
+        mode = 'trim' if len(ranges) <= _defaults['trim_max_segments'] else 'select'
+    if mode == 'trim':
+        return trim_graph(ranges, video, audio, source, out_video, out_audio)
+    return select_graph(ranges, video, audio, source, out_video, out_audio)
+
+
+def _normalize_video(source, target, duration):
+    """Girdiyi hedef çözünürlük/kare hızına getiren filtre zinciri (gerekmiyorsa boş)
+
+    En-boy oranı korunur, kalan alan siyah bantla doldurulur. select
+    grafiğinde akış sonu zaman damgası kaydırılmadığı için fps filtresi
+    sonu kareleri tekrarlayarak doldurur; çıktı tutulan süreyle kırpılır.
+    """
+    filters = []
+    if (source['width'], source['height'], source['sar']) != (target['width'], target['height'], target['sar']):
+        width, height = target['width'], target['height']
+        filters += [f"scale={width}:{height}:force_original_aspect_ratio=decrease",
+                    f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
+                    "setsar=1"]
+    if source['fps'] != target['fps']:
+        filters += [f"fps={target['fps']}", f"trim=end={_fmt(duration)}"]
+    return filters
+
+
+def build_multi_input_graph(inputs, formats, target, scale_height=None):
+    """Birden fazla girdinin kesim grafiklerini tek grafikte uç uca ekle
+
+    inputs: girdi başına (start, end) listesi; formats: girdi başına
+    {'width', 'height', 'sar', 'fps'}; target: çıktı biçimi (+ 'sample_rate',
+    'channel_layout'). Farklı çözünürlük ve kare hızındaki girdiler grafik
+    içinde hedefe dönüştürülür, ses tek biçime getirilir. Çıkışlar [outv]
+    ve [outa]; ara dosya oluşmaz. scale_height verilirse çıktı en fazla o
+    yüksekliğe küçültülür (önizleme render'ı).
+    """
+    parts = []
+    concat_inputs = []
+    for n, (ranges, source) in enumerate(zip(inputs, formats)):
+        parts.append(build_cut_graph(ranges, source=n, out_video=f"cv{n}", out_audio=f"ca{n}"))
+        duration = sum(end - start for start, end in ranges)
+        video_filters = _normalize_video(source, target, duration) or ['null']
+        parts.append(f"[cv{n}]{','.join(video_filters)}[nv{n}]")
+        parts.append(f"[ca{n}]aformat=sample_fmts=fltp:sample_rates={target['sample_rate']}:"
+                     f"channel_layouts={target['channel_layout']}[na{n}]")
+        concat_inputs.append(f"[nv{n}][na{n}]")
+
+    concat_video = 'catv' if scale_height else 'outv'
+    parts.append(f"{''.join(concat_inputs)}concat=n={len(inputs)}:v=1:a=1[{concat_video}][outa]")
+    if scale_height:
+        # En-boy oranı korunur, genişlik çift sayıya yuvarlanır; küçük kaynaklar büyütülmez
+        parts.append(f"[catv]scale=-2:'min(ih,{scale_height})'[outv]")
+    return ";".join(parts)
+
+
+def write_filter_script(graph, directory=None):
+    """Grafiği -filter_complex_script için geçici dosyaya yaz, yolunu döner
+
+    Dosyayı silmek çağıranın sorumluluğundadır.
+    """
+    fd, path = tempfile.mkstemp(prefix='filter_', suffix='.txt', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(graph)
+    return path
@@ -0,0 +1,247 @@
+"""
+Render edilmeden dışa aktarılan kesim listeleri (JSON, CMX3600 EDL, FCPXML)
+
+Tutulan segmentler önce kare sayısına yuvarlanır; üç biçim de aynı olay
+listesinden üretildiği için kaynak (source) ve kayıt (record) zaman kodları
+birbirini tutar. Zaman çizelgesi (record) ilk videonun kare hızındadır,
+kaynak zaman kodları her videonun kendi kare hızıyla ve 00:00:00:00'dan
+sayılır. 29.97 / 59.94 gibi NTSC hızlarında drop-frame zaman kodu kullanılır.
+"""
+
+import json
+from fractions import Fraction
+from urllib.parse import quote
+from xml.sax.saxutils import quoteattr
+
+# Zaman çizelgesinin başladığı zaman kodu (NLE'lerin varsayılanı 01:00:00:00)
+RECORD_START_HOURS = 1
+
+CUT_LIST_FORMATS = {
+    'json': ('cut_list.json', 'application/json'),
+    'edl': ('cut_list.edl', 'text/plain'),
+    'fcpxml': ('cut_list.fcpxml', 'application/xml')
+}
+
+
+def _timecode_base(rate):
+    return round(rate)
+
+
+def _is_drop_frame(rate):
+    # 30000/1001 ve 60000/1001; 24000/1001 drop-frame kullanmaz
+    return rate.denominator == 1001 and _timecode_base(rate) in (30, 60)
+
+
+def frames_to_timecode(frames, rate):
+    """Kare sayısını SMPTE zaman koduna çevir (drop-frame'de ';' ayracı)"""
+    base = _timecode_base(rate)
+    separator = ':'
+    if _is_drop_frame(rate):
+        # Her dakika başında (10'un katı dakikalar hariç) ilk 2 (60'ta 4) kare numarası atlanır
+        dropped = 2 * base // 30
+        frames_per_minute = base * 60 - dropped
+        frames_per_10_minutes = frames_per_minute * 10 + dropped
+        tens, remainder = divmod(frames, frames_per_10_minutes)
+        frames += dropped * 9 * tens
+        if remainder > dropped:
+            frames += dropped * ((remainder - dropped) // frames_per_minute)
+        separator = ';'
+
+    seconds, frame = divmod(frames, base)
+    minutes, second = divmod(seconds, 60)
+    hours, minute = divmod(minutes, 60)
+    return f"{hours % 24:02d}:{minute:02d}:{second:02d}{separator}{frame:02d}"
+
+
+def _record_offset(rate):
+    """Zaman çizelgesi başlangıcının (RECORD_START_HOURS:00:00:00) kare numarası"""
+    if _is_drop_frame(rate):
+        # Drop-frame zaman kodu gerçek zamanı izler: 01:00:00;00 = 3600 * 29.97 = 107892. kare
+        return round(RECORD_START_HOURS * 3600 * rate)
+    # Non-drop-frame'de zaman kodu tam sayı tabanla sayar (23.976'da da saniyede 24 kare)
+    return _timecode_base(rate) * 3600 * RECORD_START_HOURS
+
+
+def build_cut_list(clips, title='jumpcut'):
+    """Videoların segmentlerinden kare hassasiyetinde olay listesi oluştur
+
+    clips: her video için name, fps ('num/den'), duration, width, height,
+    sample_rate, channel_layout ve segments ({'start', 'end'} saniye) alanları.
+    """
+    record_rate = Fraction(clips[0]['fps'])
+    record_frame = 0
+    videos = []
+    events = []
+    for video_num, clip in enumerate(clips, start=1):
+        rate = Fraction(clip['fps'])
+        duration = clip.get('duration')
+        last_frame = round(duration * rate) if duration else None
+        segments = []
+        for segment in clip['segments']:
+            source_in = round(segment['start'] * rate)
+            source_out = round(segment['end'] * rate)
+            if last_frame is not None:
+                source_out = min(source_out, last_frame)
+            if source_out <= source_in:
+                continue
+            # Kaynak ve zaman çizelgesi hızı farklıysa süre zaman çizelgesi karelerine çevrilir
+            length = source_out - source_in
+            if rate != record_rate:
+                length = round(length / rate * record_rate)
+            event = {
+                'event': len(events) + 1,
+                'video_num': video_num,
+                'source_in_frame': source_in,
+                'source_out_frame': source_out,
+                'record_in_frame': record_frame,
+                'record_out_frame': record_frame + length,
+                'start': float(source_in / rate),
+                'end': float(source_out / rate),
+                'source_in': frames_to_timecode(source_in, rate),
+                'source_out': frames_to_timecode(source_out, rate),
+                'record_in': frames_to_timecode(record_frame + _record_offset(record_rate), record_rate),
+                'record_out': frames_to_timecode(record_frame + length + _record_offset(record_rate), record_rate)
+            }
+            record_frame += length
+            segments.append(event)
+            events.append(event)
+
+        videos.append({
+            'video_num': video_num,
+            'name': clip['name'],
+            'frame_rate': clip['fps'],
+            'duration': duration,
+            'width': clip.get('width'),
+            'height': clip.get('height'),
+            'sample_rate': clip.get('sample_rate'),
+            'channel_layout': clip.get('channel_layout'),
+            'segment_count': len(segments),
+            'kept_seconds': round(sum(event['end'] - event['start'] for event in segments), 3),
+            'segments': segments
+        })
+
+    return {
+        'title': title,
+        'frame_rate': clips[0]['fps'],
+        'drop_frame': _is_drop_frame(record_rate),
+        'record_start': frames_to_timecode(_record_offset(record_rate), record_rate),
+        'duration': float(record_frame / record_rate),
+        'duration_frames': record_frame,
+        'event_count': len(events),
+        'videos': videos
+    }
+
+
+def to_json(cut_list):
+    return json.dumps(cut_list, ensure_ascii=False, indent=2)
+
+
+def _reel_name(video_num):
+    # CMX3600 reel alanı en fazla 8 karakter; asıl dosya adı FROM CLIP NAME satırında
+    return f"AX{video_num:03d}"
+
+
+def to_edl(cut_list):
+    """CMX3600 EDL; her olay görüntü + iki ses kanalı (AA/V) ve kaynak dosya adı notuyla"""
+    lines = [
+        f"TITLE: {cut_list['title'][:70]}",
+        f"FCM: {'DROP FRAME' if cut_list['drop_frame'] else 'NON-DROP FRAME'}",
+        ""
+    ]
+    for video in cut_list['videos']:
+        for event in video['segments']:
+            lines.append(f"{event['event']:03d}  {_reel_name(video['video_num']):<8} AA/V  C        "
+                         f"{event['source_in']} {event['source_out']} {event['record_in']} {event['record_out']}")
+            lines.append(f"* FROM CLIP NAME: {video['name']}")
+            lines.append("")
+    return "\r\n".join(lines)
+
+
+def _rational(frames, rate):
+    """Kare sayısını FCPXML rasyonel zamanına çevir (ör. '1001/24000s' katları)"""
+    value = Fraction(frames) / rate
+    if value.denominator == 1:
+        return f"{value.numerator}s"
+    return f"{value.numerator}/{value.denominator}s"
+
+
+def _audio_rate(sample_rate):
+    rates = {32000: '32k', 44100: '44.1k', 48000: '48k', 88200: '88.2k', 96000: '96k', 176400: '176.4k', 192000: '192k'}
+    return rates.get(sample_rate, '48k')
+
+
+def to_fcpxml(cut_list):
+    """FCPXML 1.9; her video bir asset, her segment spine'da ardışık bir asset-clip
+
+    Asset'ler dosya adıyla işaretlenir, NLE'de orijinal dosyalara yeniden bağlanır (relink).
+    """
+    record_rate = Fraction(cut_list['frame_rate'])
+    first = cut_list['videos'][0]
+    timecode_format = 'DF' if cut_list['drop_frame'] else 'NDF'
+
+    resources = []
+    formats = {}
+    for video in cut_list['videos']:
+        key = (video['frame_rate'], video['width'], video['height'])
+        if key not in formats:
+            formats[key] = f"r{len(formats) + 1}"
+            rate = Fraction(video['frame_rate'])
+            resources.append(f'    <format id="{formats[key]}" frameDuration="{_rational(1, rate)}" '
+                             f'width="{video["width"]}" height="{video["height"]}"/>')
+    for video in cut_list['videos']:
+        rate = Fraction(video['frame_rate'])
+        duration_frames = round((video['duration'] or 0) * rate)
+        resources.append(
+            f'    <asset id="a{video["video_num"]}" name={quoteattr(video["name"])} '
+            f'src={quoteattr(quote(video["name"]))} start="0s" duration="{_rational(duration_frames, rate)}" '
+            f'hasVideo="1" hasAudio="1" format="{formats[(video["frame_rate"], video["width"], video["height"])]}" '
+            f'audioSources="1" audioChannels="{1 if video["channel_layout"] == "mono" else 2}" '
+            f'audioRate="{video["sample_rate"] or 48000}"/>'
+        )
+
+    clips = []
+    for video in cut_list['videos']:
+        rate = Fraction(video['frame_rate'])
+        for event in video['segments']:
+            clips.append(
+                f'            <asset-clip ref="a{video["video_num"]}" name={quoteattr(video["name"])} '
+                f'offset="{_rational(event["record_in_frame"] + _record_offset(record_rate), record_rate)}" '
+                f'start="{_rational(event["source_in_frame"], rate)}" '
+                f'duration="{_rational(event["record_out_frame"] - event["record_in_frame"], record_rate)}" '
+                f'tcFormat="{timecode_format}"/>'
+            )
+
+    return "\n".join([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<!DOCTYPE fcpxml>',
+        '<fcpxml version="1.9">',
+        '  <resources>',
+        *resources,
+        '  </resources>',
+        '  <library>',
+        f'    <event name={quoteattr(cut_list["title"])}>',
+        f'      <project name={quoteattr(cut_list["title"])}>',
+        f'        <sequence format="{formats[(first["frame_rate"], first["width"], first["height"])]}" '
+        f'duration="{_rational(cut_list["duration_frames"], record_rate)}" '
+        f'tcStart="{_rational(_record_offset(record_rate), record_rate)}" tcFormat="{timecode_format}" '
+        f'audioLayout="{"mono" if first["channel_layout"] == "mono" else "stereo"}" '
+        f'audioRate="{_audio_rate(first["sample_rate"])}">',
+        '          <spine>',
+        *clips,
+        '          </spine>',
+        '        </sequence>',
+        '      </project>',
+        '    </event>',
+        '  </library>',
+        '</fcpxml>',
+        ''
+    ])
+
+
+def render_cut_list(cut_list, fmt):
+    """Kesim listesini istenen biçimde metin olarak döner"""
+    if fmt == 'edl':
+        return to_edl(cut_list)
+    if fmt == 'fcpxml':
+        return to_fcpxml(cut_list)
+    return to_json(cut_list)
@@ -0,0 +1,68 @@
+"""
+İsimli kodlama profilleri ve yüke göre x264 preset seçimi
+
+Her profil libx264 preset'i, CRF değeri, thread sayısı ve AAC bit hızını
+belirler. "auto" profili render başladığı anda kuyrukta bekleyen job
+sayısına bakar: kuyruk boşken balanced ile aynıdır, kuyruk derinleştikçe
+daha hızlı preset'lere geçer. Böylece yoğun anlarda her job biraz daha
+büyük dosya üretir ama kuyruk eriyebilir; kalite (CRF) sabit kalır.
+"""
+
+# threads: 0 = libx264 kendi seçer (paralel render'da CPU payı kullanılır)
+ENCODING_PROFILES = {
+    'fast': {'preset': 'veryfast', 'crf': 26, 'threads': 0, 'audio_bitrate': '96k'},
+    'balanced': {'preset': 'medium', 'crf': 23, 'threads': 0, 'audio_bitrate': '128k'},
+    'archive': {'preset': 'slow', 'crf': 18, 'threads': 0, 'audio_bitrate': '192k'}
+}
+
+AUTO_PROFILE = 'auto'
+
+# Önizleme (proxy) render'ı: kalite yerine hız, düşük çözünürlükle birlikte kullanılır; istekle seçilemez
+PROXY_PROFILE = {'preset': 'ultrafast', 'crf': 30, 'threads': 0, 'audio_bitrate': '64k', 'name': 'proxy'}
+PROFILE_NAMES = (*ENCODING_PROFILES, AUTO_PROFILE)
+
+# auto profilinde (worker başına bekleyen job sayısı üst sınırı, preset); son satır üst sınırsız
+AUTO_PRESET_STEPS = [
+    (0, 'medium'),
+    (1, 'faster'),
+    (2, 'veryfast'),
+    (None, 'superfast')
+]
+
+
+def auto_preset(queue_pending, workers):
+    """Worker başına bekleyen job sayısına göre x264 preset'i seç"""
+    backlog = queue_pending / max(1, workers)
+    for limit, preset in AUTO_PRESET_STEPS:
+        if limit is None or backlog <= limit:
+            return preset
+
+
+def resolve_profile(name, queue_pending=0, workers=1):
+    """Profil adını ayarlara çevir; 'auto' o anki kuyruk derinliğine göre çözülür
+
+    Dönen sözlükte 'name' alanı loglarda görünür (ör. 'auto:veryfast').
+    """
+    if name == AUTO_PROFILE:
+        preset = auto_preset(queue_pending, workers)
+        return {**ENCODING_PROFILES['balanced'], 'preset': preset, 'name': f"{AUTO_PROFILE}:{preset}"}
+    return {**ENCODING_PROFILES[name], 'name': name}
+
+
+def x264_quality_params(profile):
+    """Preset ve CRF parametreleri (codec/profil seçimi çağırana bırakılır)"""
+    return ['-preset', profile['preset'], '-crf', str(profile['crf'])]
+
+
+def video_params(profile, threads=0):
+    """libx264 kodlama parametreleri; profil thread sayısı belirtmiyorsa threads kullanılır"""
+    params = ['-c:v', 'libx264', *x264_quality_params(profile)]
+    threads = profile['threads'] or threads
+    if threads:
+        params += ['-threads', str(threads)]
+    return params
+
+
+def audio_params(profile):
+    """AAC kodlama parametreleri"""
+    return ['-c:a', 'aac', '-b:a', profile['audio_bitrate']]
@@ -0,0 +1,166 @@
+"""
+İlerleme raporlayan, stderr'i sınırlı tutan ve takılan süreçleri öldüren FFmpeg çalıştırıcı
+
+FFmpeg -progress pipe:1 ile başlatılır; stdout'tan gelen key=value blokları
+satır satır okunur ve her blokta çıktı zamanı ile kodlama hızı bildirilir.
+stderr ayrı bir thread'de okunur ve sadece son satırları (ring buffer)
+saklanır; uzun kodlamalarda bellek büyümez, hata mesajı için son satırlar
+yeterlidir. Bekçi (watchdog) thread'i, belirlenen süre boyunca ilerleme
+kaydetmeyen süreci öldürür.
+"""
+
+import subprocess
+import time
+from collections import deque
+from threading import Thread, Event, Lock
+
+# İlerleme kaydedilmeden geçebilecek en uzun süre (saniye), 0 = bekçi kapalı
+DEFAULT_STALL_TIMEOUT = 120.0
+# Hata mesajı için saklanan son stderr satırı sayısı
+DEFAULT_STDERR_LINES = 50
+
+_defaults = {'stall_timeout': DEFAULT_STALL_TIMEOUT, 'stderr_lines': DEFAULT_STDERR_LINES}
+
+# Şu anda çalışan (run_ffmpeg ile başlatılmış) FFmpeg süreci sayısı
+_active = {'processes': 0}
+_active_lock = Lock()
+
+
+def configure(stall_timeout=None, stderr_lines=None):
+    """Tüm çağrılarda kullanılan varsayılanları ayarla (uygulama başlangıcında)"""
+    if stall_timeout is not None:
+        _defaults['stall_timeout'] = stall_timeout
+    if stderr_lines is not None:
+        _defaults['stderr_lines'] = stderr_lines
+
+
+def active_processes():
+    """run_ffmpeg ile başlatılıp henüz bitmemiş FFmpeg süreci sayısı"""
+    with _active_lock:
+        return _active['processes']
+
+
+def _parse_float(value):
+    try:
+        return float(value.rstrip('x'))
+    except (AttributeError, ValueError):
+        return None  # 'N/A'
+
+
+def run_ffmpeg(args, error_prefix="FFmpeg hatası", on_progress=None, stall_timeout=None, stderr_lines=None):
+    """ffmpeg'i args ile çalıştır; başarısız olursa RuntimeError fırlatır
+
+    on_progress(out_seconds, fps): her ilerleme bloğunda çağrılır.
+    stall_timeout saniye boyunca çıktı zamanı, kare sayısı ve dosya boyutu
+    değişmezse süreç öldürülür. Hata mesajı stderr'in son satırlarını içerir.
+    """
+    stall_timeout = _defaults['stall_timeout'] if stall_timeout is None else stall_timeout
+    stderr_tail = deque(maxlen=stderr_lines or _defaults['stderr_lines'])
+
+    process = subprocess.Popen(['ffmpeg', '-hide_banner', '-nostats', '-progress', 'pipe:1', *args],
+                               stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, errors='replace')
+    with _active_lock:
+        _active['processes'] += 1
+
+    def read_stderr():
+        for line in process.stderr:
+            stderr_tail.append(line.rstrip('\n'))
+
+    stderr_thread = Thread(target=read_stderr, daemon=True)
+    stderr_thread.start()
+
+    state_lock = Lock()
+    last_advance = [time.monotonic()]
+    stalled = Event()
+    finished = Event()
+
+    def watchdog():
+        while not finished.wait(1.0):
+            with state_lock:
+                idle = time.monotonic() - last_advance[0]
+            if idle > stall_timeout:
+                stalled.set()
+                process.kill()
+                return
+
+    if stall_timeout:
+        Thread(target=watchdog, daemon=True).start()
+
+    block = {}
+    last_position = None
+    try:
+        for line in process.stdout:
+            key, _, value = line.strip().partition('=')
+            if key != 'progress':
+                block[key] = value
+                continue
+
+            # Blok sonu; out_time_ms eski sürümlerde de mikrosaniyedir
+            out_us = _parse_float(block.get('out_time_us', block.get('out_time_ms')))
+            position = (out_us, block.get('frame'), block.get('total_size'))
+            if position != last_position:
+                last_position = position
+                with state_lock:
+                    last_advance[0] = time.monotonic()
+            if on_progress and out_us is not None and out_us >= 0:
+                on_progress(out_us / 1_000_000, _parse_float(block.get('fps')))
+            block = {}
+        process.wait()
+    finally:
+        finished.set()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        stderr_thread.join()
+        with _active_lock:
+            _active['processes'] -= 1
+
+    if stalled.is_set():
+        raise RuntimeError(f"{error_prefix}: {stall_timeout:.0f} sn boyunca ilerleme olmadı, süreç durduruldu\n"
+                           + "\n".join(stderr_tail))
+    if process.returncode != 0:
+        raise RuntimeError(f"{error_prefix}: " + "\n".join(stderr_tail))
+
+
+class ProgressTracker:
+    """Çıktı zamanından yüzde, hız ve kalan süre hesaplayıp callback'e bildirir
+
+    Bildirimler en fazla min_interval saniyede bir yapılır; paralel gruplardan
+    aynı anda çağrılabilir.
+    """
+
+    def __init__(self, duration, callback, min_interval=1.0):
+        self.duration = duration
+        self.callback = callback
+        self.min_interval = min_interval
+        self.start_time = time.monotonic()
+        self.last_report = 0.0
+        self.last_fps = None
+        self.lock = Lock()
+
+    def snapshot(self, out_seconds, fps=None):
+        elapsed = time.monotonic() - self.start_time
+        out_seconds = min(out_seconds, self.duration) if self.duration else out_seconds
+        speed = out_seconds / elapsed if elapsed > 0 else None
+        eta = (self.duration - out_seconds) / speed if self.duration and speed else None
+        return {
+            'percent': round(100.0 * out_seconds / self.duration, 1) if self.duration else None,
+            'out_seconds': round(out_seconds, 2),
+            'fps': round(fps, 1) if fps is not None else None,
+            'speed': round(speed, 2) if speed is not None else None,
+            'eta_seconds': round(eta, 1) if eta is not None else None
+        }
+
+    def update(self, out_seconds, fps=None):
+        now = time.monotonic()
+        with self.lock:
+            self.last_fps = fps
+            if now - self.last_report < self.min_interval:
+                return
+            self.last_report = now
+        self.callback(self.snapshot(out_seconds, fps))
+
+    def finish(self):
+        """Tamamlandı bildirimi (%100) gönder"""
+        self.callback({**self.snapshot(self.duration or 0.0, self.last_fps), 'percent': 100.0, 'eta_seconds': 0.0})
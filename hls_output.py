@@ -0,0 +1,66 @@
+"""
+Kodlama sürerken izlenebilen HLS (fragmanlı MP4) çıktısı
+
+Final render FFmpeg tee muxer'ı ile aynı kodlanmış akışı iki yere yazar:
+/result'ın sunduğu MP4 dosyası ve hls/ klasöründe fMP4 segmentleriyle
+büyüyen bir EVENT playlist'i. Keyframe'ler segment süresine zorlanır; her
+segment kapandığında playlist'e eklenir, oynatıcılar ilk segment yazılır
+yazılmaz izlemeye başlayabilir. Segmentler ve playlist geçici isimle yazılıp
+taşındığı (temp_file) için yarım dosya sunulmaz. Segment ve init dosyası
+isimleri playlist yolundan türetildiği için tee seçeneklerine dosya yolu
+yazılmaz.
+"""
+
+PLAYLIST_NAME = 'playlist.m3u8'
+INIT_SEGMENT_NAME = 'init.mp4'
+
+CONTENT_TYPES = {
+    '.m3u8': 'application/vnd.apple.mpegurl',
+    '.mp4': 'video/mp4',
+    '.m4s': 'video/iso.segment'
+}
+
+
+def _tee_path(path):
+    """tee çıkış listesi için dosya yolu (':' protokol sanılmasın diye file: önekli)"""
+    for char in "\\'|":
+        path = path.replace(char, '\\' + char)
+    return 'file:' + path
+
+
+def hls_muxer_options(segment_seconds):
+    return {
+        'hls_time': segment_seconds,
+        'hls_list_size': 0,
+        'hls_playlist_type': 'event',
+        'hls_segment_type': 'fmp4',
+        'hls_flags': 'independent_segments+temp_file',
+        'hls_fmp4_init_filename': INIT_SEGMENT_NAME
+    }
+
+
+def progressive_output_args(mp4_path, playlist_path, segment_seconds):
+    """MP4 ve HLS çıktısını tek kodlamayla yazan FFmpeg çıkış parametreleri
+
+    Kodlama parametrelerinden sonra, çıkış dosyası yerine kullanılır.
+    """
+    hls_options = ':'.join(f"{key}={value}" for key, value in hls_muxer_options(segment_seconds).items())
+    return [
+        '-force_key_frames', f"expr:gte(t,n_forced*{segment_seconds})",
+        # tee kendisi global header istemez; MP4 ve fMP4 init segmenti codec ayarlarını header'da bekler
+        '-flags', '+global_header',
+        '-f', 'tee',
+        '-y',
+        f"[f=mp4:movflags=+faststart]{_tee_path(mp4_path)}|[f=hls:{hls_options}]{_tee_path(playlist_path)}"
+    ]
+
+
+def package_args(mp4_path, playlist_path, segment_seconds):
+    """Hazır MP4'ü yeniden kodlamadan HLS'e paketleyen FFmpeg parametreleri
+
+    Segmentler kaynaktaki keyframe'lerde bölünür (ör. smart cut çıktısı).
+    """
+    args = ['-i', mp4_path, '-map', '0', '-c', 'copy', '-f', 'hls']
+    for key, value in hls_muxer_options(segment_seconds).items():
+        args += [f"-{key}", str(value)]
+    return [*args, '-y', playlist_path]
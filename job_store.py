@@ -0,0 +1,428 @@
+"""
+Birden fazla worker sürecinin paylaştığı SQLite job ve log deposu
+
+Veritabanı WAL modunda açılır; okuyucular yazarı beklemez, aynı dosyayı
+kullanan tüm süreçler diğerlerinin job'larını /status ve /logs üzerinden
+görebilir, servis yeniden başlasa da kayıtlar kaybolmaz. Log kayıtları ve
+durum güncellemeleri iş thread'inde sadece kuyruğa eklenir; arka plandaki
+yazıcı thread'i bunları flush_interval aralıklarla tek transaction'da toplu
+yazar. Yazılamayan toplu kayıt (ör. veritabanı kilitli) kuyruğun başına geri
+alınır ve sonraki turda tekrar denenir; max_write_attempts denemeden sonra
+atlanır ve uyarı loglanır. Log sorguları job_id / id indeksleri üzerinden
+sayfalanır.
+"""
+
+import atexit
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+from collections import deque
+from threading import Event, Lock, Thread, local
+
+from log_store import LogRecord, FINISHED_STATUSES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    finished REAL,
+    owner TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs(created);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs(finished);
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT,
+    seq INTEGER,
+    created REAL NOT NULL,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS logs_job ON logs(job_id, id);
+CREATE INDEX IF NOT EXISTS logs_created ON logs(created);
+CREATE TABLE IF NOT EXISTS webhooks (
+    transcript_id TEXT PRIMARY KEY,
+    created REAL NOT NULL
+);
+"""
+
+# Bekleyeni olmayan (ör. job'ı iptal olmuş) webhook sinyallerinin tutulma süresi (saniye)
+WEBHOOK_SIGNAL_TTL = 3600
+
+LOG_COLUMNS = "id, job_id, seq, created, level, message, metadata"
+
+
+def _process_start(pid):
+    """Sürecin başlama zamanı (boot'tan beri tick); PID yeniden kullanımını ayırt etmek için"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().rsplit(')', 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+
+
+def process_owner():
+    """Bu sürecin job sahipliği etiketi: host:pid:başlama zamanı"""
+    return f"{socket.gethostname()}:{os.getpid()}:{_process_start(os.getpid())}"
+
+
+def _owner_alive(owner):
+    """Aynı host'taki sahip süreç hâlâ çalışıyor mu (başka host'lar için bilinmez -> True)"""
+    host, _, rest = owner.partition(':')
+    pid, _, started = rest.partition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    return _process_start(int(pid)) == started if started != 'None' else os.path.exists(f'/proc/{pid}')
+
+
+def _record_from_row(row):
+    record = LogRecord(row[4], row[5], row[1], json.loads(row[6]) if row[6] else None)
+    record.id, record.seq, record.created = row[0], row[2], row[3]
+    return record
+
+
+class SQLiteJobStore:
+    """WAL modunda, toplu yazan SQLite job/log deposu"""
+
+    def __init__(self, path, flush_interval=0.2, busy_timeout=5.0, max_write_attempts=5, writer=None):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.flush_interval = flush_interval
+        self.max_write_attempts = max_write_attempts
+        self.writer = writer  # Uyarıların yazıldığı LogWriter (None = stderr)
+        self.owner = process_owner()
+        self.local = local()  # Thread başına bağlantı
+        self.pending = deque()
+        self.flush_lock = Lock()  # Toplu yazmalar ve durum geçişleri sırayla yapılır
+        self.written = 0
+        self.write_errors = 0
+        self.failed_attempts = 0  # Kuyruğun başındaki kayıtların art arda başarısız yazma denemesi
+        self.dropped = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+
+        self.closed = Event()
+        self.thread = Thread(target=self._run, name='jumpcut-job-store', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def _connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            # WAL'de NORMAL: her commit'te fsync yok, güç kesintisinde sadece son işlemler kaybolabilir
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    # ------------------------------------------------------------------
+    # Yazma (kuyruk + arka plan thread'i)
+    # ------------------------------------------------------------------
+
+    def add_log(self, record):
+        """Log kaydını toplu yazılmak üzere kuyruğa ekle"""
+        self.pending.append(('log', (record.job_id, record.seq, record.created, record.level,
+                                     record.message, json.dumps(record.metadata, default=str)
+                                     if record.metadata else None)))
+
+    def save_job(self, job_id, status):
+        """Job durumunun anlık kopyasını kuyruğa ekle (status sözlüğü burada serileştirilir)"""
+        now = time.time()
+        finished = now if status['status'] in FINISHED_STATUSES else None
+        self.pending.append(('job', (job_id, status['status'], now, now, finished, self.owner,
+                                     json.dumps(status, default=str))))
+
+    def flush(self):
+        """Kuyruktaki kayıtları tek transaction'da yaz
+
+        Hata olursa kayıtlar sıraları korunarak kuyruğun başına geri alınır ve
+        hata yeniden fırlatılır; max_write_attempts'e ulaşılınca atlanır.
+        """
+        with self.flush_lock:
+            self._write_pending()
+
+    def _write_pending(self):
+        batch = []
+        try:
+            while True:
+                batch.append(self.pending.popleft())
+        except IndexError:
+            pass
+        if not batch:
+            return
+        logs = [row for kind, row in batch if kind == 'log']
+        jobs = [row for kind, row in batch if kind == 'job']
+
+        connection = self._connection()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            if logs:
+                connection.executemany(
+                    "INSERT INTO logs (job_id, seq, created, level, message, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+                    logs)
+            if jobs:
+                # Aynı job'ın sonraki güncellemesi öncekini ezer; created ilk kayıttan korunur
+                connection.executemany(
+                    "INSERT INTO jobs (job_id, status, created, updated, finished, owner, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(job_id) DO UPDATE SET status=excluded.status, updated=excluded.updated, "
+                    "finished=excluded.finished, owner=excluded.owner, data=excluded.data",
+                    jobs)
+            connection.execute("COMMIT")
+            self.written += len(batch)
+            self.failed_attempts = 0
+        except sqlite3.Error as e:
+            if connection.in_transaction:
+                try:
+                    connection.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+            self.write_errors += 1
+            self.failed_attempts += 1
+            if self.failed_attempts < self.max_write_attempts:
+                # Sonraki turda bu turda eklenenlerden önce yazılsın
+                self.pending.extendleft(reversed(batch))
+            else:
+                self.failed_attempts = 0
+                self.dropped += len(batch)
+                self._warn(f"Veritabanına {self.max_write_attempts} denemede yazılamayan "
+                           f"{len(batch)} kayıt atlandı: {e}")
+            raise
+
+    def transition(self, job_id, expected, update):
+        """Durumu expected'dan biri olan job'ı atomik olarak güncelle
+
+        Bekleyen yazmalar önce yazılır, okuma ve güncelleme aynı yazma
+        transaction'ında yapılır; UPDATE ... WHERE status IN (expected)
+        koşulu sağlanmazsa (ör. başka süreç job'ı az önce kuyruğa aldı)
+        hiçbir şey değişmez. update(status) kayıtlı durum sözlüğünü alıp
+        yenisini döner. (yeni durum, job'ın son log sıra numarası) ya da
+        None döner.
+        """
+        placeholders = ', '.join('?' * len(expected))
+        with self.flush_lock:
+            self._write_pending()
+            connection = self._connection()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                row = connection.execute(
+                    f"SELECT data FROM jobs WHERE job_id = ? AND status IN ({placeholders})",
+                    (job_id, *expected)).fetchone()
+                if row is None:
+                    connection.execute("ROLLBACK")
+                    return None
+
+                status = update(json.loads(row[0]))
+                now = time.time()
+                finished = now if status['status'] in FINISHED_STATUSES else None
+                cursor = connection.execute(
+                    f"UPDATE jobs SET status = ?, updated = ?, finished = ?, owner = ?, data = ? "
+                    f"WHERE job_id = ? AND status IN ({placeholders})",
+                    (status['status'], now, finished, self.owner, json.dumps(status, default=str),
+                     job_id, *expected))
+                if cursor.rowcount != 1:
+                    connection.execute("ROLLBACK")
+                    return None
+                last_seq = self.last_log_seq(job_id)
+                connection.execute("COMMIT")
+            except sqlite3.Error:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+        return status, last_seq
+
+    def signal_webhook(self, transcript_id):
+        """Webhook geldiğini kaydet; transkripti başka süreç bekliyor olabilir
+
+        Kuyruğa alınmadan hemen yazılır, bekleyen taraf bir sonraki yoklamada görür.
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO webhooks (transcript_id, created) VALUES (?, ?)",
+            (transcript_id, time.time()))
+
+    def take_webhook(self, transcript_id):
+        """Transkript için webhook geldiyse kaydı silip True döner (tek bekleyen tüketir)"""
+        cursor = self._connection().execute("DELETE FROM webhooks WHERE transcript_id = ?", (transcript_id,))
+        return cursor.rowcount > 0
+
+    def _warn(self, message):
+        # LogManager kullanılamaz (kayıt yine bu depoya düşer); doğrudan konsola yazılır
+        record = LogRecord("WARNING", message, metadata={'path': self.path})
+        if self.writer:
+            self.writer.write(record)
+        else:
+            print(record.console_line(), file=sys.stderr)
+
+    def _run(self):
+        while not self.closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # Kayıtlar kuyruğa geri alındı, sonraki turda tekrar denenir
+        # Kapanışta kalanlar için son denemeler (her başarısızlıkta deneme sayacı artar)
+        for _ in range(self.max_write_attempts):
+            try:
+                self.flush()
+                break
+            except sqlite3.Error:
+                time.sleep(self.flush_interval)
+
+    def close(self, timeout=5.0):
+        """Kuyruktakileri yaz ve yazıcı thread'ini durdur"""
+        self.closed.set()
+        self.thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+
+    def get_job(self, job_id):
+        row = self._connection().execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def last_log_seq(self, job_id):
+        """Job'ın veritabanındaki son log sıra numarası (SSE cursor'ı), yoksa 0"""
+        # seq job içinde id ile birlikte artar; logs_job indeksinden tek satır okunur
+        row = self._connection().execute(
+            "SELECT seq FROM logs WHERE job_id = ? ORDER BY id DESC LIMIT 1", (job_id,)).fetchone()
+        return (row[0] or 0) if row else 0
+
+    def list_jobs(self, limit=0, offset=0):
+        """En yeni job'lar önce; {job_id: status} döner"""
+        rows = self._connection().execute(
+            "SELECT job_id, data FROM jobs ORDER BY created DESC LIMIT ? OFFSET ?",
+            (limit or -1, offset)).fetchall()
+        return {job_id: json.loads(data) for job_id, data in rows}
+
+    def get_logs(self, job_id=None, limit=100, before=None, after=None):
+        """Sayfalı log sorgusu; LogRecord listesi (eskiden yeniye) döner
+
+        before: bu id'den eski en yeni limit kayıt (varsayılan: en sondan)
+        after: bu id'den yeni en eski limit kayıt (ileri sayfalama)
+        """
+        conditions, params = [], []
+        if job_id:
+            conditions.append("job_id = ?")
+            params.append(job_id)
+        if before is not None:
+            conditions.append("id < ?")
+            params.append(before)
+        if after is not None:
+            conditions.append("id > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = "ASC" if after is not None and before is None else "DESC"
+
+        rows = self._connection().execute(
+            f"SELECT {LOG_COLUMNS} FROM logs {where} ORDER BY id {order} LIMIT ?",
+            (*params, limit or -1)).fetchall()
+        if order == "DESC":
+            rows.reverse()
+        return [_record_from_row(row) for row in rows]
+
+    def job_events_since(self, job_id, seq, status_version):
+        """LogManager._job_events_since'in veritabanı karşılığı (başka süreçteki job'lar için)
+
+        Durum sürümü job satırının son güncelleme zamanıdır; job yoksa None döner.
+        """
+        connection = self._connection()
+        rows = connection.execute(
+            f"SELECT {LOG_COLUMNS} FROM logs WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, seq)).fetchall()
+        job = connection.execute("SELECT updated, data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+
+        new_logs = [_record_from_row(row) for row in rows]
+        if job is None:
+            return new_logs, None, None
+        version, data = job
+        return new_logs, json.loads(data) if version != status_version else None, version
+
+    # ------------------------------------------------------------------
+    # Bakım
+    # ------------------------------------------------------------------
+
+    def prune(self, max_jobs=0, ttl=0):
+        """Saklama sınırlarını aşan bitmiş job'ları ve loglarını sil, silinen job sayısını döner
+
+        Job'a bağlı olmayan loglar da ttl'den eskiyse, tüketilmemiş webhook
+        sinyalleri WEBHOOK_SIGNAL_TTL'den eskiyse silinir.
+        """
+        connection = self._connection()
+        connection.execute("DELETE FROM webhooks WHERE created < ?", (time.time() - WEBHOOK_SIGNAL_TTL,))
+        expired = []
+        if ttl:
+            expired += connection.execute(
+                "SELECT job_id FROM jobs WHERE finished IS NOT NULL AND finished < ?",
+                (time.time() - ttl,)).fetchall()
+        if max_jobs:
+            expired += connection.execute(
+                "SELECT job_id FROM jobs WHERE finished IS NOT NULL ORDER BY finished DESC LIMIT -1 OFFSET ?",
+                (max_jobs,)).fetchall()
+        if not expired and not ttl:
+            return 0
+
+        job_ids = list({job_id for job_id, in expired})
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany("DELETE FROM logs WHERE job_id = ?", [(job_id,) for job_id in job_ids])
+            connection.executemany("DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id in job_ids])
+            if ttl:
+                connection.execute("DELETE FROM logs WHERE job_id IS NULL AND created < ?", (time.time() - ttl,))
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+
+        return len(job_ids)
+
+    def recover_orphans(self):
+        """Bu host'ta ölmüş süreçlere ait, bitmemiş job'ları error olarak işaretle
+
+        Servis yeniden başladığında kuyruktaki ya da işlenen job'lar sonsuza
+        kadar 'processing' görünmesin. Diğer host'ların job'larına dokunulmaz.
+        """
+        connection = self._connection()
+        rows = connection.execute(
+            "SELECT job_id, owner, data FROM jobs WHERE finished IS NULL").fetchall()
+
+        now = time.time()
+        recovered = []
+        for job_id, owner, data in rows:
+            if not owner or _owner_alive(owner):
+                continue
+            status = json.loads(data)
+            status['status'] = 'error'
+            status.setdefault('metadata', {})['error'] = "Job'ı işleyen süreç sonlandı (servis yeniden başlatıldı)"
+            recovered.append(('error', now, now, json.dumps(status, default=str), job_id))
+
+        if recovered:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "UPDATE jobs SET status = ?, updated = ?, finished = ?, data = ? WHERE job_id = ?", recovered)
+            connection.execute("COMMIT")
+        return len(recovered)
+
+    def stats(self):
+        try:
+            db_size = sum(os.path.getsize(self.path + suffix) for suffix in ('', '-wal')
+                          if os.path.exists(self.path + suffix))
+        except OSError:
+            db_size = None
+        return {
+            'db_pending_writes': len(self.pending),
+            'db_written_rows': self.written,
+            'db_write_errors': self.write_errors,
+            'db_dropped_rows': self.dropped,
+            'db_size_mb': round(db_size / (1024 * 1024), 2) if db_size is not None else None
+        }
@@ -0,0 +1,510 @@
+"""
+Bellek içi job log ve durum deposu (isteğe bağlı SQLite kalıcılığıyla)
+
+Log kayıtları __slots__'lu küçük nesneler olarak saklanır; zaman damgası,
+sözlük ve konsol satırı ancak okunurken (API yanıtı, SSE, konsol)
+oluşturulur. Konsol/JSON çıktısı, sınırlı bir kuyruktan beslenen arka plan
+thread'i tarafından yazılır; add_log iş thread'inde sadece kaydı oluşturup
+lock altında iki deque'ye ekler. Kuyruk dolarsa satırlar beklemeden atlanır
+ve sayılır, bellekteki loglar etkilenmez.
+
+LogManager'a bir store (job_store.SQLiteJobStore) verilirse kayıtlar ayrıca
+veritabanına yazılır ve /logs, /status okumaları oradan yapılır; böylece
+aynı veritabanını kullanan tüm worker süreçleri aynı job'ları görür.
+"""
+
+import atexit
+import copy
+import json
+import os
+import resource
+import sys
+import time
+from collections import deque, OrderedDict
+from datetime import datetime, timezone
+from itertools import count, islice
+from threading import Lock, Event, Thread
+
+# Bu durumlara geçen job'lar bitmiş sayılır ve saklama sınırlarına tabidir
+FINISHED_STATUSES = ('completed', 'error')
+
+LEVEL_SYMBOLS = {
+    'INFO': 'ℹ️',
+    'SUCCESS': '✅',
+    'WARNING': '⚠️',
+    'ERROR': '❌'
+}
+
+LOG_FORMATS = ('text', 'json')
+DEFAULT_LOG_QUEUE_MAX = 10000
+
+
+def format_timestamp(created):
+    """Unix zamanını API'nin kullandığı ISO biçimine çevir (ör. 2024-01-01T12:00:00.123456Z)"""
+    return datetime.fromtimestamp(created, timezone.utc).replace(tzinfo=None).isoformat() + 'Z'
+
+
+class LogRecord:
+    """Tek bir log kaydı; biçimlendirme okunurken yapılır
+
+    metadata sözlüğü kopyalanmadan saklanır, add_log'dan sonra değiştirilmemelidir.
+    """
+
+    __slots__ = ('created', 'level', 'message', 'job_id', 'metadata', 'seq', 'id')
+
+    def __init__(self, level, message, job_id=None, metadata=None):
+        self.created = time.time()
+        self.level = level  # INFO, WARNING, ERROR, SUCCESS
+        self.message = message
+        self.job_id = job_id
+        self.metadata = metadata
+        self.seq = None  # Job içindeki sıra numarası (SSE cursor'ı)
+        self.id = None  # Depodaki sıra numarası (/logs sayfalama cursor'ı)
+
+    def to_dict(self):
+        entry = {
+            'timestamp': format_timestamp(self.created),
+            'level': self.level,
+            'message': self.message,
+            'job_id': self.job_id,
+            'metadata': self.metadata or {}
+        }
+        if self.id is not None:
+            entry['id'] = self.id
+        if self.seq is not None:
+            entry['seq'] = self.seq
+        return entry
+
+    def console_line(self):
+        """Geliştirme ve debug için okunabilir konsol satırı"""
+        symbol = LEVEL_SYMBOLS.get(self.level, '•')
+        line = f"[{format_timestamp(self.created)}] {symbol} [{self.level}] {self.message}"
+
+        if self.metadata:
+            metadata_strs = [f"{key}={value}" for key, value in self.metadata.items()
+                             if key != 'job_id']  # job_id zaten ayrı gösteriliyor
+            if metadata_strs:
+                line += f" | {' | '.join(metadata_strs)}"
+
+        if self.job_id:
+            line += f" | job_id={self.job_id[:8]}..."
+        return line
+
+    def json_line(self):
+        """Log toplayıcılar için tek satırlık JSON"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+
+
+class LogWriter:
+    """Log kayıtlarını arka plan thread'inde stream'e yazan sınırlı kuyruk
+
+    write() sadece bir deque.append'dir (atomik, lock ve sinyal yok); yazıcı
+    thread'i kuyruğu flush_interval saniyede bir boşaltıp toplu yazar.
+    Kuyruk doluysa yeni kayıt atlanır ve dropped sayacı artar. Süreç
+    kapanırken kalan kayıtlar yazılır.
+    """
+
+    def __init__(self, stream=None, fmt='text', max_queue=DEFAULT_LOG_QUEUE_MAX, flush_interval=0.05):
+        if fmt not in LOG_FORMATS:
+            raise ValueError(f"Geçersiz log biçimi: {fmt} (desteklenenler: {', '.join(LOG_FORMATS)})")
+        self.stream = stream  # None = sys.stdout (yazma anında çözülür)
+        self.fmt = fmt
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval
+        self.pending = deque()
+        self.dropped = 0  # Yarış durumunda birkaç eksik sayılabilir, sadece gösterge
+        self.reported_dropped = 0
+        self.closed = Event()
+        self.thread = Thread(target=self._run, name='jumpcut-log-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, record):
+        if len(self.pending) >= self.max_queue:
+            self.dropped += 1
+            return
+        self.pending.append(record)
+
+    def _format(self, record):
+        return record.json_line() if self.fmt == 'json' else record.console_line()
+
+    def _flush(self):
+        lines = []
+        pending = self.pending
+        try:
+            while True:
+                lines.append(self._format(pending.popleft()))
+        except IndexError:
+            pass
+
+        newly_dropped = self.dropped - self.reported_dropped
+        if newly_dropped:
+            self.reported_dropped += newly_dropped
+            lines.append(self._format(LogRecord("WARNING", f"Log kuyruğu dolu, {newly_dropped} satır yazılmadı")))
+
+        if not lines:
+            return
+        stream = self.stream or sys.stdout
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except (OSError, ValueError):
+            pass  # Kapalı stdout yüzünden yazıcı durmasın
+
+    def _run(self):
+        while not self.closed.wait(self.flush_interval):
+            self._flush()
+        self._flush()
+
+    def close(self, timeout=2.0):
+        """Kuyruktakileri yaz ve thread'i durdur"""
+        self.closed.set()
+        self.thread.join(timeout)
+
+    def stats(self):
+        return {'log_queue_depth': len(self.pending), 'log_lines_dropped': self.dropped}
+
+
+def _apply_status(status_entry, status):
+    """Mevcut job durum sözlüğünü yeni duruma geçir (updated_at listesine eklenir)"""
+    status_entry['status'] = status
+    status_entry.setdefault('updated_at', []).append(format_timestamp(time.time()))
+
+
+def process_memory():
+    """Sürecin anlık ve tepe bellek kullanımı (MB)"""
+    rss_mb = None
+    try:
+        with open('/proc/self/statm') as f:
+            rss_mb = round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    # Linux'ta ru_maxrss KB cinsindendir
+    peak_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return {'rss_mb': rss_mb, 'peak_rss_mb': peak_rss_mb}
+
+
+class LogManager:
+    """In-memory log yönetim sistemi
+
+    Bitmiş job'lar en fazla max_jobs adet ve job_ttl saniye tutulur; sayı
+    sınırı job bittiği anda, süre sınırı arka plandaki temizleyici ile
+    uygulanır. Sadece durum ve loglar silinir, diskteki çıktılara dokunulmaz.
+    writer verilmezse loglar konsola yazılmaz. store verilirse bellek sadece
+    bu sürecin job'ları için SSE bildirimlerinde kullanılır, okumalar ve
+    saklama sınırları veritabanı üzerinden yapılır.
+    """
+
+    # Başka süreçteki job'ı SSE ile izlerken veritabanını yoklama aralığı (saniye)
+    STORE_POLL_INTERVAL = 0.5
+
+    def __init__(self, max_logs=1000, max_jobs=0, job_ttl=0, writer=None, store=None):
+        self.max_logs = max_logs
+        self.max_jobs = max_jobs  # 0 = sınırsız
+        self.job_ttl = job_ttl  # Saniye, 0 = süresiz
+        self.writer = writer
+        self.store = store
+        self.log_ids = count(1)
+        self.finished_jobs = OrderedDict()  # job_id -> bitiş zamanı, eskiden yeniye
+        self.evicted_jobs = 0
+        self.logs = deque(maxlen=max_logs)  # Son N log kaydını tutar
+        self.job_logs = {}  # job_id -> log kayıtları
+        self.job_status = {}  # job_id -> status bilgisi
+        self.job_log_seq = {}  # job_id -> son log sıra numarası (SSE cursor'ı)
+        self.job_status_version = {}  # job_id -> durum/ilerleme değişiklik sayacı
+        self.job_listeners = {}  # job_id -> bekleyen SSE bağlantılarının Event'leri
+        self.lock = Lock()  # Thread-safe işlemler için
+
+    def add_log(self, level, message, job_id=None, metadata=None):
+        """Log kaydı ekle; konsol çıktısı arka planda yazılır"""
+        record = LogRecord(level, message, job_id, metadata)
+
+        with self.lock:
+            record.id = next(self.log_ids)
+            self.logs.append(record)
+
+            # Job bazlı log takibi
+            if job_id:
+                job_logs = self.job_logs.get(job_id)
+                if job_logs is None:
+                    job_logs = self.job_logs[job_id] = deque(maxlen=500)
+                self.job_log_seq[job_id] = record.seq = self.job_log_seq.get(job_id, 0) + 1
+                job_logs.append(record)
+                if job_id in self.job_listeners:
+                    self._notify(job_id)
+
+        if self.store:
+            self.store.add_log(record)
+        if self.writer:
+            self.writer.write(record)
+
+    def _notify(self, job_id):
+        """Job'ı dinleyen SSE bağlantılarını uyandır (lock tutulurken çağrılır)"""
+        for event in self.job_listeners.get(job_id, ()):
+            event.set()
+
+    def get_logs(self, job_id=None, limit=100, before=None, after=None):
+        """Log mesajlarını (en yenisi sonda) sözlük olarak getir
+
+        before/after kayıtların id'si üzerinden sayfalar: before verilirse o
+        kayıttan eski en yeni limit kayıt, sadece after verilirse ondan yeni
+        en eski limit kayıt döner.
+        """
+        if self.store:
+            records = self.store.get_logs(job_id, limit, before, after)
+            return [record.to_dict() for record in records]
+
+        with self.lock:
+            if job_id:
+                logs = self.job_logs.get(job_id, ())
+            else:
+                logs = self.logs
+            if after is not None and before is None:
+                # İleri sayfalama: after'dan sonraki ilk limit kayıt
+                start = next((i for i, record in enumerate(logs) if record.id > after), len(logs))
+                records = list(islice(logs, start, start + limit if limit else None))
+            else:
+                # Sadece istenen son kayıtlar kopyalanır
+                newest = reversed(logs)
+                if before is not None:
+                    newest = (record for record in newest if record.id < before)
+                if after is not None:
+                    newest = (record for record in newest if record.id > after)
+                records = list(islice(newest, limit)) if limit else list(newest)
+                records.reverse()
+        return [record.to_dict() for record in records]
+
+    def update_job_status(self, job_id, status, metadata=None, expected=None):
+        """Job durumunu güncelle, durum değiştiyse True döner
+
+        Job bu süreçte yoksa (başka süreçte bitmiş ya da bellekten silinmiş)
+        veritabanındaki durumu yüklenip üzerine yazılır; metadata, log sıra
+        numarası ve durum sürümü kaldığı yerden devam eder. expected
+        verilirse durum sadece mevcut durum bunlardan biriyse değişir
+        (compare-and-set); store varsa kontrol ve geçiş veritabanında tek
+        transaction'da yapılır, aynı job'ı iki süreç birden alamaz.
+        """
+        if self.store and expected is not None:
+            return self._transition_in_store(job_id, status, metadata, expected)
+        if self.store and not self._is_local(job_id):
+            stored = self.store.get_job(job_id)
+            if stored is not None:
+                self._adopt(job_id, stored, self.store.last_log_seq(job_id))
+
+        with self.lock:
+            current = self.job_status.get(job_id)
+            if expected is not None and (current is None or current['status'] not in expected):
+                return False
+            if current is None:
+                current = self.job_status[job_id] = {
+                    'created_at': format_timestamp(time.time()),
+                    'status': status,
+                    'metadata': {}
+                }
+            else:
+                _apply_status(current, status)
+
+            if metadata:
+                current['metadata'].update(metadata)
+
+            if self.store:
+                # Lock altında kuyruğa alınır; aynı job'ın güncellemeleri sırayla yazılır
+                self.store.save_job(job_id, current)
+            self._status_changed(job_id, status)
+        return True
+
+    def _transition_in_store(self, job_id, status, metadata, expected):
+        """update_job_status(expected=...) veritabanı ile: geçiş atomik, sonuç belleğe alınır"""
+        def update(stored):
+            _apply_status(stored, status)
+            if metadata:
+                stored['metadata'].update(metadata)
+            return stored
+
+        result = self.store.transition(job_id, expected, update)
+        if result is None:
+            return False
+        self._adopt(job_id, *result)
+        with self.lock:
+            self._status_changed(job_id, status)
+        return True
+
+    def _adopt(self, job_id, stored, last_seq):
+        """Veritabanındaki durumu bu sürecin belleğine al (log sırası kaldığı yerden sürer)"""
+        with self.lock:
+            self.job_status[job_id] = stored
+            self.job_log_seq[job_id] = max(self.job_log_seq.get(job_id, 0), last_seq)
+
+    def _status_changed(self, job_id, status):
+        """Sürümü artır, dinleyenleri uyandır, saklama sınırlarını uygula (lock tutulurken çağrılır)"""
+        self.job_status_version[job_id] = self.job_status_version.get(job_id, 0) + 1
+        self._notify(job_id)
+
+        if status not in FINISHED_STATUSES:
+            self.finished_jobs.pop(job_id, None)
+        else:
+            self.finished_jobs[job_id] = time.time()
+            self.finished_jobs.move_to_end(job_id)
+            while self.max_jobs and len(self.finished_jobs) > self.max_jobs:
+                self._evict(next(iter(self.finished_jobs)))
+
+    def _evict(self, job_id):
+        """Job'ın bellekteki kayıtlarını sil (lock tutulurken çağrılır)
+
+        Diskteki çıktılara dokunulmaz; önizleme kaynakları ve sonuçlar
+        POST /render ve /result için yerinde kalır (bkz. OUTPUT_TTL).
+        """
+        self.finished_jobs.pop(job_id, None)
+        self.job_logs.pop(job_id, None)
+        self.job_log_seq.pop(job_id, None)
+        self.job_status_version.pop(job_id, None)
+        self.job_status.pop(job_id, None)
+        self.evicted_jobs += 1
+        # Hâlâ bekleyen SSE bağlantıları uyanıp akışı kapatsın
+        self._notify(job_id)
+
+    def sweep(self):
+        """Süresi dolan bitmiş job'ları ve durumu olmayan sahipsiz logları sil, silinen job sayısını döner"""
+        evicted = 0
+        with self.lock:
+            if self.job_ttl:
+                expire_before = time.time() - self.job_ttl
+                while self.finished_jobs:
+                    job_id, finished_at = next(iter(self.finished_jobs.items()))
+                    if finished_at > expire_before:
+                        break
+                    self._evict(job_id)
+                    evicted += 1
+
+            # Ör. silinmiş bir job için geç gelen webhook logu
+            for job_id in [job_id for job_id in self.job_logs if job_id not in self.job_status]:
+                del self.job_logs[job_id]
+                self.job_log_seq.pop(job_id, None)
+
+        if self.store:
+            # Veritabanındaki kayıtlar tüm süreçler için burada silinir
+            evicted = self.store.prune(self.max_jobs, self.job_ttl)
+        return evicted
+
+    def start_sweeper(self, interval):
+        """sweep()'i interval saniyede bir çalıştıran arka plan thread'ini başlat"""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    evicted = self.sweep()
+                except Exception as e:
+                    self.add_log("ERROR", f"Job temizleme hatası: {e}")
+                    continue
+                if evicted:
+                    self.add_log("INFO", f"Süresi dolan {evicted} job bellekten silindi", metadata=self.stats())
+
+        Thread(target=run, name='jumpcut-sweeper', daemon=True).start()
+
+    def stats(self):
+        """Saklama ve bellek sayaçlarını getir"""
+        with self.lock:
+            counters = {
+                'jobs_tracked': len(self.job_status),
+                'jobs_finished': len(self.finished_jobs),
+                'jobs_evicted': self.evicted_jobs,
+                'job_log_entries': sum(len(logs) for logs in self.job_logs.values()),
+                'global_log_entries': len(self.logs),
+                'sse_listeners': sum(len(listeners) for listeners in self.job_listeners.values())
+            }
+        if self.writer:
+            counters.update(self.writer.stats())
+        if self.store:
+            counters.update(self.store.stats())
+        return {**counters, **process_memory()}
+
+    def update_job_progress(self, job_id, video_num, progress):
+        """Videonun render ilerlemesini güncelle
+
+        Sık çağrıldığı için durum değiştirmez ve updated_at listesine eklemez.
+        """
+        with self.lock:
+            if job_id in self.job_status:
+                self.job_status[job_id]['metadata'].setdefault('progress', {})[str(video_num)] = progress
+                self.job_status_version[job_id] = self.job_status_version.get(job_id, 0) + 1
+                self._notify(job_id)
+                if self.store:
+                    self.store.save_job(job_id, self.job_status[job_id])
+
+    def _job_events_since(self, job_id, cursor, status_version):
+        """cursor'dan sonraki log kayıtları ve (sürüm değiştiyse) durumun kopyası"""
+        new_logs = []
+        for record in reversed(self.job_logs.get(job_id, ())):
+            if record.seq <= cursor:
+                break
+            new_logs.append(record)
+        new_logs.reverse()
+
+        if job_id not in self.job_status:
+            # Job silinmiş
+            return new_logs, None, None
+
+        version = self.job_status_version.get(job_id, 0)
+        status = None
+        if version != status_version:
+            status = copy.deepcopy(self.job_status[job_id])
+        return new_logs, status, version
+
+    def wait_job_events(self, job_id, cursor=0, status_version=None, timeout=15.0):
+        """Job'da cursor'dan sonra yeni log ya da durum değişikliği olana kadar bekle
+
+        Sadece yeni kayıtlar kopyalanır; bekleme lock dışında yapılır.
+        (yeni LogRecord'lar, değiştiyse durum ya da None, durum sürümü) döner.
+        """
+        if self.store and not self._is_local(job_id):
+            return self._wait_store_events(job_id, cursor, status_version, timeout)
+
+        event = Event()
+        with self.lock:
+            new_logs, status, version = self._job_events_since(job_id, cursor, status_version)
+            if new_logs or status is not None:
+                return new_logs, status, version
+            self.job_listeners.setdefault(job_id, set()).add(event)
+
+        event.wait(timeout)
+
+        with self.lock:
+            listeners = self.job_listeners.get(job_id)
+            if listeners is not None:
+                listeners.discard(event)
+                if not listeners:
+                    del self.job_listeners[job_id]
+            return self._job_events_since(job_id, cursor, status_version)
+
+    def _is_local(self, job_id):
+        with self.lock:
+            return job_id in self.job_status
+
+    def _wait_store_events(self, job_id, cursor, status_version, timeout):
+        """Başka süreçteki job için wait_job_events: veritabanını aralıklarla yokla"""
+        deadline = time.monotonic() + timeout
+        while True:
+            new_logs, status, version = self.store.job_events_since(job_id, cursor, status_version)
+            if new_logs or status is not None or version is None:
+                return new_logs, status, version
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return new_logs, status, version
+            time.sleep(min(self.STORE_POLL_INTERVAL, remaining))
+
+    def get_job_status(self, job_id):
+        """Job durumunu getir (bu süreçte yoksa veritabanından)"""
+        with self.lock:
+            status = self.job_status.get(job_id, None)
+        if status is None and self.store:
+            status = self.store.get_job(job_id)
+        return status
+
+    def get_all_jobs(self, limit=0, offset=0):
+        """Tüm job'ları getir (veritabanında en yeniler önce, limit 0 = hepsi)"""
+        if self.store:
+            return self.store.list_jobs(limit, offset)
+        with self.lock:
+            jobs = list(self.job_status.items())
+        jobs = jobs[::-1][offset:offset + limit if limit else None]
+        return dict(jobs)
@@ -1,16 +1,35 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, g, Response, stream_with_context
+from flask.wrappers import Request
 from flask_cors import CORS
-import requests
 import time
+import json
 import subprocess
 import os
 from dotenv import load_dotenv
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
 import tempfile
 import uuid
+import shutil
 from datetime import datetime
 from collections import deque
-from threading import Lock
+from threading import Lock, Event, Thread
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from transcript_cache import TranscriptCache
+from assemblyai_client import AssemblyAIClient, RequestStats
+from upload_tee import UploadSpool, ChunkPipe
+from smart_cut import render_smart_cut, SmartCutUnsupported
+from parallel_render import available_cpus, plan_batches, render_parallel
+from cut_graph import build_cut_graph, build_multi_input_graph, write_filter_script, configure as configure_cut_graph
+from silence_detector import segments_from_words
+from audio_analysis import detect_voice_activity, refine_boundaries
+from log_store import LogManager, LogWriter, FINISHED_STATUSES
+from job_store import SQLiteJobStore
+from ffmpeg_runner import run_ffmpeg, ProgressTracker, active_processes, configure as configure_ffmpeg_runner
+from metrics import MetricsRegistry
+from encoding_profiles import PROFILE_NAMES, PROXY_PROFILE, resolve_profile, video_params, audio_params, x264_quality_params
+from cut_list import CUT_LIST_FORMATS, build_cut_list, render_cut_list
+from hls_output import PLAYLIST_NAME, CONTENT_TYPES, progressive_output_args, package_args
 
 # .env dosyasını yükle
 load_dotenv()
@@ -21,121 +40,424 @@ CORS(app)  # CORS desteği
 # Konfigürasyon
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max dosya boyutu
 app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
+app.config['OUTPUT_FOLDER'] = os.getenv('OUTPUT_FOLDER', 'outputvideo')  # Job çıktılarının kök klasörü (job başına alt klasör)
+app.config['USE_X_SENDFILE'] = os.getenv('RESULT_X_SENDFILE', 'false').lower() in ('1', 'true', 'yes')  # /result dosyasını X-Sendfile ile sunucuya devret (Apache/lighttpd)
+app.config['RESULT_ACCEL_PREFIX'] = os.getenv('RESULT_ACCEL_PREFIX', '')  # nginx internal location'ı; ayarlıysa /result X-Accel-Redirect döner
+app.config['JOB_WORKERS'] = int(os.getenv('JOB_WORKERS', 2))  # Aynı anda işlenecek job sayısı
+app.config['JOB_QUEUE_MAX'] = int(os.getenv('JOB_QUEUE_MAX', 50))  # Bekleyen job sınırı (0 = sınırsız)
+app.config['TRANSCRIBE_WORKERS'] = int(os.getenv('TRANSCRIBE_WORKERS', 8))  # Eşzamanlı AssemblyAI transkript sayısı
+app.config['FFMPEG_WORKERS'] = int(os.getenv('FFMPEG_WORKERS', 2))  # Eşzamanlı FFmpeg kesme işlemi sayısı
+app.config['AUDIO_EXTRACT'] = os.getenv('AUDIO_EXTRACT', 'true').lower() in ('1', 'true', 'yes')  # Sadece ses yükle
+app.config['AUDIO_EXTRACT_BITRATE'] = os.getenv('AUDIO_EXTRACT_BITRATE', '24k')  # Mono 16 kHz Opus bit hızı
+app.config['UPLOAD_TEE'] = os.getenv('UPLOAD_TEE', 'true').lower() in ('1', 'true', 'yes')  # AUDIO_EXTRACT kapalı ve transkript önbelleği kapalıyken geçerli
+app.config['TRANSCRIPT_CACHE_DIR'] = os.getenv('TRANSCRIPT_CACHE_DIR',
+                                               os.path.join(tempfile.gettempdir(), 'jumpcut_transcript_cache'))
+app.config['TRANSCRIPT_CACHE_MAX_MB'] = int(os.getenv('TRANSCRIPT_CACHE_MAX_MB', 512))  # 0 = önbellek kapalı
+app.config['WEBHOOK_BASE_URL'] = os.getenv('WEBHOOK_BASE_URL', '').rstrip('/')  # Dışarıdan erişilebilen servis adresi
+app.config['WEBHOOK_SECRET'] = os.getenv('WEBHOOK_SECRET', '')  # Webhook isteklerini doğrulamak için paylaşılan sır
+app.config['POLL_MIN_INTERVAL'] = float(os.getenv('POLL_MIN_INTERVAL', 1.0))  # Saniye
+app.config['POLL_MAX_INTERVAL'] = float(os.getenv('POLL_MAX_INTERVAL', 15.0))  # Saniye
+app.config['POLL_EXPECTED_RATIO'] = float(os.getenv('POLL_EXPECTED_RATIO', 0.15))  # Tahmini transkript süresi / ses süresi
+app.config['WEBHOOK_POLL_INTERVAL'] = float(os.getenv('WEBHOOK_POLL_INTERVAL', 60.0))  # Webhook açıkken yedek sorgu aralığı
+app.config['ASSEMBLYAI_POOL_SIZE'] = int(os.getenv('ASSEMBLYAI_POOL_SIZE', app.config['TRANSCRIBE_WORKERS']))  # Açık tutulan bağlantı sayısı
+app.config['ASSEMBLYAI_MAX_RETRIES'] = int(os.getenv('ASSEMBLYAI_MAX_RETRIES', 3))  # Geçici hatalarda tekrar deneme sayısı
+app.config['ASSEMBLYAI_CONNECT_TIMEOUT'] = float(os.getenv('ASSEMBLYAI_CONNECT_TIMEOUT', 10.0))  # Saniye
+app.config['ASSEMBLYAI_READ_TIMEOUT'] = float(os.getenv('ASSEMBLYAI_READ_TIMEOUT', 60.0))  # Saniye
+app.config['ASSEMBLYAI_UPLOAD_CHUNK_KB'] = int(os.getenv('ASSEMBLYAI_UPLOAD_CHUNK_KB', 1024))  # Upload parça boyutu
+app.config['CUT_MODE'] = os.getenv('CUT_MODE', 'reencode').lower()  # Varsayılan kesme modu: reencode | smart
+app.config['RENDER_MODE'] = os.getenv('RENDER_MODE', 'per_video').lower()  # Çok videolu job'larda: per_video (ayrı kodla + birleştir) | single_pass (tek FFmpeg grafiği)
+app.config['OUTPUT_FORMAT'] = os.getenv('OUTPUT_FORMAT', 'mp4').lower()  # Varsayılan çıktı: mp4 | hls (MP4 + kodlanırken büyüyen HLS playlist'i)
+app.config['HLS_SEGMENT_SECONDS'] = int(os.getenv('HLS_SEGMENT_SECONDS', 4))  # HLS segment (ve zorlanan keyframe) aralığı
+app.config['PREVIEW_HEIGHT'] = int(os.getenv('PREVIEW_HEIGHT', 360))  # preview=true önizleme render'ının en fazla yüksekliği
+app.config['CUT_GRAPH'] = os.getenv('CUT_GRAPH', 'auto').lower()  # Kesim filtre grafiği: auto (segment sayısına göre) | trim | select
+app.config['TRIM_GRAPH_MAX_SEGMENTS'] = int(os.getenv('TRIM_GRAPH_MAX_SEGMENTS', 8))  # auto'da trim grafiği kullanılan en fazla segment sayısı
+app.config['SMART_CUT_MIN_COPY'] = float(os.getenv('SMART_CUT_MIN_COPY', 2.0))  # Kopyalanacak en kısa GOP aralığı (saniye)
+app.config['RENDER_PARALLELISM'] = int(os.getenv('RENDER_PARALLELISM', 0)) or available_cpus()  # Video başına paralel FFmpeg süreci (0 = CPU kotası)
+app.config['RENDER_MIN_BATCH_SECONDS'] = float(os.getenv('RENDER_MIN_BATCH_SECONDS', 10.0))  # Paralel kodlanacak en kısa grup
+app.config['SILENCE_THRESHOLD_MS'] = float(os.getenv('SILENCE_THRESHOLD_MS', 1000))  # Bundan uzun boşluklar kesilir
+app.config['LEAD_PADDING_MS'] = float(os.getenv('LEAD_PADDING_MS', 0))  # Segment başına eklenen pay
+app.config['TAIL_PADDING_MS'] = float(os.getenv('TAIL_PADDING_MS', 0))  # Segment sonuna eklenen pay
+app.config['MIN_SEGMENT_MS'] = float(os.getenv('MIN_SEGMENT_MS', 0))  # Bundan kısa segmentler komşusuyla birleştirilir
+app.config['DETECTION_MODE'] = os.getenv('DETECTION_MODE', 'transcript').lower()  # Varsayılan tespit modu: transcript | energy
+app.config['ENERGY_THRESHOLD_DB'] = float(os.getenv('ENERGY_THRESHOLD_DB', -40.0))  # energy modunda konuşma sayılan en düşük seviye (dBFS)
+app.config['ENERGY_WINDOW_MS'] = int(os.getenv('ENERGY_WINDOW_MS', 20))  # energy modunda RMS pencere uzunluğu
+app.config['REFINE_BOUNDARIES'] = os.getenv('REFINE_BOUNDARIES', 'false').lower() in ('1', 'true', 'yes')  # Kesim noktalarını sese göre hizala
+app.config['REFINE_WINDOW_MS'] = int(os.getenv('REFINE_WINDOW_MS', 300))  # Kesim noktası etrafında aranan aralık (±ms)
+app.config['ENCODING_PROFILE'] = os.getenv('ENCODING_PROFILE', 'balanced').lower()  # Varsayılan kodlama profili: fast | balanced | archive | auto
+app.config['FFMPEG_STALL_TIMEOUT'] = float(os.getenv('FFMPEG_STALL_TIMEOUT', 120.0))  # İlerlemeyen FFmpeg süreci bu kadar saniye sonra öldürülür (0 = kapalı)
+app.config['FFMPEG_STDERR_LINES'] = int(os.getenv('FFMPEG_STDERR_LINES', 50))  # Hata mesajı için saklanan son stderr satırı
+app.config['JOB_RETENTION_MAX'] = int(os.getenv('JOB_RETENTION_MAX', 500))  # Bellekte tutulan en fazla bitmiş job (0 = sınırsız)
+app.config['JOB_RETENTION_SECONDS'] = float(os.getenv('JOB_RETENTION_SECONDS', 86400))  # Bitmiş job'ın tutulma süresi (0 = süresiz)
+app.config['JOB_SWEEP_INTERVAL'] = float(os.getenv('JOB_SWEEP_INTERVAL', 60))  # Süresi dolan job'ları temizleme aralığı (saniye)
+app.config['OUTPUT_TTL'] = float(os.getenv('OUTPUT_TTL', 0))  # Bitmiş job klasörlerinin diskte tutulma süresi (saniye, 0 = silinmez)
+app.config['LOG_FORMAT'] = os.getenv('LOG_FORMAT', 'text').lower()  # Konsol log biçimi: text | json
+app.config['LOG_QUEUE_MAX'] = int(os.getenv('LOG_QUEUE_MAX', 10000))  # Konsola yazılmayı bekleyen en fazla log (dolunca satır atlanır)
+app.config['JOB_DB_PATH'] = os.getenv('JOB_DB_PATH', '')  # Job ve logların SQLite veritabanı (boş = sadece bellek; worker'lar aynı dosyayı paylaşır)
+app.config['JOB_DB_FLUSH_INTERVAL'] = float(os.getenv('JOB_DB_FLUSH_INTERVAL', 0.2))  # Veritabanına toplu yazma aralığı (saniye)
+app.config['JOB_DB_WRITE_ATTEMPTS'] = int(os.getenv('JOB_DB_WRITE_ATTEMPTS', 5))  # Yazılamayan toplu kayıt bu kadar denemeden sonra atlanır
+app.config['SSE_KEEPALIVE_SECONDS'] = float(os.getenv('SSE_KEEPALIVE_SECONDS', 15.0))  # Olay yokken /events bağlantısına gönderilen yorum aralığı
+
+configure_ffmpeg_runner(app.config['FFMPEG_STALL_TIMEOUT'], app.config['FFMPEG_STDERR_LINES'])
+configure_cut_graph(app.config['CUT_GRAPH'], app.config['TRIM_GRAPH_MAX_SEGMENTS'])
+
+# Desteklenen kesme modları
+CUT_MODES = ('reencode', 'smart')
+
+# Çok videolu job'larda render yöntemi
+RENDER_MODES = ('per_video', 'single_pass')
+
+# Çıktı biçimleri; hls'de MP4'e ek olarak /result/<job_id>/hls/ altında segmentler yayınlanır
+OUTPUT_FORMATS = ('mp4', 'hls')
+
+# Önizleme job'larında kaynak videoların saklandığı alt klasör ve önizleme dosyası
+SOURCES_DIR = 'sources'
+PREVIEW_NAME = 'preview.mp4'
+
+# Desteklenen sessizlik tespit modları: AssemblyAI transkripti ya da yerel ses enerjisi
+DETECTION_MODES = ('transcript', 'energy')
+
+# İstek başına ayarlanabilen sessizlik parametreleri: form alanı -> config anahtarı
+SILENCE_OPTIONS = {
+    'silence_threshold_ms': 'SILENCE_THRESHOLD_MS',
+    'lead_padding_ms': 'LEAD_PADDING_MS',
+    'tail_padding_ms': 'TAIL_PADDING_MS',
+    'min_segment_ms': 'MIN_SEGMENT_MS'
+}
 
 # ============================================================================
 # LOG YÖNETİM SİSTEMİ
 # ============================================================================
 
-class LogManager:
-    """In-memory log yönetim sistemi"""
-    
-    def __init__(self, max_logs=1000):
-        self.max_logs = max_logs
-        self.logs = deque(maxlen=max_logs)  # Son N log mesajını tutar
-        self.job_logs = {}  # job_id -> log listesi
-        self.job_status = {}  # job_id -> status bilgisi
-        self.lock = Lock()  # Thread-safe işlemler için
-    
-    def add_log(self, level, message, job_id=None, metadata=None):
-        """Log mesajı ekle ve konsola yazdır"""
-        timestamp = datetime.utcnow().isoformat() + 'Z'
-        log_entry = {
-            'timestamp': timestamp,
-            'level': level,  # INFO, WARNING, ERROR, SUCCESS
-            'message': message,
-            'job_id': job_id,
-            'metadata': metadata or {}
-        }
-        
-        # Konsola yazdır (geliştirme ve debug için)
-        level_symbols = {
-            'INFO': 'ℹ️',
-            'SUCCESS': '✅',
-            'WARNING': '⚠️',
-            'ERROR': '❌'
-        }
-        symbol = level_symbols.get(level, '•')
-        
-        # Konsol çıktısı formatla
-        console_msg = f"[{timestamp}] {symbol} [{level}] {message}"
-        
-        # Metadata varsa ekle
-        if metadata:
-            metadata_strs = []
-            for key, value in metadata.items():
-                if key not in ['job_id']:  # job_id zaten ayrı gösteriliyor
-                    metadata_strs.append(f"{key}={value}")
-            if metadata_strs:
-                console_msg += f" | {' | '.join(metadata_strs)}"
-        
-        # Job ID varsa ekle
-        if job_id:
-            console_msg += f" | job_id={job_id[:8]}..."
+log_writer = LogWriter(fmt=app.config['LOG_FORMAT'], max_queue=app.config['LOG_QUEUE_MAX'])
+
+# Kalıcı, süreçler arası paylaşılan depo (isteğe bağlı)
+job_store = None
+if app.config['JOB_DB_PATH']:
+    job_store = SQLiteJobStore(app.config['JOB_DB_PATH'], flush_interval=app.config['JOB_DB_FLUSH_INTERVAL'],
+                               max_write_attempts=app.config['JOB_DB_WRITE_ATTEMPTS'], writer=log_writer)
+
+# Global log manager instance
+log_manager = LogManager(max_jobs=app.config['JOB_RETENTION_MAX'], job_ttl=app.config['JOB_RETENTION_SECONDS'],
+                         writer=log_writer, store=job_store)
+# Veritabanında sayı sınırı da temizleyici ile uygulanır
+if (app.config['JOB_RETENTION_SECONDS'] or job_store) and app.config['JOB_SWEEP_INTERVAL'] > 0:
+    log_manager.start_sweeper(app.config['JOB_SWEEP_INTERVAL'])
+
+if job_store:
+    recovered = job_store.recover_orphans()
+    log_manager.add_log("INFO", "Job veritabanı açıldı", metadata={
+        'path': app.config['JOB_DB_PATH'],
+        'recovered_jobs': recovered
+    })
+
+# ============================================================================
+# JOB KUYRUĞU
+# ============================================================================
+
+class JobQueue:
+    """Sabit boyutlu worker havuzu ile arka plan job kuyruğu"""
+    
+    def __init__(self, max_workers, max_pending=0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending  # 0 = sınırsız
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='jumpcut-job')
+        self.pending = 0  # Kuyrukta bekleyen job sayısı
+        self.running = 0  # Şu an işlenen job sayısı
+        self.lock = Lock()
+    
+    def is_full(self):
+        """Bekleyen job sınırına ulaşıldı mı"""
+        with self.lock:
+            return bool(self.max_pending) and self.pending >= self.max_pending
+    
+    def submit(self, func, *args):
+        """Job'ı kuyruğa ekle"""
+        with self.lock:
+            self.pending += 1
         
-        print(console_msg)
+        def _run():
+            with self.lock:
+                self.pending -= 1
+                self.running += 1
+            try:
+                return func(*args)
+            finally:
+                with self.lock:
+                    self.running -= 1
         
+        return self.executor.submit(_run)
+    
+    def stats(self):
+        """Kuyruk durumunu getir"""
         with self.lock:
-            self.logs.append(log_entry)
-            
-            # Job bazlı log takibi
-            if job_id:
-                if job_id not in self.job_logs:
-                    self.job_logs[job_id] = deque(maxlen=500)
-                self.job_logs[job_id].append(log_entry)
-    
-    def get_logs(self, job_id=None, limit=100):
-        """Log mesajlarını getir"""
+            return {
+                'queue_pending': self.pending,
+                'queue_running': self.running,
+                'queue_workers': self.max_workers
+            }
+
+# Global job kuyruğu
+job_queue = JobQueue(app.config['JOB_WORKERS'], app.config['JOB_QUEUE_MAX'])
+
+# Video bazlı aşamalar için paylaşılan havuzlar: transkript ağ beklemesi,
+# FFmpeg ise CPU ağırlıklı olduğu için ayrı sınırlarla çalışır
+transcription_executor = ThreadPoolExecutor(max_workers=app.config['TRANSCRIBE_WORKERS'],
+                                            thread_name_prefix='jumpcut-transcribe')
+render_executor = ThreadPoolExecutor(max_workers=app.config['FFMPEG_WORKERS'],
+                                     thread_name_prefix='jumpcut-ffmpeg')
+
+# Ses izi hash'i ile adreslenen transkript önbelleği
+transcript_cache = None
+if app.config['TRANSCRIPT_CACHE_MAX_MB'] > 0:
+    transcript_cache = TranscriptCache(app.config['TRANSCRIPT_CACHE_DIR'],
+                                       app.config['TRANSCRIPT_CACHE_MAX_MB'] * 1024 * 1024)
+
+# Job klasörleri saklama sınırlarından bağımsızdır; sadece OUTPUT_TTL ayarlıysa silinir
+def _is_job_id(name):
+    try:
+        return str(uuid.UUID(name)) == name
+    except ValueError:
+        return False
+
+
+def _last_modified(path):
+    """Klasörün ve içindeki dosyaların en son değişme zamanı"""
+    latest = os.path.getmtime(path)
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            try:
+                latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+            except OSError:
+                pass
+    return latest
+
+
+def sweep_outputs(ttl):
+    """ttl saniyedir değişmeyen, işlenmeyen job klasörlerini sil, silinen sayısını döner
+
+    Durumu bellekten ya da veritabanından silinmiş job'ların klasörleri de
+    değişme zamanına göre silinir; kuyruktaki / işlenen job'lara dokunulmaz.
+    """
+    expire_before = time.time() - ttl
+    try:
+        entries = [entry for entry in os.scandir(app.config['OUTPUT_FOLDER'])
+                   if entry.is_dir(follow_symlinks=False) and _is_job_id(entry.name)]
+    except OSError:
+        return 0
+
+    removed = 0
+    for entry in entries:
+        status = log_manager.get_job_status(entry.name)
+        if status and status['status'] not in FINISHED_STATUSES:
+            continue
+        try:
+            if _last_modified(entry.path) > expire_before:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(entry.path, ignore_errors=True)
+        removed += 1
+    return removed
+
+
+def start_output_sweeper(ttl, interval):
+    """sweep_outputs()'u interval saniyede bir çalıştıran arka plan thread'ini başlat"""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                removed = sweep_outputs(ttl)
+            except Exception as e:
+                log_manager.add_log("ERROR", f"Çıktı klasörü temizleme hatası: {e}")
+                continue
+            if removed:
+                log_manager.add_log("INFO", f"Süresi dolan {removed} job klasörü silindi", metadata={
+                    'output_folder': app.config['OUTPUT_FOLDER'],
+                    'output_ttl': ttl
+                })
+
+    Thread(target=run, name='jumpcut-output-sweeper', daemon=True).start()
+
+
+if app.config['OUTPUT_TTL'] > 0 and app.config['JOB_SWEEP_INTERVAL'] > 0:
+    start_output_sweeper(app.config['OUTPUT_TTL'], app.config['JOB_SWEEP_INTERVAL'])
+
+# ============================================================================
+# METRİKLER (/metrics, Prometheus metin biçimi)
+# ============================================================================
+
+metrics = MetricsRegistry()
+# stage: audio_extract, upload, transcription_wait, energy_analysis, silence_detection,
+# boundary_refine, encode, concat
+stage_duration = metrics.histogram('jumpcut_stage_duration_seconds', 'Video işleme aşamalarının süresi', ['stage'])
+job_duration = metrics.histogram('jumpcut_job_duration_seconds',
+                                 "Job'ın kabulünden bitişine kadar geçen süre (kuyruk beklemesi dahil)", ['status'])
+jobs_finished = metrics.counter('jumpcut_jobs_total', 'Biten job sayısı', ['status'])
+input_bytes = metrics.counter('jumpcut_input_bytes_total', 'İşlenen girdi videolarının toplam boyutu')
+output_bytes = metrics.counter('jumpcut_output_bytes_total', 'Üretilen final videoların toplam boyutu')
+input_seconds = metrics.counter('jumpcut_input_seconds_total', 'Kesilen girdi videolarının toplam süresi')
+output_seconds = metrics.counter('jumpcut_output_seconds_total', 'Kesimden sonra kalan toplam süre')
+duration_ratio = metrics.histogram('jumpcut_duration_ratio', 'Video başına girdi süresinin çıktı süresine oranı',
+                                   buckets=(1, 1.1, 1.25, 1.5, 2, 3, 5, 10))
+metrics.gauge('jumpcut_queue_pending', "Kuyrukta bekleyen job sayısı",
+              function=lambda: job_queue.stats()['queue_pending'])
+metrics.gauge('jumpcut_queue_running', "İşlenmekte olan job sayısı",
+              function=lambda: job_queue.stats()['queue_running'])
+metrics.gauge('jumpcut_queue_workers', "Aynı anda işlenebilecek en fazla job", function=lambda: job_queue.max_workers)
+metrics.gauge('jumpcut_ffmpeg_processes', 'Çalışan FFmpeg süreci sayısı', function=active_processes)
+
+# ============================================================================
+# TRANSKRİPT BEKLEME (WEBHOOK + ADAPTİF POLLING)
+# ============================================================================
+
+class TranscriptWaiter:
+    """Transkript bekleyen thread'leri webhook geldiğinde uyandırır
+
+    store (SQLiteJobStore) verilirse webhook başka bir worker sürecine
+    gelse de bekleyen uyanır: bu süreçte bekleyeni olmayan webhook
+    veritabanına yazılır, bekleyenler STORE_POLL_INTERVAL aralıklarla bakar.
+    """
+    
+    # Webhook sinyali için veritabanını yoklama aralığı (saniye)
+    STORE_POLL_INTERVAL = 1.0
+    
+    def __init__(self, max_early=1000, store=None):
+        self.events = {}  # transcript_id -> Event
+        self.job_ids = {}  # transcript_id -> job_id (webhook logları için)
+        self.early = deque(maxlen=max_early)  # Bekleyen kaydolmadan gelen webhook'lar
+        self.store = store
+        self.lock = Lock()
+    
+    def register(self, transcript_id, job_id=None):
+        """Transkript için bekleme kaydı oluştur"""
+        event = Event()
         with self.lock:
-            if job_id:
-                if job_id in self.job_logs:
-                    logs = list(self.job_logs[job_id])
-                    return logs[-limit:] if limit else logs
-                return []
-            else:
-                logs = list(self.logs)
-                return logs[-limit:] if limit else logs
+            if transcript_id in self.early:
+                self.early.remove(transcript_id)
+                event.set()
+            self.events[transcript_id] = event
+            self.job_ids[transcript_id] = job_id
     
-    def update_job_status(self, job_id, status, metadata=None):
-        """Job durumunu güncelle"""
+    def unregister(self, transcript_id):
+        """Bekleme kaydını sil"""
         with self.lock:
-            if job_id not in self.job_status:
-                self.job_status[job_id] = {
-                    'created_at': datetime.utcnow().isoformat() + 'Z',
-                    'status': status,
-                    'metadata': {}
-                }
-            else:
-                self.job_status[job_id]['status'] = status
-                if 'updated_at' not in self.job_status[job_id]:
-                    self.job_status[job_id]['updated_at'] = []
-                self.job_status[job_id]['updated_at'].append(datetime.utcnow().isoformat() + 'Z')
-            
-            if metadata:
-                self.job_status[job_id]['metadata'].update(metadata)
+            self.events.pop(transcript_id, None)
+            self.job_ids.pop(transcript_id, None)
     
-    def get_job_status(self, job_id):
-        """Job durumunu getir"""
+    def notify(self, transcript_id):
+        """Webhook geldi: bekleyen thread'i uyandır, job_id'yi döner"""
         with self.lock:
-            return self.job_status.get(job_id, None)
+            event = self.events.get(transcript_id)
+            if event is None:
+                # Webhook, transkript ID'si kaydedilmeden önce gelmiş olabilir
+                self.early.append(transcript_id)
+            else:
+                event.set()
+                return self.job_ids.get(transcript_id)
+        if self.store:
+            # Transkripti başka bir worker bekliyor olabilir
+            self.store.signal_webhook(transcript_id)
+        return None
     
-    def get_all_jobs(self):
-        """Tüm job'ları getir"""
+    def wait(self, transcript_id, timeout):
+        """Webhook gelene ya da timeout dolana kadar bekle, webhook geldiyse True döner"""
         with self.lock:
-            return dict(self.job_status)
+            event = self.events.get(transcript_id)
+        if event is None:
+            time.sleep(timeout)
+            return False
+        if not self.store:
+            notified = event.wait(timeout)
+            event.clear()
+            return notified
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            if event.wait(min(self.STORE_POLL_INTERVAL, max(0.0, deadline - time.monotonic()))):
+                event.clear()
+                return True
+            if self.store.take_webhook(transcript_id):
+                return True
+            if time.monotonic() >= deadline:
+                return False
 
-# Global log manager instance
-log_manager = LogManager()
+transcript_waiter = TranscriptWaiter(store=job_store)
+
+def next_poll_delay(elapsed, audio_duration):
+    """Bir sonraki transkript sorgusuna kadar beklenecek süre (saniye)
+
+    Transkriptin ses süresinin belirli bir oranında (POLL_EXPECTED_RATIO)
+    biteceği varsayılır. Tahmini bitişten önce kalan sürenin yarısı kadar
+    beklenir, yani bitişe yaklaştıkça sorgular sıklaşır; tahmin aşıldıktan
+    sonra ise gecikmeyle orantılı olarak seyrekleşir. Sonuç
+    POLL_MIN_INTERVAL ile POLL_MAX_INTERVAL arasında tutulur.
+    """
+    min_delay = app.config['POLL_MIN_INTERVAL']
+    max_delay = app.config['POLL_MAX_INTERVAL']
+    expected = max(min_delay, (audio_duration or 0) * app.config['POLL_EXPECTED_RATIO'])
+    
+    if elapsed < expected:
+        delay = (expected - elapsed) / 2
+    else:
+        delay = (elapsed - expected) / 2
+    
+    return min(max(delay, min_delay), max_delay)
 
-base_url = "https://api.assemblyai.com"
+base_url = os.getenv("ASSEMBLYAI_BASE_URL", "https://api.assemblyai.com").rstrip('/')
 
 # API key'i .env dosyasından al
-api_key = os.getenv("ASSEMBLYAI_API_KEY")
-if not api_key:
-    raise ValueError("ASSEMBLYAI_API_KEY .env dosyasında bulunamadı. Lütfen .env dosyasını kontrol edin.")
+# Anahtar yoksa servis yine başlar, sadece mode=energy (yerel tespit) istekleri kabul edilir
+api_key = os.getenv("ASSEMBLYAI_API_KEY") or ''
 
-headers = {
-    "authorization": api_key
-}
+# Tüm job'ların paylaştığı bağlantı havuzlu AssemblyAI istemcisi
+assemblyai = AssemblyAIClient(
+    base_url,
+    api_key,
+    pool_size=app.config['ASSEMBLYAI_POOL_SIZE'],
+    max_retries=app.config['ASSEMBLYAI_MAX_RETRIES'],
+    connect_timeout=app.config['ASSEMBLYAI_CONNECT_TIMEOUT'],
+    read_timeout=app.config['ASSEMBLYAI_READ_TIMEOUT'],
+    upload_chunk_size=app.config['ASSEMBLYAI_UPLOAD_CHUNK_KB'] * 1024
+)
+
+# Diske yazılırken aynı anda AssemblyAI'ye akıtılan upload'lar
+tee_upload_executor = ThreadPoolExecutor(max_workers=app.config['ASSEMBLYAI_POOL_SIZE'],
+                                         thread_name_prefix='jumpcut-tee')
+
+class JumpcutRequest(Request):
+    """Multipart dosya parçalarını doğrudan nihai girdi yoluna yazan request sınıfı
+
+    Werkzeug'un geçici dosyası ve ardından file.save() kopyası yerine her
+    parça tek geçişte UPLOAD_FOLDER'a yazılır. Ses çıkarma kapalıysa
+    (videonun tamamı yüklenecekse) baytlar önbellek anahtarı için hash'lenir;
+    önbellek kapalıysa UPLOAD_TEE ile eşzamanlı olarak AssemblyAI'ye de
+    akıtılır. Önbellek açıkken tee yapılmaz: önbellekte olup olmadığı ancak
+    yükleme bitince (hash ile) anlaşılır, o sırada video zaten gönderilmiş olur.
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        input_path = os.path.join(app.config['UPLOAD_FOLDER'], f"input_{uuid.uuid4().hex}.mp4")
+        full_upload = not app.config['AUDIO_EXTRACT']
+        
+        pipe = None
+        if full_upload and app.config['UPLOAD_TEE'] and transcript_cache is None and filename:
+            pipe = ChunkPipe()
+        
+        spool = UploadSpool(input_path, hash_content=full_upload and transcript_cache is not None, pipe=pipe)
+        if pipe:
+            spool.http_stats = RequestStats()
+            spool.upload_future = tee_upload_executor.submit(assemblyai.upload_stream, pipe, spool.http_stats)
+        
+        # İstek yarıda kalırsa ya da job kuyruğa alınamazsa temizlenebilsin
+        if 'upload_spools' not in g:
+            g.upload_spools = []
+        g.upload_spools.append(spool)
+        return spool
+
+app.request_class = JumpcutRequest
+
+# AssemblyAI'nin webhook isteğine eklediği doğrulama header'ı
+WEBHOOK_AUTH_HEADER = "X-Jumpcut-Webhook-Secret"
 
 # FFmpeg kontrolü
 def check_ffmpeg():
@@ -158,23 +480,230 @@ else:
 if api_key_available:
     log_manager.add_log("SUCCESS", "API key yüklendi")
 else:
-    log_manager.add_log("ERROR", "API key bulunamadı! ASSEMBLYAI_API_KEY .env dosyasında bulunamadı.")
+    log_manager.add_log("ERROR", "API key bulunamadı! ASSEMBLYAI_API_KEY .env dosyasında bulunamadı. Sadece mode=energy kullanılabilir.")
+
+def probe_duration(media_path):
+    """ffprobe ile medya süresini saniye olarak döner, okunamazsa None"""
+    try:
+        result = subprocess.run([
+            'ffprobe',
+            '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            media_path
+        ], capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+def probe_media_format(media_path):
+    """Görüntü ve ses akışının biçimini getir (tek geçişli render'da normalleştirme için)"""
+    result = subprocess.run([
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries', 'stream=codec_type,width,height,sample_aspect_ratio,r_frame_rate,'
+                         'sample_rate,channels,channel_layout',
+        '-of', 'json',
+        media_path
+    ], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe hatası: {result.stderr[-1000:]}")
+    
+    streams = json.loads(result.stdout).get('streams', [])
+    video = next((stream for stream in streams if stream.get('codec_type') == 'video'), None)
+    audio = next((stream for stream in streams if stream.get('codec_type') == 'audio'), None)
+    if video is None or audio is None:
+        raise RuntimeError(f"Görüntü ve ses akışı bulunamadı: {os.path.basename(media_path)}")
+    
+    sar = video.get('sample_aspect_ratio')
+    channels = audio.get('channels', 2)
+    return {
+        'width': video['width'],
+        'height': video['height'],
+        'sar': sar if sar and sar != '0:1' else '1:1',
+        'fps': video.get('r_frame_rate', '25/1'),
+        'sample_rate': int(audio.get('sample_rate', 48000)),
+        'channel_layout': audio.get('channel_layout') or {1: 'mono', 2: 'stereo'}.get(channels, 'stereo')
+    }
+
+def extract_audio(video_path, audio_path, job_id=None, video_num=None):
+    """Transkript için videodan mono 16 kHz Opus ses izi çıkarır
+
+    Ses, kaynak dosyanın zaman çizelgesinin başından (pts 0) itibaren
+    hizalanır; ses izi videodan geç başlıyorsa başı sessizlikle doldurulur.
+    Böylece AssemblyAI'nin döndürdüğü kelime zamanları, kesme sırasında
+    kullanılan trim/atrim zamanlarıyla birebir örtüşür.
+    """
+    extract_start_time = time.time()
+    ffmpeg_args = [
+        '-i', video_path,
+        '-map', '0:a:0',
+        '-vn',
+        '-af', 'aresample=async=1:first_pts=0',
+        '-ac', '1',
+        '-ar', '16000',
+        '-c:a', 'libopus',
+        '-b:a', app.config['AUDIO_EXTRACT_BITRATE'],
+        '-application', 'voip',
+        '-compression_level', '0',  # Konuşma tanıma için yeterli, en hızlı Opus kodlaması
+        # Aynı ses her seferinde aynı baytları üretsin (transkript önbellek anahtarı)
+        '-map_metadata', '-1',
+        '-fflags', '+bitexact',
+        '-flags:a', '+bitexact',
+        '-y',
+        audio_path
+    ]
+    
+    try:
+        run_ffmpeg(ffmpeg_args, "Ses çıkarma hatası")
+    except RuntimeError as e:
+        log_manager.add_log("ERROR", str(e), job_id, {'video_num': video_num})
+        raise
+    
+    extract_duration = time.time() - extract_start_time
+    stage_duration.observe(extract_duration, stage='audio_extract')
+    source_size = os.path.getsize(video_path)
+    audio_size = os.path.getsize(audio_path)
+    log_manager.add_log("SUCCESS", "Ses izi çıkarıldı", job_id, {
+        'video_num': video_num,
+        'source_size_bytes': source_size,
+        'audio_size_bytes': audio_size,
+        'size_ratio': round(source_size / audio_size, 1) if audio_size else None,
+        'duration_ms': int(extract_duration * 1000)
+    })
+    
+    return audio_path
+
+def transcribe_video(video_path, job_id=None, video_num=None, video_name=None, http_stats=None, spool=None):
+    """Videonun kelime listesini döner (önbellekten ya da AssemblyAI'den)
 
-def process_video(video_path, output_path, job_id=None, video_num=None, video_name=None):
-    """Video işleme fonksiyonu"""
-    step_start_time = time.time()
+    Ağ ağırlıklı aşamadır; transcription_executor üzerinde paralel çalışır.
+    spool: Dosyanın yüklendiği UploadSpool; videonun tamamı yükleniyorsa
+    hash'i ve istemci yüklemesiyle eşzamanlı başlamış upload'u buradan alınır.
+    """
+    # Transkript için sadece ses gerekir: yüklemeden önce küçük bir ses izi çıkar
+    upload_path = video_path
+    audio_path = None
+    if app.config['AUDIO_EXTRACT']:
+        audio_path = os.path.join(app.config['UPLOAD_FOLDER'], f"audio_{uuid.uuid4().hex}.ogg")
+        try:
+            upload_path = extract_audio(video_path, audio_path, job_id, video_num)
+        except RuntimeError:
+            log_manager.add_log("WARNING", "Ses izi çıkarılamadı, video dosyasının tamamı yüklenecek", job_id, {
+                'video_num': video_num
+            })
     
+    try:
+        cache_key = None
+        if transcript_cache:
+            if spool and spool.sha256 and upload_path == video_path:
+                cache_key = spool.sha256  # Yükleme sırasında hesaplandı, dosyayı tekrar okuma
+            else:
+                cache_key = TranscriptCache.hash_file(upload_path)
+            words = transcript_cache.get(cache_key)
+            if words is not None:
+                log_manager.add_log("SUCCESS", "Transkript önbellekten alındı, yükleme ve transkript adımları atlandı", job_id, {
+                    'video_num': video_num,
+                    'transcript_cache': 'hit',
+                    'cache_key': cache_key[:16],
+                    'word_count': len(words)
+                })
+                return words
+            
+            log_manager.add_log("INFO", "Transkript önbellekte bulunamadı", job_id, {
+                'video_num': video_num,
+                'transcript_cache': 'miss',
+                'cache_key': cache_key[:16]
+            })
+        
+        upload_url = None
+        if spool and spool.upload_future and upload_path == video_path:
+            upload_url = _tee_upload_url(spool, job_id, video_num)
+            if http_stats:
+                http_stats.merge(spool.http_stats)
+        
+        words = request_transcript(upload_path, job_id, video_num, video_name, probe_duration(video_path),
+                                   http_stats, upload_url)
+        
+        if cache_key:
+            try:
+                transcript_cache.put(cache_key, words)
+            except OSError as e:
+                log_manager.add_log("WARNING", f"Transkript önbelleğe yazılamadı: {e}", job_id, {
+                    'video_num': video_num
+                })
+        
+        return words
+    
+    finally:
+        if audio_path and os.path.exists(audio_path):
+            try:
+                os.remove(audio_path)
+            except:
+                pass
+
+def detect_speech_energy(video_path, job_id=None, video_num=None, threshold_db=None):
+    """Sesli bölgeleri yerelde, ses enerjisinden tespit eder (AssemblyAI'siz)
+
+    Dönen liste transkript kelimeleriyle aynı biçimdedir ({'start': ms, 'end': ms}),
+    böylece cut_video aynı sessizlik dedektörünü kullanır.
+    """
+    if threshold_db is None:
+        threshold_db = app.config['ENERGY_THRESHOLD_DB']
+    
+    log_manager.add_log("INFO", "Ses enerjisi analizi başladı", job_id, {
+        'video_num': video_num,
+        'energy_threshold_db': threshold_db
+    })
+    
+    analysis_start_time = time.time()
+    try:
+        voiced = detect_voice_activity(video_path, threshold_db, app.config['ENERGY_WINDOW_MS'])
+    except RuntimeError as e:
+        log_manager.add_log("ERROR", str(e), job_id, {'video_num': video_num})
+        raise
+    
+    analysis_duration = int((time.time() - analysis_start_time) * 1000)
+    stage_duration.observe(analysis_duration / 1000, stage='energy_analysis')
+    log_manager.add_log("SUCCESS", "Ses enerjisi analizi tamamlandı", job_id, {
+        'video_num': video_num,
+        'voiced_regions': len(voiced),
+        'duration_ms': analysis_duration
+    })
+    return voiced
+
+def _tee_upload_url(spool, job_id=None, video_num=None):
+    """İstemci yüklemesiyle eşzamanlı yapılan upload'un URL'ini döner, başarısızsa None"""
+    try:
+        response = spool.upload_future.result()
+        upload_data = response.json() if response.status_code == 200 else {}
+    except Exception as e:
+        upload_data = {'error': str(e)}
+    
+    if "upload_url" not in upload_data:
+        log_manager.add_log("WARNING", "Eşzamanlı upload başarısız, dosya diskten tekrar yüklenecek", job_id, {
+            'video_num': video_num,
+            'error': upload_data.get('error')
+        })
+        return None
+    
+    log_manager.add_log("SUCCESS", "AssemblyAI'ye yükleme istemci yüklemesiyle eşzamanlı tamamlandı", job_id, {
+        'video_num': video_num,
+        'upload_size_bytes': spool.size
+    })
+    return upload_data["upload_url"]
+
+def _upload_file(upload_path, job_id=None, video_num=None, video_name=None, http_stats=None):
+    """Dosyayı AssemblyAI'ye yükler ve upload_url döner"""
     # AssemblyAI'ye yükleme başladı
     log_manager.add_log("INFO", "AssemblyAI'ye yükleme başladı", job_id, {
         'video_num': video_num,
-        'video_name': video_name
+        'video_name': video_name,
+        'upload_size_bytes': os.path.getsize(upload_path)
     })
     
     upload_start_time = time.time()
-    with open(video_path, "rb") as f:
-        response = requests.post(base_url + "/v2/upload",
-                            headers=headers,
-                            data=f)
+    response = assemblyai.upload(upload_path, http_stats)
 
     if response.status_code != 200:
         error_msg = f"Video yükleme hatası: {response.status_code} - {response.text}"
@@ -187,14 +716,27 @@ def process_video(video_path, output_path, job_id=None, video_num=None, video_na
         log_manager.add_log("ERROR", error_msg, job_id, {'video_num': video_num})
         raise RuntimeError(error_msg)
 
-    upload_url = upload_data["upload_url"]
     upload_duration = int((time.time() - upload_start_time) * 1000)
+    stage_duration.observe(upload_duration / 1000, stage='upload')
     
     # AssemblyAI'ye yükleme tamamlandı
     log_manager.add_log("SUCCESS", f"AssemblyAI'ye yükleme tamamlandı (upload_url alındı)", job_id, {
         'video_num': video_num,
         'duration_ms': upload_duration
     })
+    return upload_data["upload_url"]
+
+def request_transcript(upload_path, job_id=None, video_num=None, video_name=None, audio_duration=None,
+                       http_stats=None, upload_url=None):
+    """Dosyayı AssemblyAI'ye yükler, transkripti bekler ve kelime listesini döner
+
+    WEBHOOK_BASE_URL tanımlıysa AssemblyAI tamamlanınca /webhooks/assemblyai
+    adresine bildirim gönderir ve bekleyen thread hemen uyanır; polling sadece
+    yedek olarak seyrek yapılır. Aksi halde sorgu aralığı next_poll_delay ile
+    ses süresine göre ayarlanır. upload_url verilmişse yükleme adımı atlanır.
+    """
+    if not upload_url:
+        upload_url = _upload_file(upload_path, job_id, video_num, video_name, http_stats)
 
     # Transkript oluşturma başladı
     log_manager.add_log("INFO", "Transkript oluşturma başladı", job_id, {'video_num': video_num})
@@ -202,9 +744,15 @@ def process_video(video_path, output_path, job_id=None, video_num=None, video_na
     data = {
         "audio_url": upload_url
     }
+    
+    webhook_enabled = bool(app.config['WEBHOOK_BASE_URL'])
+    if webhook_enabled:
+        data["webhook_url"] = app.config['WEBHOOK_BASE_URL'] + "/webhooks/assemblyai"
+        if app.config['WEBHOOK_SECRET']:
+            data["webhook_auth_header_name"] = WEBHOOK_AUTH_HEADER
+            data["webhook_auth_header_value"] = app.config['WEBHOOK_SECRET']
 
-    url = base_url + "/v2/transcript"
-    response = requests.post(url, json=data, headers=headers)
+    response = assemblyai.create_transcript(data, http_stats)
 
     if response.status_code != 200:
         error_msg = f"Transkript oluşturma hatası: {response.status_code} - {response.text}"
@@ -223,13 +771,24 @@ def process_video(video_path, output_path, job_id=None, video_num=None, video_na
         'transcript_id': transcript_id
     })
     
-    polling_endpoint = base_url + "/v2/transcript/" + transcript_id
+    wait_start_time = time.time()
+    
+    transcript_waiter.register(transcript_id, job_id)
+    try:
+        return _wait_for_transcript(transcript_id, webhook_enabled, audio_duration,
+                                    wait_start_time, job_id, video_num, http_stats)
+    finally:
+        transcript_waiter.unregister(transcript_id)
+
+def _wait_for_transcript(transcript_id, webhook_enabled, audio_duration,
+                         wait_start_time, job_id, video_num, http_stats):
+    """Transkript tamamlanana kadar sorgular ve kelime listesini döner"""
     last_status = None
     status_check_count = 0
-
+    
     # Transkript tamamlanana kadar bekle
     while True:
-        response = requests.get(polling_endpoint, headers=headers)
+        response = assemblyai.get_transcript(transcript_id, http_stats)
         if response.status_code != 200:
             error_msg = f"Transkript sorgulama hatası: {response.status_code} - {response.text}"
             log_manager.add_log("ERROR", error_msg, job_id, {'video_num': video_num})
@@ -258,106 +817,362 @@ def process_video(video_path, output_path, job_id=None, video_num=None, video_na
             words = transcription_result["words"]
             word_count = len(words)
             video_duration = words[-1]['end'] / 1000.0 if words else 0
+            wait_duration = time.time() - wait_start_time
+            stage_duration.observe(wait_duration, stage='transcription_wait')
             
             log_manager.add_log("SUCCESS", f"Transkript tamamlandı", job_id, {
                 'video_num': video_num,
                 'word_count': word_count,
-                'duration_seconds': round(video_duration, 2)
-            })
-            
-            # Kelimeler arasındaki boşlukları tespit et
-            segments_to_keep = []
-            silence_threshold = 1000  # 1000ms = 1 saniye
-            
-            if len(words) > 0:
-                current_start = words[0]['start'] / 1000.0
-                
-                for i in range(len(words) - 1):
-                    current_end = words[i]['end'] / 1000.0
-                    next_start = words[i + 1]['start'] / 1000.0
-                    gap = (next_start - current_end) * 1000
-                    
-                    if gap >= silence_threshold:
-                        segments_to_keep.append({
-                            'start': current_start,
-                            'end': current_end
-                        })
-                        current_start = next_start
-                
-                segments_to_keep.append({
-                    'start': current_start,
-                    'end': words[-1]['end'] / 1000.0
-                })
-            
-            segment_count = len(segments_to_keep)
-            log_manager.add_log("SUCCESS", f"Sessizlik tespiti tamamlandı: {segment_count} segment bulundu", job_id, {
-                'video_num': video_num,
-                'segment_count': segment_count
+                'duration_seconds': round(video_duration, 2),
+                'wait_ms': int(wait_duration * 1000),
+                'check_count': status_check_count
             })
-            
-            # FFmpeg ile video kesme
-            if segments_to_keep:
-                log_manager.add_log("INFO", "FFmpeg kesme işlemi başladı", job_id, {
-                    'video_num': video_num,
-                    'segment_count': segment_count
-                })
-                
-                ffmpeg_start_time = time.time()
-                filter_parts = []
-                for i, segment in enumerate(segments_to_keep):
-                    start_time = segment['start']
-                    end_time = segment['end']
-                    filter_parts.append(f"[0:v]trim=start={start_time}:end={end_time},setpts=PTS-STARTPTS[v{i}];")
-                    filter_parts.append(f"[0:a]atrim=start={start_time}:end={end_time},asetpts=PTS-STARTPTS[a{i}];")
-                
-                concat_video_inputs = "".join([f"[v{i}]" for i in range(len(segments_to_keep))])
-                concat_audio_inputs = "".join([f"[a{i}]" for i in range(len(segments_to_keep))])
-                num_segments = len(segments_to_keep)
-                
-                filter_complex = "".join(filter_parts) + f"{concat_video_inputs}concat=n={num_segments}:v=1[outv];{concat_audio_inputs}concat=n={num_segments}:v=0:a=1[outa]"
-                
-                ffmpeg_cmd = [
-                    'ffmpeg',
-                    '-i', video_path,
-                    '-filter_complex', filter_complex,
-                    '-map', '[outv]',
-                    '-map', '[outa]',
-                    '-c:v', 'libx264',
-                    '-c:a', 'aac',
-                    '-y',
-                    output_path
-                ]
-                
-                result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-                
-                if result.returncode != 0:
-                    error_msg = f"FFmpeg hatası: {result.stderr}"
-                    log_manager.add_log("ERROR", error_msg, job_id, {'video_num': video_num})
-                    raise RuntimeError(error_msg)
-                
-                ffmpeg_duration = int((time.time() - ffmpeg_start_time) * 1000)
-                log_manager.add_log("SUCCESS", f"FFmpeg kesme işlemi tamamlandı", job_id, {
-                    'video_num': video_num,
-                    'duration_ms': ffmpeg_duration
-                })
-                
-                total_duration = int((time.time() - step_start_time) * 1000)
-                log_manager.add_log("INFO", f"Video işleme adımı tamamlandı", job_id, {
-                    'video_num': video_num,
-                    'total_duration_ms': total_duration
-                })
-                
-                return True
+            return words
 
         elif transcription_result['status'] == 'error':
             error_msg = transcription_result.get('error', 'Bilinmeyen hata')
             log_manager.add_log("ERROR", f"Transkript hatası: {error_msg}", job_id, {'video_num': video_num})
             raise RuntimeError(f"Transkript hatası: {error_msg}")
         
-        elif transcription_result['status'] == 'processing':
-            time.sleep(3)
+        # queued / processing: webhook'u ya da bir sonraki sorgu zamanını bekle
+        if webhook_enabled:
+            delay = app.config['WEBHOOK_POLL_INTERVAL']
         else:
-            time.sleep(3)
+            delay = next_poll_delay(time.time() - wait_start_time, audio_duration)
+        transcript_waiter.wait(transcript_id, delay)
+
+def plan_segments(video_path, words, job_id=None, video_num=None, options=None):
+    """Kelimeler arasındaki sessizlikleri tespit edip tutulacak segmentleri döner
+
+    REFINE_BOUNDARIES açıksa kesim noktaları sese göre hizalanır.
+    """
+    options = options or {}
+    # Kelimeler arasındaki boşlukları tespit et (form alanı yoksa config varsayılanı)
+    silence_params = {field: options.get(field, app.config[key]) for field, key in SILENCE_OPTIONS.items()}
+    # Son segmentin sonuna eklenen pay videonun sonunu aşmasın
+    source_seconds = probe_duration(video_path)
+    detection_start_time = time.time()
+    segments_to_keep = segments_from_words(
+        words,
+        threshold_ms=silence_params['silence_threshold_ms'],
+        lead_ms=silence_params['lead_padding_ms'],
+        tail_ms=silence_params['tail_padding_ms'],
+        min_segment_ms=silence_params['min_segment_ms'],
+        duration_ms=source_seconds * 1000 if source_seconds else None
+    )
+    stage_duration.observe(time.time() - detection_start_time, stage='silence_detection')
+    
+    segment_count = len(segments_to_keep)
+    log_manager.add_log("SUCCESS", f"Sessizlik tespiti tamamlandı: {segment_count} segment bulundu", job_id, {
+        'video_num': video_num,
+        'segment_count': segment_count,
+        **silence_params
+    })
+    
+    if not segments_to_keep:
+        error_msg = "Transkriptte kelime bulunamadı, kesilecek segment yok"
+        log_manager.add_log("ERROR", error_msg, job_id, {'video_num': video_num})
+        raise RuntimeError(error_msg)
+    
+    if options.get('refine_boundaries', app.config['REFINE_BOUNDARIES']):
+        segments_to_keep = refine_cut_points(video_path, segments_to_keep, job_id, video_num,
+                                             options.get('refine_window_ms', app.config['REFINE_WINDOW_MS']))
+    
+    kept_seconds = sum(segment['end'] - segment['start'] for segment in segments_to_keep)
+    output_seconds.inc(kept_seconds)
+    if source_seconds:
+        input_seconds.inc(source_seconds)
+        if kept_seconds > 0:
+            duration_ratio.observe(source_seconds / kept_seconds)
+    return segments_to_keep
+
+def _render_profile(options):
+    """Job'ın kodlama profili; auto profili render başladığı andaki kuyruk derinliğine göre çözülür"""
+    if options.get('proxy_height'):
+        return PROXY_PROFILE
+    queue_stats = job_queue.stats()
+    return resolve_profile(options.get('profile', app.config['ENCODING_PROFILE']),
+                           queue_stats['queue_pending'], queue_stats['queue_workers'])
+
+def _output_args(output_path, options):
+    """FFmpeg çıkış parametreleri; options['hls_playlist'] varsa MP4 ile aynı kodlamadan HLS de yazılır"""
+    if options.get('hls_playlist'):
+        return progressive_output_args(output_path, options['hls_playlist'], app.config['HLS_SEGMENT_SECONDS'])
+    return ['-y', output_path]
+
+def cut_video(video_path, words, output_path, job_id=None, video_num=None, options=None):
+    """Kelimeler arasındaki sessizlikleri tespit eder ve FFmpeg ile keser"""
+    options = options or {}
+    segments_to_keep = plan_segments(video_path, words, job_id, video_num, options)
+    return render_segments(video_path, segments_to_keep, output_path, job_id, video_num, options)
+
+def render_segments(video_path, segments_to_keep, output_path, job_id=None, video_num=None, options=None):
+    """Tutulacak segmentleri FFmpeg ile keser
+
+    CPU ağırlıklı aşamadır; eşzamanlı FFmpeg sayısı render_executor ile sınırlıdır.
+    options['cut_mode'] == 'smart' ise keyframe'ler arası stream copy ile kesilir,
+    kaynak uygun değilse tam yeniden kodlamaya dönülür. options['hls_playlist']
+    verilirse HLS segmentleri kodlama sürerken yayınlanır.
+    """
+    options = options or {}
+    segment_count = len(segments_to_keep)
+    kept_seconds = sum(segment['end'] - segment['start'] for segment in segments_to_keep)
+    profile = _render_profile(options)
+    
+    if options.get('cut_mode', app.config['CUT_MODE']) == 'smart':
+        if smart_cut_video(video_path, segments_to_keep, output_path, job_id, video_num, profile):
+            return True
+    
+    # FFmpeg ile video kesme
+    log_manager.add_log("INFO", "FFmpeg kesme işlemi başladı", job_id, {
+        'video_num': video_num,
+        'segment_count': segment_count,
+        'encoding_profile': profile['name'],
+        'preset': profile['preset'],
+        'crf': profile['crf']
+    })
+    
+    ffmpeg_start_time = time.time()
+    
+    # Yüzde, hız ve kalan süre /status/<job_id> metadata'sındaki progress alanında görünür
+    progress = ProgressTracker(
+        kept_seconds,
+        lambda snapshot: log_manager.update_job_progress(job_id, video_num, snapshot)
+    )
+    
+    # Uzun çıktılarda segmentleri gruplara bölüp çekirdeklere dağıt
+    # HLS'de segmentlerin sırayla yayınlanması için tek FFmpeg süreci tüm akışı yazar
+    batches = plan_batches(segments_to_keep, app.config['RENDER_PARALLELISM'],
+                           app.config['RENDER_MIN_BATCH_SECONDS'])
+    if len(batches) > 1 and not options.get('hls_playlist'):
+        # Toplam x264 thread sayısı CPU kotasını aşmasın
+        threads = max(1, available_cpus() // len(batches))
+        try:
+            stats = render_parallel(video_path, batches, output_path, video_params(profile, threads),
+                                    len(batches), audio_params(profile), progress.update)
+        except RuntimeError as e:
+            log_manager.add_log("ERROR", f"FFmpeg hatası: {e}", job_id, {'video_num': video_num})
+            raise
+        
+        progress.finish()
+        ffmpeg_duration = int((time.time() - ffmpeg_start_time) * 1000)
+        stage_duration.observe(ffmpeg_duration / 1000, stage='encode')
+        log_manager.add_log("SUCCESS", "FFmpeg kesme işlemi tamamlandı", job_id, {
+            'video_num': video_num,
+            'duration_ms': ffmpeg_duration,
+            **stats
+        })
+        return True
+    
+    # Binlerce segmentte komut satırı sınırına takılmamak için grafik dosyadan okunur
+    filter_complex = build_cut_graph([(segment['start'], segment['end']) for segment in segments_to_keep])
+    script_path = write_filter_script(filter_complex, app.config['UPLOAD_FOLDER'])
+    
+    ffmpeg_args = [
+        '-i', video_path,
+        '-filter_complex_script', script_path,
+        '-map', '[outv]',
+        '-map', '[outa]',
+        *video_params(profile),
+        *audio_params(profile),
+        *_output_args(output_path, options)
+    ]
+    
+    try:
+        run_ffmpeg(ffmpeg_args, "FFmpeg hatası", progress.update)
+    except RuntimeError as e:
+        log_manager.add_log("ERROR", str(e), job_id, {'video_num': video_num})
+        raise
+    finally:
+        os.remove(script_path)
+    
+    progress.finish()
+    ffmpeg_duration = int((time.time() - ffmpeg_start_time) * 1000)
+    stage_duration.observe(ffmpeg_duration / 1000, stage='encode')
+    log_manager.add_log("SUCCESS", f"FFmpeg kesme işlemi tamamlandı", job_id, {
+        'video_num': video_num,
+        'duration_ms': ffmpeg_duration
+    })
+    
+    return True
+
+def refine_cut_points(video_path, segments, job_id=None, video_num=None, window_ms=300):
+    """Kesim noktalarını ±window_ms içindeki en sessiz noktaya kaydırır
+
+    Sadece sınırların etrafındaki kısa ses pencereleri çözülür. Analiz
+    başarısız olursa (ör. ses izi yok) segmentler olduğu gibi döner.
+    """
+    refine_start_time = time.time()
+    try:
+        refined, mean_shift_ms = refine_boundaries(video_path, segments, window_ms)
+    except RuntimeError as e:
+        log_manager.add_log("WARNING", f"Kesim noktaları iyileştirilemedi, transkript zamanları kullanılacak: {e}", job_id, {
+            'video_num': video_num
+        })
+        return segments
+    
+    refine_duration = int((time.time() - refine_start_time) * 1000)
+    stage_duration.observe(refine_duration / 1000, stage='boundary_refine')
+    log_manager.add_log("SUCCESS", "Kesim noktaları ses dalga formuna göre hizalandı", job_id, {
+        'video_num': video_num,
+        'boundary_count': len(segments) * 2,
+        'segment_count': len(refined),
+        'mean_shift_ms': round(mean_shift_ms, 1),
+        'duration_ms': refine_duration
+    })
+    return refined
+
+def smart_cut_video(video_path, segments, output_path, job_id=None, video_num=None, profile=None):
+    """Segmentleri smart cut ile keser
+
+    Kaynak smart cut'a uygun değilse (H.264 değil, bilinmeyen profil) False
+    döner ve çağıran taraf normal yeniden kodlamaya devam eder. Sınır
+    parçaları ve ses profile (kodlama profili) ile kodlanır.
+    """
+    profile = profile or resolve_profile(app.config['ENCODING_PROFILE'])
+    log_manager.add_log("INFO", "Smart cut işlemi başladı", job_id, {
+        'video_num': video_num,
+        'segment_count': len(segments),
+        'encoding_profile': profile['name']
+    })
+    
+    smart_cut_start_time = time.time()
+    try:
+        stats = render_smart_cut(video_path, segments, output_path, app.config['SMART_CUT_MIN_COPY'],
+                                 x264_quality_params(profile), audio_params(profile))
+    except SmartCutUnsupported as e:
+        log_manager.add_log("WARNING", f"Smart cut kullanılamıyor, yeniden kodlamaya dönülüyor: {e}", job_id, {
+            'video_num': video_num
+        })
+        return False
+    except RuntimeError as e:
+        log_manager.add_log("ERROR", str(e), job_id, {'video_num': video_num})
+        raise
+    
+    smart_cut_duration = int((time.time() - smart_cut_start_time) * 1000)
+    stage_duration.observe(smart_cut_duration / 1000, stage='encode')
+    log_manager.add_log("SUCCESS", "Smart cut işlemi tamamlandı", job_id, {
+        'video_num': video_num,
+        'duration_ms': smart_cut_duration,
+        **stats
+    })
+    return True
+
+def render_single_pass(video_paths, segment_lists, output_path, job_id=None, options=None):
+    """Tüm videoların tutulan segmentlerini tek FFmpeg grafiğinde kesip birleştirir
+
+    Ara dosya ve ayrı birleştirme adımı yoktur. Çıktı ilk videonun
+    çözünürlüğü, kare hızı ve ses biçimindedir; farklı olan girdiler
+    grafik içinde ölçeklenir (en-boy oranı korunup bantla doldurulur) ve
+    kare hızı dönüştürülür. İlerleme metadata.progress['all'] altında görünür;
+    options['hls_playlist'] verilirse HLS segmentleri kodlama sürerken yayınlanır.
+    options['proxy_height'] verilirse çıktı o yüksekliğe küçültülür ve proxy
+    profiliyle kodlanır (önizleme).
+    """
+    options = options or {}
+    profile = _render_profile(options)
+    formats = [probe_media_format(path) for path in video_paths]
+    target = formats[0]
+    normalized = [num for num, media_format in enumerate(formats, start=1)
+                  if (media_format['width'], media_format['height'], media_format['sar'], media_format['fps'])
+                  != (target['width'], target['height'], target['sar'], target['fps'])]
+    
+    kept_seconds = sum(segment['end'] - segment['start'] for segments in segment_lists for segment in segments)
+    log_manager.add_log("INFO", "Tek geçişli render başladı", job_id, {
+        'video_count': len(video_paths),
+        'segment_count': sum(len(segments) for segments in segment_lists),
+        'target_resolution': f"{target['width']}x{target['height']}",
+        'target_fps': target['fps'],
+        'normalized_videos': normalized,
+        'proxy_height': options.get('proxy_height'),
+        'encoding_profile': profile['name']
+    })
+    
+    render_start_time = time.time()
+    progress = ProgressTracker(kept_seconds, lambda snapshot: log_manager.update_job_progress(job_id, 'all', snapshot))
+    graph = build_multi_input_graph(
+        [[(segment['start'], segment['end']) for segment in segments] for segments in segment_lists],
+        formats, target, scale_height=options.get('proxy_height')
+    )
+    script_path = write_filter_script(graph, app.config['UPLOAD_FOLDER'])
+    
+    ffmpeg_args = []
+    for video_path in video_paths:
+        ffmpeg_args += ['-i', video_path]
+    ffmpeg_args += [
+        '-filter_complex_script', script_path,
+        '-map', '[outv]',
+        '-map', '[outa]',
+        *video_params(profile),
+        *audio_params(profile),
+        *_output_args(output_path, options)
+    ]
+    
+    try:
+        run_ffmpeg(ffmpeg_args, "Tek geçişli render hatası", progress.update)
+    except RuntimeError as e:
+        log_manager.add_log("ERROR", str(e), job_id)
+        raise
+    finally:
+        os.remove(script_path)
+    
+    progress.finish()
+    render_duration = int((time.time() - render_start_time) * 1000)
+    stage_duration.observe(render_duration / 1000, stage='preview_encode' if options.get('proxy_height') else 'encode')
+    log_manager.add_log("SUCCESS", "Tek geçişli render tamamlandı", job_id, {
+        'output_path': output_path,
+        'duration_ms': render_duration
+    })
+
+def export_cut_lists(inputs, segment_lists, output_dir, job_id=None):
+    """Tutulan segmentleri render etmeden JSON, CMX3600 EDL ve FCPXML olarak yazar
+
+    Zaman kodları için her videonun kare hızı ve süresi ffprobe ile okunur.
+    Dosyalar output_dir'e CUT_LIST_FORMATS isimleriyle yazılır.
+    """
+    clips = []
+    for (_, input_path, video_name, _), segments in zip(inputs, segment_lists):
+        clips.append({
+            **probe_media_format(input_path),
+            'name': video_name,
+            'duration': probe_duration(input_path),
+            'segments': segments
+        })
+    cut_list = build_cut_list(clips, title=f"jumpcut {job_id}" if job_id else 'jumpcut')
+    
+    for fmt, (filename, _) in CUT_LIST_FORMATS.items():
+        with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(render_cut_list(cut_list, fmt))
+    
+    log_manager.add_log("SUCCESS", "Kesim listesi render edilmeden dışa aktarıldı", job_id, {
+        'video_count': len(clips),
+        'event_count': cut_list['event_count'],
+        'kept_seconds': round(cut_list['duration'], 3),
+        'frame_rate': cut_list['frame_rate'],
+        'formats': list(CUT_LIST_FORMATS)
+    })
+    return cut_list
+
+def package_hls(video_path, playlist_path, job_id=None):
+    """Hazır MP4'ü yeniden kodlamadan HLS segmentlerine böler
+
+    Final akışı tek FFmpeg sürecinin yazmadığı durumlar (smart cut, ayrı
+    kodlanıp birleştirilen videolar) için; segmentler kodlama sürerken
+    değil, video hazır olunca yayınlanır.
+    """
+    package_start_time = time.time()
+    try:
+        run_ffmpeg(package_args(video_path, playlist_path, app.config['HLS_SEGMENT_SECONDS']), "HLS paketleme hatası")
+    except RuntimeError as e:
+        log_manager.add_log("ERROR", str(e), job_id)
+        raise
+    
+    package_duration = int((time.time() - package_start_time) * 1000)
+    stage_duration.observe(package_duration / 1000, stage='hls_package')
+    log_manager.add_log("SUCCESS", "Video HLS segmentlerine paketlendi", job_id, {
+        'playlist_path': playlist_path,
+        'duration_ms': package_duration
+    })
 
 def concatenate_videos(video_paths, output_path, job_id=None):
     """Birden fazla videoyu FFmpeg ile birleştirir"""
@@ -384,8 +1199,7 @@ def concatenate_videos(video_paths, output_path, job_id=None):
                 f.write(f"file '{os.path.abspath(video_path)}'\n")
         
         # FFmpeg ile videoları birleştir
-        ffmpeg_cmd = [
-            'ffmpeg',
+        ffmpeg_args = [
             '-f', 'concat',
             '-safe', '0',
             '-i', list_file_path,
@@ -394,14 +1208,14 @@ def concatenate_videos(video_paths, output_path, job_id=None):
             output_path
         ]
         
-        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            error_msg = f"Video birleştirme hatası: {result.stderr}"
-            log_manager.add_log("ERROR", error_msg, job_id)
-            raise RuntimeError(error_msg)
+        try:
+            run_ffmpeg(ffmpeg_args, "Video birleştirme hatası")
+        except RuntimeError as e:
+            log_manager.add_log("ERROR", str(e), job_id)
+            raise
         
         concat_duration = int((time.time() - concat_start_time) * 1000)
+        stage_duration.observe(concat_duration / 1000, stage='concat')
         final_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
         
         log_manager.add_log("SUCCESS", f"Video birleştirme tamamlandı: {output_path}", job_id, {
@@ -429,10 +1243,17 @@ def index():
         "endpoints": {
             "/": "API bilgileri",
             "/health": "Sağlık kontrolü (FFmpeg, API key durumu)",
-            "/process": "Çoklu video işleme ve birleştirme (POST) - videos field'ı ile birden fazla video gönderilebilir",
+            "/process": "Çoklu video işleme ve birleştirme (POST) - videos field'ı ile birden fazla video gönderilebilir, 202 ile job_id döner",
+            "/result/<job_id>": "Tamamlanan job'ın final videosunu indir (GET); render=false job'larında kesim listesi (?format=json|edl|fcpxml)",
+            "/result/<job_id>/preview": "preview=true job'ının düşük çözünürlüklü önizlemesi (GET)",
+            "/render/<job_id>": "Önizlemesi hazır job'ı kayıtlı kesim listesinden tam kalitede render et (POST), 202 döner",
+            "/result/<job_id>/hls/playlist.m3u8": "output_format=hls job'ının render sürerken büyüyen HLS playlist'i ve segmentleri (GET)",
             "/logs": "Tüm log mesajlarını getir (GET)",
             "/logs/<job_id>": "Belirli bir job'ın log mesajlarını getir (GET)",
-            "/status/<job_id>": "Belirli bir job'ın durumunu getir (GET)"
+            "/status/<job_id>": "Belirli bir job'ın durumunu getir (GET)",
+            "/events/<job_id>": "Job loglarını ve durum değişikliklerini Server-Sent Events ile akıt (GET, ?cursor=)",
+            "/metrics": "Prometheus metrikleri: aşama süreleri, kuyruk derinliği, FFmpeg süreçleri (GET)",
+            "/webhooks/assemblyai": "AssemblyAI transkript tamamlanma bildirimi (POST)"
         }
     })
 
@@ -443,12 +1264,353 @@ def health():
         "status": "healthy",
         "ffmpeg_available": ffmpeg_available,
         "api_key_available": api_key_available,
+        "job_queue": job_queue.stats(),
+        "job_store": log_manager.stats(),
+        "transcript_cache": transcript_cache.stats() if transcript_cache else None,
         "timestamp": datetime.utcnow().isoformat() + 'Z'
     })
 
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus metin biçiminde süreç metrikleri"""
+    return Response(metrics.render(), content_type=MetricsRegistry.CONTENT_TYPE)
+
+def process_videos(inputs, output_paths, job_id=None, options=None, step=None):
+    """Job'daki videoları paralel işler
+
+    Her videonun transkripti (mode=energy ise yerel ses analizi)
+    transcription_executor'da eşzamanlı beklenir;
+    transkripti biten video hemen render_executor'a (sınırlı sayıda FFmpeg)
+    verilir. Çıktılar output_paths sırasıyla yazıldığı için birleştirme
+    sırası yükleme sırasıyla aynı kalır. step verilirse kesme yerine o
+    çalıştırılır; adımların sonuçları yükleme sırasıyla döner.
+    """
+    transcribe_futures = {}
+    render_futures = []
+    results = {}
+    http_stats = RequestStats()
+    step = step or _cut_video_step
+    
+    try:
+        for (idx, input_path, video_name, spool), output_path in zip(inputs, output_paths):
+            # Video işleme başladı
+            log_manager.add_log("INFO", f"Video işleme başladı: {video_name}", job_id, {
+                'video_num': idx,
+                'video_name': video_name
+            })
+            if options and options.get('mode') == 'energy':
+                future = transcription_executor.submit(detect_speech_energy, input_path, job_id, idx,
+                                                       options.get('energy_threshold_db'))
+            else:
+                future = transcription_executor.submit(transcribe_video, input_path, job_id, idx, video_name,
+                                                       http_stats, spool)
+            transcribe_futures[future] = (idx, input_path, output_path, time.time())
+        
+        for future in as_completed(transcribe_futures):
+            idx, input_path, output_path, step_start_time = transcribe_futures[future]
+            words = future.result()
+            future = render_executor.submit(
+                step, input_path, words, output_path, job_id, idx, step_start_time, options
+            )
+            render_futures.append(future)
+            results[future] = idx
+        
+        for future in render_futures:
+            future.result()
+        return [future.result() for future in sorted(render_futures, key=results.get)]
+    
+    except Exception:
+        # Bir video hata verirse henüz başlamamış adımları iptal et, çalışanların
+        # bitmesini bekle (girdi dosyaları ancak ondan sonra silinebilir)
+        pending_futures = list(transcribe_futures) + render_futures
+        for future in pending_futures:
+            future.cancel()
+        wait(pending_futures)
+        raise
+    
+    finally:
+        # Bağlantı yeniden kullanım sayıları job metadata'sında görünsün
+        log_manager.update_job_status(job_id, "processing", http_stats.as_dict())
+
+def _cut_video_step(video_path, words, output_path, job_id, video_num, step_start_time, options=None):
+    """render_executor'da çalışan kesme adımı"""
+    cut_video(video_path, words, output_path, job_id, video_num, options)
+    
+    total_duration = int((time.time() - step_start_time) * 1000)
+    log_manager.add_log("INFO", f"Video işleme adımı tamamlandı", job_id, {
+        'video_num': video_num,
+        'total_duration_ms': total_duration
+    })
+
+def _plan_segments_step(video_path, words, output_path, job_id, video_num, step_start_time, options=None):
+    """Tek geçişli render için sadece segmentleri hesaplayan adım"""
+    return plan_segments(video_path, words, job_id, video_num, options)
+
+def render_stored_segments(inputs, segment_lists, output_paths, job_id=None, options=None):
+    """Önceden hesaplanmış segmentleri videolar paralel olacak şekilde render_executor'da keser"""
+    futures = [
+        render_executor.submit(render_segments, input_path, segments, output_path, job_id, idx, options)
+        for (idx, input_path, _, _), segments, output_path in zip(inputs, segment_lists, output_paths)
+    ]
+    try:
+        for future in futures:
+            future.result()
+    except Exception:
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        raise
+
+def render_outputs(job_id, inputs, output_dir, options, segment_lists=None):
+    """Videoları keser, birleştirir ve final videonun yolunu döner
+
+    segment_lists verilmezse segmentler transkriptten hesaplanır; verilirse
+    (önizlemesi onaylanan job) tespit atlanır ve kayıtlı segmentler render
+    edilir. output_format=hls ise HLS segmentleri de yazılır.
+    """
+    temp_outputs = [os.path.join(output_dir, f"output_{idx}.mp4") for idx, _, _, _ in inputs]
+    final_output_path = os.path.join(output_dir, "final_output.mp4")
+    
+    smart = options.get('cut_mode', app.config['CUT_MODE']) == 'smart'
+    hls = options.get('output_format', app.config['OUTPUT_FORMAT']) == 'hls'
+    playlist_path = os.path.join(output_dir, 'hls', PLAYLIST_NAME)
+    # HLS segmentlerinin kodlanırken yayınlanması için final akışı tek FFmpeg süreci yazmalı
+    single_pass = (len(inputs) > 1 and not smart
+                   and (hls or options.get('render_mode', app.config['RENDER_MODE']) == 'single_pass'))
+    if hls:
+        os.makedirs(os.path.dirname(playlist_path), exist_ok=True)
+        if single_pass or len(inputs) == 1:
+            options = {**options, 'hls_playlist': playlist_path}
+    if single_pass:
+        # Tüm segmentler hazır olunca tek FFmpeg süreci final dosyayı yazar, birleştirme yok
+        if segment_lists is None:
+            segment_lists = process_videos(inputs, temp_outputs, job_id, options, _plan_segments_step)
+        render_executor.submit(render_single_pass, [path for _, path, _, _ in inputs], segment_lists,
+                               final_output_path, job_id, options).result()
+    elif segment_lists is None:
+        process_videos(inputs, temp_outputs, job_id, options)
+    else:
+        render_stored_segments(inputs, segment_lists, temp_outputs, job_id, options)
+    
+    # Videoları birleştir
+    if single_pass:
+        log_manager.add_log("INFO", "Videolar tek geçişte birleştirildi, ayrı birleştirme atlandı", job_id)
+    elif len(temp_outputs) > 1:
+        log_manager.add_log("INFO", f"{len(temp_outputs)} video birleştiriliyor...", job_id, {
+            'video_count': len(temp_outputs)
+        })
+        concatenate_videos(temp_outputs, final_output_path, job_id)
+        for path in temp_outputs:
+            os.remove(path)
+    else:
+        # Tek video varsa, aynı klasörde final_output olarak yeniden adlandır (kopyalama yok)
+        log_manager.add_log("INFO", "Tek video işlendi, birleştirme atlandı", job_id)
+        os.replace(temp_outputs[0], final_output_path)
+        log_manager.add_log("SUCCESS", f"Video taşındı: {final_output_path}", job_id)
+    
+    if hls and not os.path.exists(playlist_path):
+        package_hls(final_output_path, playlist_path, job_id)
+    return final_output_path
+
+def render_preview(job_id, inputs, output_dir, options):
+    """Hızlı, düşük çözünürlüklü önizleme render'ı; tam kalite render için kesim listesini ve kaynakları saklar
+
+    Segmentler transkriptten bir kez hesaplanıp kesim listesi olarak yazılır,
+    kaynak videolar job klasörüne taşınır; /render/<job_id> bunlardan yükleme
+    ve transkript tekrarlanmadan tam kalite render eder. Önizleme tüm videolar
+    için tek FFmpeg sürecinde PREVIEW_HEIGHT yüksekliğinde ve proxy profiliyle
+    kodlanır. Önizleme dosyasının yolunu döner.
+    """
+    segment_lists = process_videos(inputs, [None] * len(inputs), job_id, options, _plan_segments_step)
+    export_cut_lists(inputs, segment_lists, output_dir, job_id)
+    
+    sources_dir = os.path.join(output_dir, SOURCES_DIR)
+    os.makedirs(sources_dir, exist_ok=True)
+    source_paths = []
+    for idx, input_path, _, _ in inputs:
+        source_path = os.path.join(sources_dir, f"source_{idx}.mp4")
+        shutil.move(input_path, source_path)
+        source_paths.append(source_path)
+    
+    preview_path = os.path.join(output_dir, PREVIEW_NAME)
+    render_executor.submit(render_single_pass, source_paths, segment_lists, preview_path, job_id,
+                           {**options, 'proxy_height': app.config['PREVIEW_HEIGHT']}).result()
+    return preview_path
+
+def load_render_plan(output_dir):
+    """Önizleme job'ının kayıtlı kesim listesinden render girdilerini ve segmentlerini oluştur"""
+    with open(os.path.join(output_dir, CUT_LIST_FORMATS['json'][0]), encoding='utf-8') as f:
+        cut_list = json.load(f)
+    
+    inputs = []
+    segment_lists = []
+    for video in cut_list['videos']:
+        source_path = os.path.join(output_dir, SOURCES_DIR, f"source_{video['video_num']}.mp4")
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"Önizleme kaynağı bulunamadı: {video['name']}")
+        inputs.append((video['video_num'], source_path, video['name'], None))
+        segment_lists.append([{'start': event['start'], 'end': event['end']} for event in video['segments']])
+    return inputs, segment_lists
+
+def _remove_render_outputs(output_dir):
+    """Tam kalite render çıktılarını sil; önizleme, kesim listesi ve kaynaklar kalır"""
+    for name in os.listdir(output_dir):
+        path = os.path.join(output_dir, name)
+        if name == 'hls':
+            shutil.rmtree(path, ignore_errors=True)
+        elif name == 'final_output.mp4' or (name.startswith('output_') and name.endswith('.mp4')):
+            os.remove(path)
+
+def _finish_job(job_id, output_dir, final_output_path, job_start_time, metadata=None):
+    """Final video hazır: logla, metrikleri güncelle ve job'ı completed yap"""
+    final_size = os.path.getsize(final_output_path)
+    total_duration = int((time.time() - job_start_time) * 1000)
+    
+    log_manager.add_log("SUCCESS", f"Final video hazır: {final_output_path}", job_id, {
+        'output_path': final_output_path,
+        'file_size_bytes': final_size,
+        'file_size_mb': round(final_size / (1024 * 1024), 2),
+        'total_duration_ms': total_duration
+    })
+    output_bytes.inc(final_size)
+    job_duration.observe(total_duration / 1000, status='completed')
+    jobs_finished.inc(status='completed')
+    log_manager.update_job_status(job_id, "completed", {
+        **(metadata or {}),
+        'output_dir': output_dir,
+        'output_path': final_output_path,
+        'file_size_bytes': final_size,
+        'file_size_mb': round(final_size / (1024 * 1024), 2),
+        'total_duration_ms': total_duration,
+        'completed_at': datetime.utcnow().isoformat() + 'Z'
+    })
+
+def run_job(job_id, inputs, job_start_time, options=None):
+    """Kuyruktan alınan job'ı işler: videoları keser, birleştirir ve sonucu kaydeder
+
+    inputs: (video_num, input_path, video_name, spool) tuple listesi. Girdi dosyaları
+    iş bittiğinde (başarılı ya da hatalı) silinir; önizleme job'larında job
+    klasörüne taşınır. options: job'a özel ayarlar (ör. cut_mode).
+    """
+    # Eşzamanlı job'lar birbirinin çıktısını ezmesin diye her job kendi klasörüne yazar
+    output_dir = os.path.join(app.config['OUTPUT_FOLDER'], job_id)
+    
+    try:
+        log_manager.update_job_status(job_id, "processing", {
+            'started_at': datetime.utcnow().isoformat() + 'Z',
+            'queue_wait_ms': int((time.time() - job_start_time) * 1000)
+        })
+        log_manager.add_log("INFO", "Job işlenmeye başladı", job_id)
+        input_bytes.inc(sum(os.path.getsize(path) for _, path, _, _ in inputs if os.path.exists(path)))
+        os.makedirs(output_dir, exist_ok=True)
+        
+        options = options or {}
+        if not options.get('render', True):
+            # Sadece kesim kararları: segmentler hesaplanır, video kodlanmaz
+            segment_lists = process_videos(inputs, [None] * len(inputs), job_id, options, _plan_segments_step)
+            cut_list = export_cut_lists(inputs, segment_lists, output_dir, job_id)
+            
+            total_duration = int((time.time() - job_start_time) * 1000)
+            job_duration.observe(total_duration / 1000, status='completed')
+            jobs_finished.inc(status='completed')
+            log_manager.update_job_status(job_id, "completed", {
+                'output_dir': output_dir,
+                'cut_list_urls': {fmt: f"/result/{job_id}?format={fmt}" for fmt in CUT_LIST_FORMATS},
+                'event_count': cut_list['event_count'],
+                'kept_seconds': round(cut_list['duration'], 3),
+                'total_duration_ms': total_duration,
+                'completed_at': datetime.utcnow().isoformat() + 'Z'
+            })
+            return
+        
+        if options.get('preview'):
+            preview_path = render_preview(job_id, inputs, output_dir, options)
+            preview_size = os.path.getsize(preview_path)
+            total_duration = int((time.time() - job_start_time) * 1000)
+            
+            log_manager.add_log("SUCCESS", "Önizleme hazır, tam kalite render için POST /render/<job_id>", job_id, {
+                'preview_path': preview_path,
+                'file_size_mb': round(preview_size / (1024 * 1024), 2),
+                'total_duration_ms': total_duration
+            })
+            job_duration.observe(total_duration / 1000, status='completed')
+            jobs_finished.inc(status='completed')
+            log_manager.update_job_status(job_id, "completed", {
+                'stage': 'preview',
+                'output_dir': output_dir,
+                'preview_size_mb': round(preview_size / (1024 * 1024), 2),
+                'total_duration_ms': total_duration,
+                'completed_at': datetime.utcnow().isoformat() + 'Z'
+            })
+            return
+        
+        final_output_path = render_outputs(job_id, inputs, output_dir, options)
+        _finish_job(job_id, output_dir, final_output_path, job_start_time)
+    
+    except Exception as e:
+        error_msg = str(e)
+        job_duration.observe(time.time() - job_start_time, status='error')
+        jobs_finished.inc(status='error')
+        # Yarım kalan çıktıların kullanılabilir bir kısmı yok
+        shutil.rmtree(output_dir, ignore_errors=True)
+        log_manager.add_log("ERROR", f"İşlem hatası: {error_msg}", job_id)
+        log_manager.update_job_status(job_id, "error", {
+            'error': error_msg,
+            'error_at': datetime.utcnow().isoformat() + 'Z'
+        })
+    
+    finally:
+        # Geçici dosyaları temizle
+        for _, path, _, _ in inputs:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except:
+                    pass
+
+def run_final_render(job_id, job_start_time, options):
+    """Önizlemesi onaylanan job'ı kayıtlı kesim listesi ve kaynaklardan tam kalitede render eder
+
+    Yükleme, transkript ve sessizlik tespiti tekrarlanmaz. Hata olursa sadece
+    bu render'ın çıktıları silinir; önizleme ve kaynaklar kalır, render
+    yeniden istenebilir.
+    """
+    output_dir = os.path.join(app.config['OUTPUT_FOLDER'], job_id)
+    
+    try:
+        log_manager.update_job_status(job_id, "processing", {
+            'started_at': datetime.utcnow().isoformat() + 'Z',
+            'queue_wait_ms': int((time.time() - job_start_time) * 1000)
+        })
+        log_manager.add_log("INFO", "Tam kalite render başladı (kayıtlı kesim listesinden)", job_id, {
+            'encoding_profile': options.get('profile'),
+            'cut_mode': options.get('cut_mode')
+        })
+        # Önceki tam kalite render'ın çıktıları (ör. farklı profille) yeniden yazılacak
+        _remove_render_outputs(output_dir)
+        inputs, segment_lists = load_render_plan(output_dir)
+        final_output_path = render_outputs(job_id, inputs, output_dir, options, segment_lists)
+        _finish_job(job_id, output_dir, final_output_path, job_start_time, {'stage': 'final'})
+    
+    except Exception as e:
+        error_msg = str(e)
+        job_duration.observe(time.time() - job_start_time, status='error')
+        jobs_finished.inc(status='error')
+        if os.path.isdir(output_dir):
+            _remove_render_outputs(output_dir)
+        log_manager.add_log("ERROR", f"Tam kalite render hatası: {error_msg}", job_id)
+        log_manager.update_job_status(job_id, "error", {
+            'error': error_msg,
+            'error_at': datetime.utcnow().isoformat() + 'Z'
+        })
+
 @app.route('/process', methods=['POST'])
 def process():
-    """Çoklu video işleme ve birleştirme endpoint'i - Kaç video yüklenirse yüklensin işler"""
+    """Çoklu video işleme ve birleştirme endpoint'i - Kaç video yüklenirse yüklensin işler
+
+    Dosyalar kaydedildikten sonra job kuyruğa alınır ve hemen 202 döner;
+    ilerleme /status/<job_id>, sonuç /result/<job_id> üzerinden alınır.
+    """
     job_start_time = time.time()
     job_id = str(uuid.uuid4())
     
@@ -458,6 +1620,10 @@ def process():
     })
     log_manager.add_log("INFO", f"İşlem başlatıldı (job_id: {job_id})", job_id)
     
+    # Geçici dosya yolları
+    temp_inputs = []
+    queued = False
+    
     try:
         # Hem 'videos' (yeni format) hem 'video' (eski format) desteği
         if 'videos' in request.files:
@@ -484,10 +1650,6 @@ def process():
         log_manager.add_log("INFO", f"Dosya sayısı bilgisi: {file_count} video işlenecek", job_id, {
             'file_count': file_count
         })
-        log_manager.update_job_status(job_id, "processing", {
-            'file_count': file_count,
-            'status': 'processing'
-        })
         
         if len(valid_files) == 0:
             error_msg = "Geçerli video dosyası bulunamadı"
@@ -495,97 +1657,147 @@ def process():
             log_manager.update_job_status(job_id, "error", {'error': error_msg})
             return jsonify({"error": error_msg, "job_id": job_id}), 400
         
-        # outputvideo klasörünü oluştur
-        output_dir = "outputvideo"
-        os.makedirs(output_dir, exist_ok=True)
+        cut_mode = request.form.get('cut_mode', app.config['CUT_MODE']).lower()
+        if cut_mode not in CUT_MODES:
+            error_msg = f"Geçersiz cut_mode: {cut_mode} (desteklenenler: {', '.join(CUT_MODES)})"
+            log_manager.add_log("ERROR", error_msg, job_id)
+            log_manager.update_job_status(job_id, "error", {'error': error_msg})
+            return jsonify({"error": error_msg, "job_id": job_id}), 400
         
-        # Geçici dosya yolları
-        temp_inputs = []
-        temp_outputs = []
+        detection_mode = request.form.get('mode', app.config['DETECTION_MODE']).lower()
+        if detection_mode not in DETECTION_MODES:
+            error_msg = f"Geçersiz mode: {detection_mode} (desteklenenler: {', '.join(DETECTION_MODES)})"
+            log_manager.add_log("ERROR", error_msg, job_id)
+            log_manager.update_job_status(job_id, "error", {'error': error_msg})
+            return jsonify({"error": error_msg, "job_id": job_id}), 400
         
-        # Dosyaları kaydet ve işle
+        if detection_mode == 'transcript' and not api_key_available:
+            error_msg = "ASSEMBLYAI_API_KEY tanımlı değil, sadece mode=energy kullanılabilir"
+            log_manager.add_log("ERROR", error_msg, job_id)
+            log_manager.update_job_status(job_id, "error", {'error': error_msg})
+            return jsonify({"error": error_msg, "job_id": job_id}), 503
+        
+        encoding_profile = request.form.get('profile', app.config['ENCODING_PROFILE']).lower()
+        if encoding_profile not in PROFILE_NAMES:
+            error_msg = f"Geçersiz profile: {encoding_profile} (desteklenenler: {', '.join(PROFILE_NAMES)})"
+            log_manager.add_log("ERROR", error_msg, job_id)
+            log_manager.update_job_status(job_id, "error", {'error': error_msg})
+            return jsonify({"error": error_msg, "job_id": job_id}), 400
+        
+        render_mode = request.form.get('render_mode', app.config['RENDER_MODE']).lower()
+        if render_mode not in RENDER_MODES:
+            error_msg = f"Geçersiz render_mode: {render_mode} (desteklenenler: {', '.join(RENDER_MODES)})"
+            log_manager.add_log("ERROR", error_msg, job_id)
+            log_manager.update_job_status(job_id, "error", {'error': error_msg})
+            return jsonify({"error": error_msg, "job_id": job_id}), 400
+        
+        output_format = request.form.get('output_format', app.config['OUTPUT_FORMAT']).lower()
+        if output_format not in OUTPUT_FORMATS:
+            error_msg = f"Geçersiz output_format: {output_format} (desteklenenler: {', '.join(OUTPUT_FORMATS)})"
+            log_manager.add_log("ERROR", error_msg, job_id)
+            log_manager.update_job_status(job_id, "error", {'error': error_msg})
+            return jsonify({"error": error_msg, "job_id": job_id}), 400
+        
+        job_options = {'cut_mode': cut_mode, 'mode': detection_mode, 'profile': encoding_profile,
+                       'render_mode': render_mode, 'output_format': output_format}
+        if 'render' in request.form:
+            job_options['render'] = request.form['render'].lower() in ('1', 'true', 'yes')
+        if request.form.get('preview', '').lower() in ('1', 'true', 'yes'):
+            if not job_options.get('render', True):
+                error_msg = "preview ve render=false birlikte kullanılamaz"
+                log_manager.add_log("ERROR", error_msg, job_id)
+                log_manager.update_job_status(job_id, "error", {'error': error_msg})
+                return jsonify({"error": error_msg, "job_id": job_id}), 400
+            job_options['preview'] = True
+        if detection_mode == 'energy' and 'energy_threshold_db' in request.form:
+            try:
+                threshold_db = float(request.form['energy_threshold_db'])
+            except ValueError:
+                threshold_db = 1
+            if not -120 <= threshold_db <= 0:
+                error_msg = f"Geçersiz energy_threshold_db: {request.form['energy_threshold_db']} (-120 ile 0 arasında olmalı)"
+                log_manager.add_log("ERROR", error_msg, job_id)
+                log_manager.update_job_status(job_id, "error", {'error': error_msg})
+                return jsonify({"error": error_msg, "job_id": job_id}), 400
+            job_options['energy_threshold_db'] = threshold_db
+        for field in SILENCE_OPTIONS:
+            if field not in request.form:
+                continue
+            try:
+                value = float(request.form[field])
+            except ValueError:
+                value = -1
+            if not 0 <= value < float('inf'):
+                error_msg = f"Geçersiz {field}: {request.form[field]} (0 veya pozitif sayı olmalı)"
+                log_manager.add_log("ERROR", error_msg, job_id)
+                log_manager.update_job_status(job_id, "error", {'error': error_msg})
+                return jsonify({"error": error_msg, "job_id": job_id}), 400
+            job_options[field] = value
+        
+        if 'refine_boundaries' in request.form:
+            job_options['refine_boundaries'] = request.form['refine_boundaries'].lower() in ('1', 'true', 'yes')
+        if 'refine_window_ms' in request.form:
+            try:
+                refine_window_ms = int(request.form['refine_window_ms'])
+            except ValueError:
+                refine_window_ms = 0
+            if not 10 <= refine_window_ms <= 2000:
+                error_msg = f"Geçersiz refine_window_ms: {request.form['refine_window_ms']} (10 ile 2000 arasında olmalı)"
+                log_manager.add_log("ERROR", error_msg, job_id)
+                log_manager.update_job_status(job_id, "error", {'error': error_msg})
+                return jsonify({"error": error_msg, "job_id": job_id}), 400
+            job_options['refine_window_ms'] = refine_window_ms
+        
+        if job_queue.is_full():
+            error_msg = "İş kuyruğu dolu, lütfen daha sonra tekrar deneyin"
+            log_manager.add_log("WARNING", error_msg, job_id, job_queue.stats())
+            log_manager.update_job_status(job_id, "error", {'error': error_msg})
+            return jsonify({"error": error_msg, "job_id": job_id}), 503
+        
+        # Dosyalar parse edilirken JumpcutRequest ile doğrudan UPLOAD_FOLDER'a yazıldı
+        inputs = []
         for idx, file in enumerate(valid_files, start=1):
-            file_id = str(uuid.uuid4())
-            input_path = os.path.join(app.config['UPLOAD_FOLDER'], f"input_{file_id}.mp4")
-            
-            # Dosya yükleme başladı
-            file_size = 0
-            if hasattr(file, 'content_length') and file.content_length:
-                file_size = file.content_length
-            else:
-                # Dosyayı kaydet ve boyutunu al
-                file.save(input_path)
-                file_size = os.path.getsize(input_path)
+            spool = file.stream
+            spool.finish()
+            if detection_mode == 'energy' and spool.pipe:
+                # Yerel tespitte AssemblyAI'ye yükleme gerekmez, eşzamanlı upload'u durdur
+                spool.pipe.abort()
+            input_path = spool.path
+            temp_inputs.append(input_path)
+            file_size = spool.size
             
-            log_manager.add_log("INFO", f"Dosya yükleme başladı: {file.filename}", job_id, {
+            log_manager.add_log("INFO", f"Dosya yükleme tamamlandı: {file.filename}", job_id, {
                 'video_num': idx,
                 'video_name': file.filename,
                 'file_size_bytes': file_size,
                 'file_size_mb': round(file_size / (1024 * 1024), 2)
             })
-            
-            if not os.path.exists(input_path):
-                file.save(input_path)
-            
-            temp_inputs.append(input_path)
-            
-            output_filename = f"output_{idx}.mp4"
-            output_path = os.path.join(output_dir, output_filename)
-            temp_outputs.append(output_path)
-            
-            # Video işleme başladı
-            log_manager.add_log("INFO", f"Video işleme başladı: {file.filename}", job_id, {
-                'video_num': idx,
-                'video_name': file.filename
-            })
-            
-            # Video işle
-            process_video(input_path, output_path, job_id, idx, file.filename)
-        
-        # Videoları birleştir
-        if len(temp_outputs) > 1:
-            log_manager.add_log("INFO", f"{len(temp_outputs)} video birleştiriliyor...", job_id, {
-                'video_count': len(temp_outputs)
-            })
-            final_output_path = os.path.join(output_dir, "final_output.mp4")
-            concatenate_videos(temp_outputs, final_output_path, job_id)
-        else:
-            # Tek video varsa, final_output olarak kopyala
-            log_manager.add_log("INFO", "Tek video işlendi, birleştirme atlandı", job_id)
-            final_output_path = os.path.join(output_dir, "final_output.mp4")
-            import shutil
-            copy_start_time = time.time()
-            shutil.copy2(temp_outputs[0], final_output_path)
-            copy_duration = int((time.time() - copy_start_time) * 1000)
-            log_manager.add_log("SUCCESS", f"Video kopyalandı: {final_output_path}", job_id, {
-                'duration_ms': copy_duration
-            })
+            inputs.append((idx, input_path, file.filename, spool))
         
-        # Final video hazır
-        final_size = os.path.getsize(final_output_path)
-        total_duration = int((time.time() - job_start_time) * 1000)
+        urls = {"status_url": f"/status/{job_id}", "result_url": f"/result/{job_id}"}
+        if job_options.get('preview'):
+            # Tam kalite render (ve varsa HLS) önizlemeden sonra /render/<job_id> ile istenir
+            urls["preview_url"] = f"/result/{job_id}/preview"
+            urls["render_url"] = f"/render/{job_id}"
+        elif output_format == 'hls' and job_options.get('render', True):
+            # Playlist ilk segment kodlanınca oluşur, job bitmeden izlenebilir
+            urls["playlist_url"] = f"/result/{job_id}/hls/{PLAYLIST_NAME}"
         
-        log_manager.add_log("SUCCESS", f"Final video hazır: {final_output_path}", job_id, {
-            'output_path': final_output_path,
-            'file_size_bytes': final_size,
-            'file_size_mb': round(final_size / (1024 * 1024), 2),
-            'total_duration_ms': total_duration
-        })
-        log_manager.update_job_status(job_id, "completed", {
-            'output_path': final_output_path,
-            'file_size_bytes': final_size,
-            'file_size_mb': round(final_size / (1024 * 1024), 2),
-            'total_duration_ms': total_duration,
-            'completed_at': datetime.utcnow().isoformat() + 'Z'
+        log_manager.update_job_status(job_id, "queued", {
+            'file_count': file_count,
+            **job_options,
+            **urls
         })
+        job_queue.submit(run_job, job_id, inputs, job_start_time, job_options)
+        queued = True
         
-        # Final videoyu gönder
-        return send_file(
-            final_output_path,
-            mimetype='video/mp4',
-            as_attachment=True,
-            download_name="final_output.mp4"
-        )
+        log_manager.add_log("INFO", "Job kuyruğa alındı", job_id, job_queue.stats())
+        
+        return jsonify({
+            "job_id": job_id,
+            "status": "queued",
+            **urls
+        }), 202
     
     except Exception as e:
         error_msg = str(e)
@@ -597,38 +1809,337 @@ def process():
         return jsonify({"error": error_msg, "job_id": job_id}), 500
     
     finally:
-        # Geçici dosyaları temizle
-        for path in temp_inputs:
-            if os.path.exists(path):
+        # Kuyruğa alınamayan job'ın ve kullanılmayan (boş isimli) parçaların
+        # geçici dosyalarını temizle; kuyruğa alınanları worker siler
+        for spool in g.get('upload_spools', []):
+            if queued and spool.path in temp_inputs:
+                continue
+            spool.abort()
+            if os.path.exists(spool.path):
                 try:
-                    os.remove(path)
+                    os.remove(spool.path)
                 except:
                     pass
 
+def _accel_redirect(path, content_type):
+    """Dosyayı nginx'e X-Accel-Redirect ile devreden boş yanıt
+
+    RESULT_ACCEL_PREFIX, nginx'te OUTPUT_FOLDER'ı gösteren internal location'dır;
+    Range ve koşullu istekleri nginx karşılar.
+    """
+    relative_path = os.path.relpath(path, app.config['OUTPUT_FOLDER']).replace(os.sep, '/')
+    response = Response(content_type=content_type)
+    response.headers['X-Accel-Redirect'] = f"{app.config['RESULT_ACCEL_PREFIX'].rstrip('/')}/{relative_path}"
+    return response
+
+def _send_cut_list(job_id, status):
+    """render=false job'ının kesim listesi; ?format=json (varsayılan), edl veya fcpxml"""
+    fmt = request.args.get('format', 'json').lower()
+    if fmt not in CUT_LIST_FORMATS:
+        return jsonify({
+            'error': f"Geçersiz format: {fmt} (desteklenenler: {', '.join(CUT_LIST_FORMATS)})",
+            'job_id': job_id
+        }), 400
+    
+    filename, content_type = CUT_LIST_FORMATS[fmt]
+    path = os.path.join(status['metadata'].get('output_dir', ''), filename)
+    if not os.path.exists(path):
+        return jsonify({
+            'error': 'Kesim listesi dosyası bulunamadı',
+            'job_id': job_id
+        }), 410
+    
+    return send_file(
+        os.path.abspath(path),
+        mimetype=content_type,
+        as_attachment=fmt != 'json',
+        download_name=filename,
+        conditional=True,
+        etag=True
+    )
+
+def _send_video(path, download_name):
+    """Videoyu indirme olarak gönder (X-Accel-Redirect, X-Sendfile ya da koşullu send_file)"""
+    if app.config['RESULT_ACCEL_PREFIX']:
+        response = _accel_redirect(path, 'video/mp4')
+        response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+        return response
+    
+    # conditional: ETag/Last-Modified üretir, Range isteğine 206, eşleşen ETag'e 304 döner
+    return send_file(
+        os.path.abspath(path),
+        mimetype='video/mp4',
+        as_attachment=True,
+        download_name=download_name,
+        conditional=True,
+        etag=True
+    )
+
+@app.route('/result/<job_id>', methods=['GET'])
+def get_job_result(job_id):
+    """Tamamlanan job'ın final videosunu indir
+
+    Range (kaldığı yerden devam), If-None-Match / If-Modified-Since (304) ve
+    If-Range desteklenir. RESULT_ACCEL_PREFIX ayarlıysa dosya nginx'e
+    X-Accel-Redirect ile, RESULT_X_SENDFILE açıksa X-Sendfile ile devredilir;
+    uygulama sadece yetki ve durum kontrolünü yapar. render=false job'larında
+    video yerine kesim listesi döner.
+    """
+    status = log_manager.get_job_status(job_id)
+    
+    if not status:
+        return jsonify({
+            'error': f'Job ID bulunamadı: {job_id}'
+        }), 404
+    
+    if status['status'] != 'completed':
+        return jsonify({
+            'error': f"Job henüz tamamlanmadı (status: {status['status']})",
+            'job_id': job_id,
+            'status': status['status']
+        }), 409
+    
+    if status['metadata'].get('render') is False:
+        return _send_cut_list(job_id, status)
+    
+    if status['metadata'].get('stage') == 'preview':
+        return jsonify({
+            'error': "Sadece önizleme hazır; tam kalite video için POST /render/<job_id>",
+            'job_id': job_id,
+            'preview_url': f"/result/{job_id}/preview",
+            'render_url': f"/render/{job_id}"
+        }), 409
+    
+    output_path = status['metadata'].get('output_path')
+    if not output_path or not os.path.exists(output_path):
+        return jsonify({
+            'error': 'Final video dosyası bulunamadı',
+            'job_id': job_id
+        }), 410
+    
+    return _send_video(output_path, "final_output.mp4")
+
+@app.route('/result/<job_id>/preview', methods=['GET'])
+def get_job_preview(job_id):
+    """preview=true job'ının düşük çözünürlüklü önizlemesi
+
+    Önizleme hazır olduktan sonra, tam kalite render sürerken ya da bittikten
+    sonra da indirilebilir. Range ve koşullu istekler /result ile aynıdır.
+    """
+    status = log_manager.get_job_status(job_id)
+    
+    if not status:
+        return jsonify({
+            'error': f'Job ID bulunamadı: {job_id}'
+        }), 404
+    
+    if not status['metadata'].get('preview'):
+        return jsonify({
+            'error': "Job önizleme ile gönderilmedi (preview=true)",
+            'job_id': job_id
+        }), 404
+    
+    preview_path = os.path.join(app.config['OUTPUT_FOLDER'], job_id, PREVIEW_NAME)
+    if not os.path.exists(preview_path):
+        return jsonify({
+            'error': f"Önizleme hazır değil (status: {status['status']})",
+            'job_id': job_id,
+            'status': status['status']
+        }), 409 if status['status'] in ('queued', 'processing') else 410
+    
+    return _send_video(preview_path, PREVIEW_NAME)
+
+@app.route('/render/<job_id>', methods=['POST'])
+def render_job(job_id):
+    """Önizlemesi hazır job'ı kayıtlı kesim listesinden tam kalitede render et
+
+    Yükleme ve transkript tekrarlanmaz. Form alanları (opsiyonel): profile,
+    cut_mode, render_mode, output_format; gönderilmeyenler ilk istekteki
+    değerleri alır. Job aynı job_id ile kuyruğa alınır ve 202 döner;
+    tamamlanmış ya da hata almış render farklı ayarlarla tekrar istenebilir.
+    """
+    status = log_manager.get_job_status(job_id)
+    
+    if not status:
+        return jsonify({
+            'error': f'Job ID bulunamadı: {job_id}'
+        }), 404
+    
+    metadata = status['metadata']
+    if not metadata.get('preview'):
+        return jsonify({
+            'error': "Job önizleme ile gönderilmedi (preview=true)",
+            'job_id': job_id
+        }), 409
+    
+    if status['status'] not in FINISHED_STATUSES:
+        return jsonify({
+            'error': f"Job henüz bitmedi (status: {status['status']})",
+            'job_id': job_id,
+            'status': status['status']
+        }), 409
+    
+    output_dir = os.path.join(app.config['OUTPUT_FOLDER'], job_id)
+    if not os.path.isdir(os.path.join(output_dir, SOURCES_DIR)):
+        return jsonify({
+            'error': 'Önizleme kaynakları bulunamadı (job hata ile bitti ya da süresi doldu)',
+            'job_id': job_id
+        }), 410
+    
+    options = {}
+    for field, choices, config_key in (('cut_mode', CUT_MODES, 'CUT_MODE'),
+                                       ('profile', PROFILE_NAMES, 'ENCODING_PROFILE'),
+                                       ('render_mode', RENDER_MODES, 'RENDER_MODE'),
+                                       ('output_format', OUTPUT_FORMATS, 'OUTPUT_FORMAT')):
+        value = request.form.get(field, metadata.get(field, app.config[config_key])).lower()
+        if value not in choices:
+            return jsonify({
+                'error': f"Geçersiz {field}: {value} (desteklenenler: {', '.join(choices)})",
+                'job_id': job_id
+            }), 400
+        options[field] = value
+    
+    if job_queue.is_full():
+        error_msg = "İş kuyruğu dolu, lütfen daha sonra tekrar deneyin"
+        log_manager.add_log("WARNING", error_msg, job_id, job_queue.stats())
+        return jsonify({"error": error_msg, "job_id": job_id}), 503
+    
+    urls = {"status_url": f"/status/{job_id}", "result_url": f"/result/{job_id}",
+            "preview_url": f"/result/{job_id}/preview"}
+    if options['output_format'] == 'hls':
+        urls["playlist_url"] = f"/result/{job_id}/hls/{PLAYLIST_NAME}"
+    
+    # Aynı job'ı eşzamanlı iki istek (farklı worker'larda da) kuyruğa alamaz:
+    # geçiş sadece durum hâlâ completed/error ise yapılır
+    queued = log_manager.update_job_status(job_id, "queued", {
+        'stage': 'final',
+        'render_requested_at': datetime.utcnow().isoformat() + 'Z',
+        **options,
+        **urls
+    }, expected=FINISHED_STATUSES)
+    if not queued:
+        return jsonify({
+            'error': "Job bu sırada başka bir istekle kuyruğa alındı",
+            'job_id': job_id
+        }), 409
+    job_queue.submit(run_final_render, job_id, time.time(), options)
+    
+    log_manager.add_log("INFO", "Tam kalite render kuyruğa alındı", job_id, job_queue.stats())
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        **urls
+    }), 202
+
+@app.route('/result/<job_id>/hls/<path:filename>', methods=['GET'])
+def get_job_hls(job_id, filename):
+    """output_format=hls job'ının playlist'i, init segmenti ve medya segmentleri
+
+    Render sürerken de sunulur: playlist EVENT tipindedir, her yeni segmentle
+    büyür ve job bitince #EXT-X-ENDLIST ile kapanır. Dosyalar geçici isimle
+    yazılıp taşındığı için yarım segment dönmez. Henüz yazılmamış dosya için
+    Retry-After ile 404 döner.
+    """
+    status = log_manager.get_job_status(job_id)
+    
+    if not status:
+        return jsonify({
+            'error': f'Job ID bulunamadı: {job_id}'
+        }), 404
+    
+    if status['metadata'].get('output_format') != 'hls':
+        return jsonify({
+            'error': "Job HLS çıktısı üretmiyor (output_format=hls ile gönderin)",
+            'job_id': job_id
+        }), 404
+    
+    if status['status'] == 'error':
+        return jsonify({
+            'error': f"Job hata ile bitti (status: {status['status']})",
+            'job_id': job_id,
+            'status': status['status']
+        }), 409
+    
+    content_type = CONTENT_TYPES.get(os.path.splitext(filename)[1])
+    path = safe_join(os.path.join(app.config['OUTPUT_FOLDER'], job_id, 'hls'), filename)
+    if not content_type or not path or not os.path.isfile(path):
+        if status['status'] == 'completed':
+            return jsonify({'error': f'HLS dosyası bulunamadı: {filename}', 'job_id': job_id}), 404
+        response = jsonify({
+            'error': f'HLS dosyası henüz hazır değil: {filename}',
+            'job_id': job_id,
+            'status': status['status']
+        })
+        response.headers['Retry-After'] = str(app.config['HLS_SEGMENT_SECONDS'])
+        return response, 404
+    
+    if app.config['RESULT_ACCEL_PREFIX']:
+        return _accel_redirect(path, content_type)
+    
+    if filename.endswith('.m3u8'):
+        # Playlist kodlama bittikçe değişir, önbellekten sunulmamalı
+        response = send_file(os.path.abspath(path), mimetype=content_type, conditional=True, etag=True)
+        response.cache_control.no_cache = True
+        return response
+    
+    # Segmentler taşındıktan sonra değişmez
+    return send_file(os.path.abspath(path), mimetype=content_type, conditional=True, etag=True,
+                     max_age=int(app.config['JOB_RETENTION_SECONDS']) or 86400)
+
+@app.route('/webhooks/assemblyai', methods=['POST'])
+def assemblyai_webhook():
+    """AssemblyAI transkript tamamlanma bildirimi"""
+    if app.config['WEBHOOK_SECRET'] and request.headers.get(WEBHOOK_AUTH_HEADER) != app.config['WEBHOOK_SECRET']:
+        return jsonify({'error': 'Geçersiz webhook imzası'}), 401
+    
+    payload = request.get_json(silent=True) or {}
+    transcript_id = payload.get('transcript_id')
+    if not transcript_id:
+        return jsonify({'error': 'transcript_id bulunamadı'}), 400
+    
+    job_id = transcript_waiter.notify(transcript_id)
+    log_manager.add_log("INFO", "AssemblyAI webhook alındı", job_id, {
+        'transcript_id': transcript_id,
+        'transcript_status': payload.get('status')
+    })
+    
+    return jsonify({'received': True})
+
 # ============================================================================
 # LOG VE STATUS API ENDPOINT'LERİ
 # ============================================================================
 
+def _log_page(logs):
+    """Sayfalama cursor'ları: önceki sayfa için before, sonraki kayıtlar için after"""
+    if not logs:
+        return {'before': None, 'after': None}
+    return {'before': logs[0]['id'], 'after': logs[-1]['id']}
+
 @app.route('/logs', methods=['GET'])
 def get_logs():
-    """Tüm log mesajlarını getir"""
+    """Tüm log mesajlarını getir (?before=<id> / ?after=<id> ile sayfalı)"""
     limit = request.args.get('limit', 100, type=int)
     job_id = request.args.get('job_id', None)
+    before = request.args.get('before', None, type=int)
+    after = request.args.get('after', None, type=int)
     
-    logs = log_manager.get_logs(job_id=job_id, limit=limit)
+    logs = log_manager.get_logs(job_id=job_id, limit=limit, before=before, after=after)
     return jsonify({
         'logs': logs,
         'count': len(logs),
-        'job_id': job_id
+        'job_id': job_id,
+        'cursor': _log_page(logs)
     })
 
 @app.route('/logs/<job_id>', methods=['GET'])
 def get_job_logs(job_id):
-    """Belirli bir job'ın log mesajlarını getir"""
+    """Belirli bir job'ın log mesajlarını getir (?before=<id> / ?after=<id> ile sayfalı)"""
     limit = request.args.get('limit', 500, type=int)
-    logs = log_manager.get_logs(job_id=job_id, limit=limit)
+    before = request.args.get('before', None, type=int)
+    after = request.args.get('after', None, type=int)
+    logs = log_manager.get_logs(job_id=job_id, limit=limit, before=before, after=after)
     
-    if not logs:
+    if not logs and before is None and after is None:
         return jsonify({
             'error': f'Job ID bulunamadı: {job_id}',
             'logs': [],
@@ -638,7 +2149,8 @@ def get_job_logs(job_id):
     return jsonify({
         'job_id': job_id,
         'logs': logs,
-        'count': len(logs)
+        'count': len(logs),
+        'cursor': _log_page(logs)
     })
 
 @app.route('/status/<job_id>', methods=['GET'])
@@ -660,10 +2172,58 @@ def get_job_status(job_id):
         'recent_logs': recent_logs
     })
 
+@app.route('/events/<job_id>', methods=['GET'])
+def get_job_events(job_id):
+    """Job loglarını ve durum değişikliklerini Server-Sent Events olarak akıt
+
+    Log olaylarının id'si job içindeki sıra numarasıdır; bağlantı koparsa
+    tarayıcı Last-Event-ID ile kaldığı yerden devam eder, diğer istemciler
+    ?cursor=<son görülen id> gönderebilir (0 = baştan). Job completed ya da
+    error durumuna geçince akış kapanır.
+    """
+    if not log_manager.get_job_status(job_id):
+        return jsonify({
+            'error': f'Job ID bulunamadı: {job_id}'
+        }), 404
+    
+    try:
+        cursor = int(request.headers.get('Last-Event-ID') or request.args.get('cursor', 0))
+    except ValueError:
+        return jsonify({'error': 'Geçersiz cursor', 'job_id': job_id}), 400
+    
+    def generate():
+        position = cursor
+        status_version = None
+        while True:
+            new_logs, status, status_version = log_manager.wait_job_events(
+                job_id, position, status_version, app.config['SSE_KEEPALIVE_SECONDS'])
+            if status_version is None:
+                # Job saklama süresi dolduğu için silindi
+                return
+            
+            for record in new_logs:
+                position = record.seq
+                yield f"id: {position}\nevent: log\ndata: {record.json_line()}\n\n"
+            
+            if status is not None:
+                yield f"event: status\ndata: {json.dumps(status, ensure_ascii=False)}\n\n"
+                if status['status'] in ('completed', 'error'):
+                    return
+            elif not new_logs:
+                # Proxy'ler boşta kalan bağlantıyı kapatmasın
+                yield ": keep-alive\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/status', methods=['GET'])
 def get_all_jobs():
-    """Tüm job'ları listele"""
-    jobs = log_manager.get_all_jobs()
+    """Tüm job'ları listele (?limit=&offset= ile sayfalı, en yeniler önce)"""
+    limit = max(0, request.args.get('limit', 0, type=int))
+    offset = max(0, request.args.get('offset', 0, type=int))
+    jobs = log_manager.get_all_jobs(limit=limit, offset=offset)
     return jsonify({
         'jobs': jobs,
         'count': len(jobs)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+AssemblyAI Mock Sunucusu
+Jumpcut'ı gerçek AssemblyAI hesabı olmadan yerelde test etmek için kullanılır
+
+Kullanım:
+    python mock_assemblyai.py
+    ASSEMBLYAI_BASE_URL=http://localhost:8001 ASSEMBLYAI_API_KEY=mock python main.py
+
+Desteklenen endpoint'ler: POST /v2/upload, POST /v2/transcript,
+GET /v2/transcript/<id>. İstekte webhook_url varsa transkript
+tamamlandığında AssemblyAI'nin gönderdiği bildirim aynen taklit edilir.
+"""
+
+import os
+import random
+import threading
+import time
+import uuid
+
+import requests
+from flask import Flask, request, jsonify
+
+app = Flask(__name__)
+
+# Transkriptin "processing" durumunda kalacağı süre (saniye)
+PROCESSING_SECONDS = float(os.getenv("MOCK_PROCESSING_SECONDS", 3))
+# Üretilecek sahte transkriptin süresi (saniye)
+TRANSCRIPT_SECONDS = float(os.getenv("MOCK_TRANSCRIPT_SECONDS", 30))
+# Upload ve transkript sorgularının bu oranında 503 döner (tekrar deneme testi için)
+FAIL_RATE = float(os.getenv("MOCK_FAIL_RATE", 0))
+
+transcripts = {}  # transcript_id -> transkript bilgisi
+stats = {
+    'uploads': 0,
+    'upload_bytes': 0,
+    'transcripts': 0,
+    'polls': 0,
+    'webhooks_sent': 0,
+    'injected_failures': 0
+}
+lock = threading.Lock()
+
+def build_words(duration_seconds):
+    """Her 5 kelimede bir 1.5 saniyelik sessizlik olan sahte kelime listesi üret"""
+    words = []
+    t = 500
+    index = 0
+    while t + 300 <= duration_seconds * 1000:
+        words.append({'text': f'kelime{index}', 'start': t, 'end': t + 300, 'confidence': 0.99})
+        t += 400
+        index += 1
+        if index % 5 == 0:
+            t += 1500
+    return words
+
+def send_webhook(transcript_id):
+    """Transkript tamamlandığında webhook bildirimi gönder"""
+    transcript = transcripts[transcript_id]
+    transcript['status'] = 'completed'
+
+    webhook_url = transcript['request'].get('webhook_url')
+    if not webhook_url:
+        return
+
+    webhook_headers = {}
+    header_name = transcript['request'].get('webhook_auth_header_name')
+    if header_name:
+        webhook_headers[header_name] = transcript['request'].get('webhook_auth_header_value', '')
+
+    try:
+        requests.post(webhook_url, json={'transcript_id': transcript_id, 'status': 'completed'},
+                      headers=webhook_headers, timeout=5)
+        with lock:
+            stats['webhooks_sent'] += 1
+    except requests.exceptions.RequestException as e:
+        print(f"Webhook gönderilemedi: {e}")
+
+def inject_failure():
+    """MOCK_FAIL_RATE oranında geçici sunucu hatası üret"""
+    if FAIL_RATE and random.random() < FAIL_RATE:
+        with lock:
+            stats['injected_failures'] += 1
+        return jsonify({'error': 'Geçici hata (mock)'}), 503
+    return None
+
+@app.route('/v2/upload', methods=['POST'])
+def upload():
+    """Dosyayı oku ve sahte upload_url döner"""
+    total = 0
+    while True:
+        chunk = request.stream.read(64 * 1024)
+        if not chunk:
+            break
+        total += len(chunk)
+
+    failure = inject_failure()
+    if failure:
+        return failure
+
+    with lock:
+        stats['uploads'] += 1
+        stats['upload_bytes'] += total
+
+    return jsonify({'upload_url': f"https://mock.assemblyai.local/upload/{uuid.uuid4().hex}"})
+
+@app.route('/v2/transcript', methods=['POST'])
+def create_transcript():
+    """Transkript işi oluştur"""
+    payload = request.get_json(silent=True) or {}
+    if 'audio_url' not in payload:
+        return jsonify({'error': 'audio_url gerekli'}), 400
+
+    transcript_id = uuid.uuid4().hex
+    transcripts[transcript_id] = {
+        'created_at': time.time(),
+        'status': 'queued',
+        'request': payload
+    }
+    with lock:
+        stats['transcripts'] += 1
+
+    threading.Timer(PROCESSING_SECONDS, send_webhook, args=(transcript_id,)).start()
+
+    return jsonify({'id': transcript_id, 'status': 'queued'})
+
+@app.route('/v2/transcript/<transcript_id>', methods=['GET'])
+def get_transcript(transcript_id):
+    """Transkript durumunu getir"""
+    transcript = transcripts.get(transcript_id)
+    if not transcript:
+        return jsonify({'error': 'Transkript bulunamadı'}), 404
+
+    failure = inject_failure()
+    if failure:
+        return failure
+
+    with lock:
+        stats['polls'] += 1
+
+    if transcript['status'] != 'completed':
+        elapsed = time.time() - transcript['created_at']
+        status = 'processing' if elapsed > PROCESSING_SECONDS / 3 else 'queued'
+        return jsonify({'id': transcript_id, 'status': status})
+
+    return jsonify({
+        'id': transcript_id,
+        'status': 'completed',
+        'audio_duration': TRANSCRIPT_SECONDS,
+        'words': build_words(TRANSCRIPT_SECONDS)
+    })
+
+@app.route('/stats', methods=['GET'])
+def get_stats():
+    """Mock'a yapılan istek sayılarını getir"""
+    with lock:
+        return jsonify(dict(stats))
+
+if __name__ == '__main__':
+    port = int(os.environ.get('MOCK_PORT', 8001))
+    app.run(host='0.0.0.0', port=port, threaded=True)
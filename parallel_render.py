@@ -0,0 +1,131 @@
+"""
+Segment-paralel yeniden kodlama
+
+Kesim çizelgesi süreleri eşit, ardışık N gruba (batch) bölünür ve
+her grup ayrı bir FFmpeg süreciyle (sadece video) aynı anda kodlanır. Ses
+tüm kesim çizelgesi için tek seferde kodlanır. Gruplar en sonda concat
+demuxer ile yeniden kodlanmadan birleştirilir; tek filtre grafiğinin seri
+çalışan decode/filtre aşamaları böylece çekirdeklere dağılır.
+"""
+
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from smart_cut import encode_ranges, render_audio, concat_pieces
+
+# Bundan kısa gruplar için ayrı FFmpeg süreci başlatmaya değmez
+DEFAULT_MIN_BATCH_SECONDS = 10.0
+
+
+def available_cpus():
+    """Sürecin kullanabileceği CPU sayısı (affinity ve cgroup kotası dahil)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # Konteynerde cgroup CPU kotası çekirdek sayısından düşük olabilir
+    quota = None
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:  # cgroup v2: "<quota> <period>" ya da "max <period>"
+            limit, period = f.read().split()
+            if limit != 'max':
+                quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:  # cgroup v1
+                limit = int(f.read())
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+                period = int(f.read())
+            if limit > 0 and period > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+
+    if quota:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, cpus)
+
+
+def plan_batches(segments, parallelism, min_batch_seconds=DEFAULT_MIN_BATCH_SECONDS):
+    """Kesim çizelgesini toplam süreleri eşit, ardışık gruplara böl
+
+    Grup sınırı bir segmentin ortasına denk gelirse segment ikiye bölünür;
+    trim [start, end) aralığını aldığı için sınırdaki kare tekrarlanmaz ya
+    da kaybolmaz. Grup sayısı parallelism'i ve toplam süre / min_batch_seconds
+    değerini geçmez. [[(start, end), ...], ...] döner.
+    """
+    ranges = [(segment['start'], segment['end']) for segment in segments if segment['end'] > segment['start']]
+    total = sum(end - start for start, end in ranges)
+
+    batch_count = min(parallelism, max(1, int(total // min_batch_seconds)))
+    if batch_count <= 1:
+        return [ranges] if ranges else []
+
+    batch_seconds = total / batch_count
+    batches = [[]]
+    remaining = batch_seconds  # Mevcut grupta kalan süre
+    for start, end in ranges:
+        while end - start > remaining and len(batches) < batch_count:
+            split = start + remaining
+            batches[-1].append((start, split))
+            batches.append([])
+            start = split
+            remaining = batch_seconds
+        batches[-1].append((start, end))
+        remaining -= end - start
+    return batches
+
+
+def render_parallel(video_path, batches, output_path, encode_params, max_workers, audio_params=('-c:a', 'aac'),
+                    on_progress=None):
+    """Grupları paralel kodlayıp output_path'e birleştirir, istatistik döner
+
+    encode_params: her grup için libx264 parametreleri. Ses ayrı bir süreçte
+    (audio_params ile), gruplarla aynı anda kodlanır. on_progress(out_seconds, fps):
+    tüm grupların toplam ilerlemesi ve toplam kodlama hızı.
+    """
+    segments = [{'start': start, 'end': end} for batch in batches for start, end in batch]
+
+    progress_lock = Lock()
+    batch_seconds = [0.0] * len(batches)
+    batch_fps = [0.0] * len(batches)
+
+    def batch_progress(n):
+        if not on_progress:
+            return None
+
+        def report(out_seconds, fps):
+            with progress_lock:
+                batch_seconds[n] = out_seconds
+                batch_fps[n] = fps or 0.0
+                total_seconds, total_fps = sum(batch_seconds), sum(batch_fps)
+            on_progress(total_seconds, total_fps)
+        return report
+
+    work_dir = tempfile.mkdtemp(prefix='parallel_', dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        piece_paths = [os.path.join(work_dir, f"batch_{n:05d}.mp4") for n in range(len(batches))]
+        audio_path = os.path.join(work_dir, "audio.m4a")
+
+        with ThreadPoolExecutor(max_workers=max_workers + 1, thread_name_prefix='batch') as executor:
+            futures = [executor.submit(render_audio, video_path, segments, audio_path, audio_params)]
+            for n, (batch, piece_path) in enumerate(zip(batches, piece_paths)):
+                futures.append(executor.submit(encode_ranges, video_path, batch, encode_params, piece_path,
+                                               batch_progress(n)))
+            for future in futures:
+                future.result()
+
+        concat_pieces(piece_paths, audio_path, output_path, work_dir)
+
+        return {
+            'batch_count': len(batches),
+            'batch_seconds': [round(sum(end - start for start, end in batch), 2) for batch in batches]
+        }
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
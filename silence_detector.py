@@ -0,0 +1,98 @@
+"""
+Transkript kelimelerinden korunacak segmentleri çıkaran sessizlik dedektörü
+
+Kelime başlangıç/bitiş zamanları NumPy dizilerine çevrilir; boşluklar,
+segment sınırları, dolgu (padding) ve kısa segment birleştirme Python
+döngüsü olmadan, dizi işlemleriyle hesaplanır. Milyon kelimelik bir
+transkriptte tespitin kendisi onlarca milisaniye sürer; sürenin çoğu
+kelime sözlüklerinden değerlerin okunmasıdır.
+"""
+
+from operator import itemgetter
+
+import numpy as np
+
+DEFAULT_SILENCE_THRESHOLD_MS = 1000
+
+
+def words_to_arrays(words):
+    """Kelime listesini (başlangıç, bitiş) milisaniye dizilerine çevir"""
+    count = len(words)
+    starts = np.fromiter(map(itemgetter('start'), words), dtype=np.float64, count=count)
+    ends = np.fromiter(map(itemgetter('end'), words), dtype=np.float64, count=count)
+    return starts, ends
+
+
+def _merge_short(seg_starts, seg_ends, min_segment_ms):
+    """min_segment_ms'den kısa segmentleri boşluğu daha kısa olan komşusuyla birleştir
+
+    Her turda tüm kısa segmentler aynı anda birleştirilir; birleşen iki
+    kısa segment hâlâ kısaysa sonraki turda tekrar ele alınır.
+    """
+    while len(seg_starts) > 1:
+        short = (seg_ends - seg_starts) < min_segment_ms
+        if not short.any():
+            break
+
+        gaps = seg_starts[1:] - seg_ends[:-1]  # gaps[i]: i ile i+1 arasındaki boşluk
+        left_gap = np.concatenate(([np.inf], gaps))
+        right_gap = np.concatenate((gaps, [np.inf]))
+
+        # drop_break[i] True ise i ile i+1 arasındaki kesim kaldırılır
+        drop_break = np.zeros(len(gaps), dtype=bool)
+        merge_left = short & (left_gap <= right_gap)
+        merge_right = short & ~merge_left
+        drop_break[np.flatnonzero(merge_left) - 1] = True
+        drop_break[np.flatnonzero(merge_right)] = True
+
+        keep_break = ~drop_break
+        seg_starts = np.concatenate((seg_starts[:1], seg_starts[1:][keep_break]))
+        seg_ends = np.concatenate((seg_ends[:-1][keep_break], seg_ends[-1:]))
+
+    return seg_starts, seg_ends
+
+
+def detect_segments(starts, ends, threshold_ms=DEFAULT_SILENCE_THRESHOLD_MS, lead_ms=0, tail_ms=0,
+                    min_segment_ms=0, duration_ms=None):
+    """Korunacak segmentlerin (başlangıç, bitiş) milisaniye dizilerini hesapla
+
+    threshold_ms: bundan uzun kelime arası boşluklar kesilir
+    lead_ms / tail_ms: her segmentin başına / sonuna eklenen pay
+    min_segment_ms: bundan kısa segmentler komşusuyla birleştirilir
+    duration_ms: verilirse segment sonları bu değerle sınırlanır
+    """
+    if len(starts) == 0:
+        return np.empty(0), np.empty(0)
+
+    order = np.argsort(starts, kind='stable')
+    starts = starts[order]
+    # Örtüşen kelimelerde boşluk, o ana kadarki en geç bitişten ölçülür
+    ends = np.maximum.accumulate(ends[order])
+
+    breaks = np.flatnonzero(starts[1:] - ends[:-1] >= threshold_ms)
+    seg_starts = starts[np.concatenate(([0], breaks + 1))]
+    seg_ends = ends[np.concatenate((breaks, [len(ends) - 1]))]
+
+    # Dolgu sonrası üst üste binen segmentleri birleştir
+    seg_starts = np.maximum(seg_starts - lead_ms, 0)
+    seg_ends = seg_ends + tail_ms
+    if duration_ms is not None:
+        seg_ends = np.minimum(seg_ends, duration_ms)
+    separate = seg_starts[1:] > seg_ends[:-1]
+    seg_starts = np.concatenate((seg_starts[:1], seg_starts[1:][separate]))
+    seg_ends = np.concatenate((seg_ends[:-1][separate], seg_ends[-1:]))
+
+    if min_segment_ms > 0:
+        seg_starts, seg_ends = _merge_short(seg_starts, seg_ends, min_segment_ms)
+
+    return seg_starts, seg_ends
+
+
+def segments_from_words(words, threshold_ms=DEFAULT_SILENCE_THRESHOLD_MS, lead_ms=0, tail_ms=0,
+                        min_segment_ms=0, duration_ms=None):
+    """Kelime listesinden [{'start': sn, 'end': sn}, ...] segment listesi üret"""
+    starts, ends = words_to_arrays(words)
+    seg_starts, seg_ends = detect_segments(starts, ends, threshold_ms, lead_ms, tail_ms,
+                                           min_segment_ms, duration_ms)
+    return [{'start': start, 'end': end}
+            for start, end in zip((seg_starts / 1000.0).tolist(), (seg_ends / 1000.0).tolist())]
@@ -0,0 +1,289 @@
+"""
+Keyframe'e duyarlı "smart cut" kesme modu
+
+Korunacak her segmentin iki keyframe arasında kalan iç kısmı yeniden
+kodlanmadan (stream copy) kopyalanır; sadece segment sınırlarındaki yarım
+GOP'lar kaynakla aynı profil/seviye/piksel formatıyla libx264 ile kodlanır.
+Parçalar concat demuxer ile birleştirilir; demuxer'ın auto_convert
+özelliği her parçanın kendi SPS/PPS'ini akış içine ekler, böylece kodlanan
+ve kopyalanan parçalar farklı parametre setleriyle de çözülebilir. Ses tüm kesim
+çizelgesi için ayrıca (ucuz olduğu için) yeniden kodlanır ve en sonda
+video ile birleştirilir.
+"""
+
+import bisect
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+from cut_graph import build_cut_graph, write_filter_script
+from ffmpeg_runner import run_ffmpeg
+
+# Bu süreden kısa kopyalanabilir iç kısımlar için ayrı FFmpeg çağrısına değmez
+DEFAULT_MIN_COPY_SECONDS = 2.0
+
+# Keyframe'e seek ederken yuvarlama yüzünden bir önceki GOP'a düşmemek için
+SEEK_EPSILON = 0.001
+
+# ffprobe profil adı -> libx264 -profile:v değeri
+X264_PROFILES = {
+    'constrained baseline': 'baseline',
+    'baseline': 'baseline',
+    'main': 'main',
+    'high': 'high',
+    'high 10': 'high10',
+    'high 4:2:2': 'high422',
+    'high 4:4:4 predictive': 'high444'
+}
+
+
+class SmartCutUnsupported(Exception):
+    """Kaynak video smart cut için uygun değil (normal kesmeye dönülmeli)"""
+
+
+def _run(cmd, error_prefix):
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        # FFmpeg'in asıl hata mesajı stderr'in sonundadır, banner'ı atla
+        raise RuntimeError(f"{error_prefix}: {result.stderr[-1000:]}")
+    return result
+
+
+def probe_video_stream(video_path):
+    """İlk video akışının codec parametrelerini ve dosya başlangıç zamanını getir"""
+    result = _run([
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=codec_name,profile,pix_fmt,level,width,height:format=start_time',
+        '-of', 'json',
+        video_path
+    ], "ffprobe hatası")
+
+    info = json.loads(result.stdout)
+    if not info.get('streams'):
+        raise SmartCutUnsupported("Video akışı bulunamadı")
+
+    stream = info['streams'][0]
+    stream['start_time'] = float(info.get('format', {}).get('start_time') or 0)
+    return stream
+
+
+def probe_frames(video_path, start_time=0.0):
+    """Tüm karelerin ve keyframe'lerin zamanlarını (dosya başına göre, saniye) getir
+
+    Sadece paket başlıkları okunur, decode yapılmaz. İki sıralı liste döner:
+    (kare zamanları, keyframe zamanları).
+    """
+    result = _run([
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0',
+        video_path
+    ], "ffprobe hatası")
+
+    frames = []
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(',')
+        if pts_time in ('', 'N/A'):
+            continue
+        pts = float(pts_time) - start_time
+        frames.append(pts)
+        if 'K' in flags:
+            keyframes.append(pts)
+    frames.sort()
+    keyframes.sort()
+    return frames, keyframes
+
+
+def x264_params(stream):
+    """Kaynakla uyumlu parça kodlamak için libx264 parametreleri"""
+    if stream.get('codec_name') != 'h264':
+        raise SmartCutUnsupported(f"Smart cut sadece H.264 destekler (codec: {stream.get('codec_name')})")
+
+    profile = X264_PROFILES.get((stream.get('profile') or '').lower())
+    if not profile:
+        raise SmartCutUnsupported(f"Desteklenmeyen H.264 profili: {stream.get('profile')}")
+
+    params = ['-c:v', 'libx264', '-profile:v', profile, '-pix_fmt', stream.get('pix_fmt') or 'yuv420p']
+    level = stream.get('level') or 0
+    if level > 0:
+        params += ['-level:v', f"{level // 10}.{level % 10}"]
+    return params
+
+
+def plan_pieces(segments, keyframes, min_copy=DEFAULT_MIN_COPY_SECONDS):
+    """Segmentleri ('copy' | 'encode', start, end) parçalarına böl
+
+    Her segmentte ilk keyframe (>= start) ile son keyframe (<= end) arası
+    kopyalanır; baş ve kuyruk kodlanır. Art arda gelen kodlanacak parçalar
+    tek FFmpeg çağrısında işlenmek üzere gruplanır:
+    [('encode', [(s, e), ...]), ('copy', k_in, k_out), ...]
+    """
+    pieces = []
+    pending_encode = []
+
+    def flush_encode():
+        if pending_encode:
+            pieces.append(('encode', list(pending_encode)))
+            pending_encode.clear()
+
+    for segment in segments:
+        start, end = segment['start'], segment['end']
+
+        i = bisect.bisect_left(keyframes, start)
+        j = bisect.bisect_right(keyframes, end) - 1
+        k_in = keyframes[i] if i < len(keyframes) else None
+        k_out = keyframes[j] if j >= 0 else None
+
+        if k_in is None or k_out is None or k_out - k_in < min_copy:
+            pending_encode.append((start, end))
+            continue
+
+        if k_in > start:
+            pending_encode.append((start, k_in))
+        flush_encode()
+        pieces.append(('copy', k_in, k_out))
+        if end > k_out:
+            pending_encode.append((k_out, end))
+
+    flush_encode()
+    return pieces
+
+
+def encode_ranges(video_path, ranges, encode_params, output_path, on_progress=None):
+    """Zaman aralıklarını tek FFmpeg çağrısıyla kodla (sadece video)
+
+    on_progress(out_seconds, fps): kodlanan parçadaki ilerleme.
+    """
+    # Aralıkların başına kadar hızlı seek, gerisi filtre ile kare hassasiyetinde
+    seek = max(0.0, ranges[0][0] - 1.0)
+    graph = build_cut_graph([(start - seek, end - seek) for start, end in ranges], audio=False)
+    script_path = write_filter_script(graph, os.path.dirname(os.path.abspath(output_path)))
+
+    try:
+        run_ffmpeg([
+            '-ss', str(seek),
+            '-i', video_path,
+            '-filter_complex_script', script_path,
+            '-map', '[outv]',
+            '-an',
+            *encode_params,
+            '-y',
+            output_path
+        ], "Video kodlama hatası", on_progress)
+    finally:
+        os.remove(script_path)
+
+
+def _copy_piece(video_path, start, frame_count, output_path):
+    """start keyframe'inden itibaren frame_count kareyi yeniden kodlamadan kopyala
+
+    Stream copy'de -t bitiş keyframe'ini ve B-frame gecikmesi kadar fazladan
+    kareyi de alır; bu yüzden süre yerine kare sayısı verilir.
+    """
+    run_ffmpeg([
+        '-ss', str(start + SEEK_EPSILON),
+        '-i', video_path,
+        '-map', '0:v:0',
+        '-an',
+        '-c:v', 'copy',
+        '-frames:v', str(frame_count),
+        '-avoid_negative_ts', 'make_zero',
+        '-y',
+        output_path
+    ], "Smart cut kopyalama hatası")
+
+
+def render_audio(video_path, segments, output_path, audio_params=('-c:a', 'aac')):
+    """Kesim çizelgesinin sesini tek seferde kodla (varsayılan AAC)"""
+    graph = build_cut_graph([(segment['start'], segment['end']) for segment in segments], video=False)
+    script_path = write_filter_script(graph, os.path.dirname(os.path.abspath(output_path)))
+
+    try:
+        run_ffmpeg([
+            '-i', video_path,
+            '-filter_complex_script', script_path,
+            '-map', '[outa]',
+            '-vn',
+            *audio_params,
+            '-y',
+            output_path
+        ], "Ses kodlama hatası")
+    finally:
+        os.remove(script_path)
+
+
+def concat_pieces(piece_paths, audio_path, output_path, work_dir):
+    """Sadece video içeren parçaları concat demuxer ile birleştirip ses izini ekle
+
+    Video yeniden kodlanmaz; liste dosyası work_dir'e yazılır.
+    """
+    list_path = os.path.join(work_dir, "pieces.txt")
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for piece_path in piece_paths:
+            f.write(f"file '{os.path.abspath(piece_path)}'\n")
+
+    run_ffmpeg([
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', list_path,
+        '-i', audio_path,
+        '-map', '0:v:0',
+        '-map', '1:a:0',
+        '-c', 'copy',
+        '-y',
+        output_path
+    ], "Parça birleştirme hatası")
+
+
+def render_smart_cut(video_path, segments, output_path, min_copy=DEFAULT_MIN_COPY_SECONDS,
+                     quality_params=(), audio_params=('-c:a', 'aac')):
+    """Segmentleri smart cut ile kesip output_path'e yazar, istatistik döner
+
+    quality_params: sınır parçaları için ek libx264 parametreleri (preset, CRF).
+    Kaynak H.264 değilse SmartCutUnsupported fırlatır.
+    """
+    stream = probe_video_stream(video_path)
+    encode_params = x264_params(stream) + list(quality_params)
+    frames, keyframes = probe_frames(video_path, stream['start_time'])
+    pieces = plan_pieces(segments, keyframes, min_copy)
+
+    work_dir = tempfile.mkdtemp(prefix='smartcut_', dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        piece_paths = []
+        copied_seconds = 0.0
+        encoded_seconds = 0.0
+
+        for n, piece in enumerate(pieces):
+            piece_path = os.path.join(work_dir, f"piece_{n:05d}.mp4")
+            if piece[0] == 'copy':
+                _, start, end = piece
+                frame_count = bisect.bisect_left(frames, end) - bisect.bisect_left(frames, start)
+                _copy_piece(video_path, start, frame_count, piece_path)
+                copied_seconds += end - start
+            else:
+                _, ranges = piece
+                encode_ranges(video_path, ranges, encode_params, piece_path)
+                encoded_seconds += sum(end - start for start, end in ranges)
+            piece_paths.append(piece_path)
+
+        audio_path = os.path.join(work_dir, "audio.m4a")
+        render_audio(video_path, segments, audio_path, audio_params)
+
+        concat_pieces(piece_paths, audio_path, output_path, work_dir)
+
+        return {
+            'piece_count': len(pieces),
+            'copied_seconds': round(copied_seconds, 2),
+            'encoded_seconds': round(encoded_seconds, 2),
+            'keyframe_count': len(keyframes)
+        }
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
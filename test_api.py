@@ -9,7 +9,6 @@ import json
 import sys
 import os
 import time
-import threading
 from pathlib import Path
 from datetime import datetime
 
@@ -79,31 +78,50 @@ def print_log(log_entry):
     
     print(log_msg)
 
-def poll_logs(job_id, stop_event, base_url):
-    """Belirli bir job'ın loglarını polling yaparak konsola yazdır"""
-    last_log_count = 0
+def follow_events(job_id, base_url, timeout):
+    """/events/<job_id> akışını dinleyip logları yazdırır, job'ın son durumunu döner
+
+    Bağlantı koparsa son görülen log id'sinden (cursor) devam eder.
+    """
+    cursor = 0
+    job_status = None
+    deadline = time.time() + timeout
     
-    while not stop_event.is_set():
+    while time.time() < deadline:
         try:
-            response = requests.get(f"{base_url}/logs/{job_id}", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                logs = data.get('logs', [])
+            # Sunucu en geç keep-alive aralığında veri gönderir
+            with requests.get(f"{base_url}/events/{job_id}", params={'cursor': cursor},
+                              stream=True, timeout=(5, 60)) as response:
+                if response.status_code != 200:
+                    return None
                 
-                # Yeni logları yazdır
-                if len(logs) > last_log_count:
-                    new_logs = logs[last_log_count:]
-                    for log_entry in new_logs:
-                        print_log(log_entry)
-                    last_log_count = len(logs)
+                event_type, event_id, data_lines = None, None, []
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith('event:'):
+                        event_type = line[6:].strip()
+                    elif line.startswith('id:'):
+                        event_id = line[3:].strip()
+                    elif line.startswith('data:'):
+                        data_lines.append(line[5:].strip())
+                    elif line == '' and data_lines:
+                        # Olay sonu
+                        data = json.loads("\n".join(data_lines))
+                        if event_type == 'log':
+                            print_log(data)
+                            cursor = int(event_id)
+                        elif event_type == 'status':
+                            job_status = data.get('status')
+                        event_type, event_id, data_lines = None, None, []
+                    if time.time() >= deadline:
+                        break
             
-            time.sleep(2)  # 2 saniyede bir kontrol et
+            if job_status in ('completed', 'error'):
+                return job_status
         except requests.exceptions.RequestException:
-            # Bağlantı hatası durumunda sessizce devam et
-            time.sleep(2)
-        except Exception:
-            # Diğer hataları görmezden gel
+            # Bağlantı hatası durumunda kısa bekleyip kaldığı yerden devam et
             time.sleep(2)
+    
+    return job_status
 
 def test_root_endpoint():
     """Ana endpoint'i test et"""
@@ -197,117 +215,46 @@ def test_process_endpoint(video_paths=None):
         print("  LOG MESAJLARI")
         print("=" * 60 + "\n")
         
-        # İşlem başlamadan önce mevcut job'ları al
-        initial_jobs = {}
-        try:
-            status_response = requests.get(f"{BASE_URL}/status", timeout=5)
-            if status_response.status_code == 200:
-                jobs_data = status_response.json()
-                initial_jobs = jobs_data.get('jobs', {})
-        except:
-            pass
-        
-        # Log polling için thread başlat
-        stop_logging = threading.Event()
-        log_thread = None
-        job_id = None
-        last_log_count = {'count': 0}  # Thread-safe için dict kullan
-        
-        def poll_logs_thread():
-            """Arka planda log polling yap"""
-            nonlocal job_id, last_log_count
-            while not stop_logging.is_set() and job_id:
-                try:
-                    log_response = requests.get(f"{BASE_URL}/logs/{job_id}", timeout=5)
-                    if log_response.status_code == 200:
-                        logs_data = log_response.json()
-                        logs = logs_data.get('logs', [])
-                        
-                        # Yeni logları yazdır
-                        if len(logs) > last_log_count['count']:
-                            new_logs = logs[last_log_count['count']:]
-                            for log_entry in new_logs:
-                                print_log(log_entry)
-                            last_log_count['count'] = len(logs)
-                    
-                    time.sleep(2)  # 2 saniyede bir kontrol et
-                except:
-                    time.sleep(2)
-        
-        # İşlemi başlat (stream=False, normal blocking request)
-        response = None
-        
+        # İşlemi başlat - dosyalar yüklendikten sonra job kuyruğa alınır ve 202 döner
         try:
-            # İşlemi başlat - bu uzun sürebilir
             response = requests.post(f"{BASE_URL}/process", files=files, timeout=timeout_value)
         except requests.exceptions.Timeout:
-            stop_logging.set()
-            print_error("İstek zaman aşımına uğradı. Video işleme çok uzun sürdü.")
+            print_error("İstek zaman aşımına uğradı. Dosya yükleme çok uzun sürdü.")
             return False
         except Exception as e:
-            stop_logging.set()
             print_error(f"Hata: {str(e)}")
             return False
         
-        # Hata durumunda job_id'yi al ve logları göster
-        if response.status_code != 200:
-            stop_logging.set()
-            try:
-                error_data = response.json()
-                job_id = error_data.get('job_id')
-                if job_id:
-                    print(f"\nJob ID: {job_id}")
-                    print("Hata logları:\n")
-                    log_response = requests.get(f"{BASE_URL}/logs/{job_id}")
-                    if log_response.status_code == 200:
-                        logs_data = log_response.json()
-                        for log_entry in logs_data.get('logs', []):
-                            print_log(log_entry)
-            except:
-                pass
+        try:
+            response_data = response.json()
+        except ValueError:
+            response_data = {}
+        job_id = response_data.get('job_id')
+        
+        if response.status_code != 202 or not job_id:
+            print_error(f"Status Code: {response.status_code}")
+            print(f"Hata detayı: {json.dumps(response_data, indent=2, ensure_ascii=False)}")
+            if job_id:
+                log_response = requests.get(f"{BASE_URL}/logs/{job_id}")
+                if log_response.status_code == 200:
+                    for log_entry in log_response.json().get('logs', []):
+                        print_log(log_entry)
             return False
         
-        # Başarılı durumda - yeni job'ı bul ve loglarını göster
-        try:
-            time.sleep(0.5)  # Job oluşması için kısa bekleme
-            
-            status_response = requests.get(f"{BASE_URL}/status", timeout=5)
-            if status_response.status_code == 200:
-                jobs_data = status_response.json()
-                current_jobs = jobs_data.get('jobs', {})
-                
-                # Yeni job'ı bul
-                for jid in current_jobs:
-                    if jid not in initial_jobs:
-                        job_id = jid
-                        break
-                
-                # Eğer yeni job bulunamadıysa, en son job'ı al
-                if not job_id and current_jobs:
-                    latest_job = None
-                    latest_time = None
-                    for jid, job_data in current_jobs.items():
-                        created_at = job_data.get('created_at', '')
-                        if latest_time is None or created_at > latest_time:
-                            latest_time = created_at
-                            latest_job = jid
-                    job_id = latest_job
-                
-                # Job bulunduysa tüm loglarını göster
-                if job_id:
-                    log_response = requests.get(f"{BASE_URL}/logs/{job_id}")
-                    if log_response.status_code == 200:
-                        logs_data = log_response.json()
-                        print(f"\nJob ID: {job_id}\n")
-                        for log_entry in logs_data.get('logs', []):
-                            print_log(log_entry)
-        except Exception as e:
-            # Log alma hatası durumunda devam et
-            pass
+        print(f"Job ID: {job_id}\n")
         
-        stop_logging.set()
+        # Job tamamlanana kadar logları ve durumu SSE ile takip et
+        job_status = follow_events(job_id, BASE_URL, timeout_value)
+        
+        if job_status != 'completed':
+            if job_status == 'error':
+                print_error("Job hata ile sonuçlandı")
+            else:
+                print_error("Job zaman aşımına uğradı. Video işleme çok uzun sürdü.")
+            return False
         
-        # Response içeriğini oku
+        # Final videoyu indir
+        response = requests.get(f"{BASE_URL}/result/{job_id}", timeout=timeout_value)
         response_content = response.content
         
         if response.status_code == 200 and len(response_content) > 0:
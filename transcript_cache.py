@@ -0,0 +1,110 @@
+"""
+Disk üzerinde, içerik adresli transkript önbelleği
+
+Anahtar, AssemblyAI'ye yüklenecek ses izinin SHA-256 hash'idir; aynı klip
+tekrar gönderildiğinde yükleme, transkript oluşturma ve polling adımları
+tamamen atlanır. Toplam boyut sınırı aşıldığında en uzun süredir
+kullanılmayan kayıtlar (dosya mtime'ı) silinir.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from threading import Lock
+
+
+class TranscriptCache:
+    """Ses izi hash'i ile adreslenen, LRU tahliyeli transkript önbelleği"""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = Lock()  # Yazma ve tahliye işlemlerini sıraya sokar
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def hash_file(path, chunk_size=1024 * 1024):
+        """Dosya içeriğinin SHA-256 hash'ini hesapla"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Önbellekteki kelime listesini getir, yoksa None döner"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # LRU sırası için erişim zamanını güncelle
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        return entry['words']
+
+    def put(self, key, words):
+        """Kelime listesini önbelleğe yaz ve gerekirse eski kayıtları sil"""
+        entry = {
+            'words': words,
+            'created_at': time.time()
+        }
+
+        # Yarım yazılmış dosya okunmasın diye önce geçici dosyaya yaz
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._evict()
+
+    def _evict(self):
+        """Toplam boyut sınırı aşıldıysa en eski erişilen kayıtları sil"""
+        with self.lock:
+            entries = []
+            total_size = 0
+            for entry in os.scandir(self.cache_dir):
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total_size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total_size -= size
+                except OSError:
+                    pass
+
+    def stats(self):
+        """Önbellek istatistiklerini getir"""
+        with self.lock:
+            return {
+                'cache_hits': self.hits,
+                'cache_misses': self.misses,
+                'cache_max_bytes': self.max_bytes
+            }
@@ -0,0 +1,136 @@
+"""
+Multipart yüklemelerini tek geçişte diske yazma ve çoğaltma (tee)
+
+Werkzeug varsayılan olarak her dosya parçasını önce kendi geçici dosyasına
+yazar; uygulama da bunu file.save() ile ikinci kez kopyalar. UploadSpool
+parçayı doğrudan nihai girdi yoluna yazar ve aynı geçişte isteğe bağlı
+olarak SHA-256 hash'ini hesaplar ve baytları bir ChunkPipe üzerinden
+AssemblyAI upload'una akıtır.
+"""
+
+import hashlib
+import queue
+
+
+class ChunkPipe:
+    """Yazan thread'den okuyan thread'e sınırlı kuyruklu bayt akışı
+
+    Okuyan taraf (upload) yavaş kalır ve kuyruk put_timeout içinde boşalmazsa
+    akış iptal edilir; istemci yüklemesi yavaşlamaz, upload sonradan diskteki
+    kopyadan yapılır.
+    """
+
+    _END = object()
+    _ABORT = object()
+
+    def __init__(self, max_chunks=64, put_timeout=1.0):
+        self.chunks = queue.Queue(maxsize=max_chunks)
+        self.put_timeout = put_timeout
+        self.aborted = False
+
+    def feed(self, chunk):
+        """Parçayı kuyruğa ekle, akış iptal edildiyse False döner"""
+        if self.aborted:
+            return False
+        try:
+            self.chunks.put(bytes(chunk), timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            self.abort()
+            return False
+
+    def close(self):
+        """Akışın bittiğini bildir"""
+        if self.aborted:
+            return
+        try:
+            self.chunks.put(self._END, timeout=self.put_timeout)
+        except queue.Full:
+            self.abort()
+
+    def abort(self):
+        """Akışı iptal et; okuyan taraf hata alır"""
+        self.aborted = True
+        # Okuyan taraf kuyrukta beklerken takılmasın
+        try:
+            self.chunks.put_nowait(self._ABORT)
+        except queue.Full:
+            pass
+
+    def __iter__(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is self._END:
+                return
+            if chunk is self._ABORT or self.aborted:
+                raise IOError("Upload akışı iptal edildi")
+            yield chunk
+
+
+class UploadSpool:
+    """Werkzeug stream_factory için dosya benzeri nesne
+
+    Parser'ın yazdığı baytları path'e yazar; hash_content=True ise SHA-256
+    hesaplar, pipe verildiyse aynı parçaları pipe'a da iletir.
+    """
+
+    def __init__(self, path, hash_content=False, pipe=None):
+        self.path = path
+        self.file = open(path, 'wb+')
+        self.digest = hashlib.sha256() if hash_content else None
+        self.pipe = pipe
+        self.size = 0
+        self.upload_future = None  # Tee upload'un Future'ı (pipe varsa)
+        self.http_stats = None  # Tee upload'un RequestStats'ı
+
+    def write(self, data):
+        self.file.write(data)
+        self.size += len(data)
+        if self.digest is not None:
+            self.digest.update(data)
+        if self.pipe is not None:
+            self.pipe.feed(data)
+        return len(data)
+
+    def finish(self):
+        """Yazma bitti: dosyayı kapat ve tee akışını sonlandır"""
+        if self.file.closed:
+            return
+        self.file.close()
+        if self.pipe is not None:
+            self.pipe.close()
+
+    def abort(self):
+        """Yükleme yarıda kaldı: dosyayı kapat ve tee akışını iptal et"""
+        if not self.file.closed:
+            self.file.close()
+        if self.pipe is not None:
+            self.pipe.abort()
+
+    @property
+    def sha256(self):
+        return self.digest.hexdigest() if self.digest is not None else None
+
+    # Parser ve FileStorage'ın kullandığı dosya arayüzü
+    def read(self, *args):
+        return self.file.read(*args)
+
+    def readline(self, *args):
+        return self.file.readline(*args)
+
+    def seek(self, *args):
+        return self.file.seek(*args)
+
+    def tell(self):
+        return self.file.tell()
+
+    def flush(self):
+        if not self.file.closed:
+            self.file.flush()
+
+    def close(self):
+        self.finish()
+
+    @property
+    def closed(self):
+        return self.file.closed